@@ -6,6 +6,11 @@ __all__ = [
     "database",
     "openai_client",
     "audio",
+    "audio_buffer",
+    "capture",
+    "transcription",
+    "wav",
+    "waveform",
     "utils",
     "ui",
     "history",
@@ -1,22 +1,25 @@
 # app/audio.py
-import tempfile
+import io
+import time
 import numpy as np
-import sounddevice as sd
-import matplotlib.pyplot as plt
 import streamlit as st
-from scipy.io.wavfile import write
-from openai import OpenAI
-from pathlib import Path
+
+from app.capture import AudioCapture
+from app.openai_client import init_openai
+from app.transcription import IncrementalTranscriber
+from app.waveform import WaveformEnvelope
+from app.wav import WavEncoder
+from backend.audio_processing import SpeechStats, encode_flac, frame_energy_db, speech_threshold, trim_silence
 
 SAMPLE_RATE = 16000
-CHUNK_SECONDS = 1          # waveform refresh
+REFRESH_SECONDS = 0.5      # UI poll interval while recording
 TRANSCRIBE_EVERY = 5       # seconds
 
 
 def text_to_speech(text: str):
     """Convert text to speech using OpenAI TTS and play it"""
     try:
-        client = OpenAI()
+        client = init_openai()
         
         # Generate speech audio
         response = client.audio.speech.create(
@@ -25,134 +28,122 @@ def text_to_speech(text: str):
             input=text
         )
         
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
-            tmp_file.write(response.content)
-            tmp_path = tmp_file.name
-        
-        # Play the audio using streamlit's audio player
-        with open(tmp_path, "rb") as audio_file:
-            audio_bytes = audio_file.read()
-            st.audio(audio_bytes, format="audio/mp3", autoplay=True)
-        
-        # Clean up temporary file
-        Path(tmp_path).unlink(missing_ok=True)
+        # Play the audio bytes directly, no temporary file
+        st.audio(response.content, format="audio/mp3", autoplay=True)
         
     except Exception as e:
         st.error(f"Text-to-speech error: {e}")
 
 
 def start_recording():
-    """Initialize recording session"""
-    st.session_state.audio_frames = []
-    st.session_state.partial_transcript = ""
+    """Start background capture for a new answer"""
+    stop_recording()
 
+    # Preallocate for the longest allowed answer (plus a second of slack)
+    capture = AudioCapture(SAMPLE_RATE, st.session_state.record_max_time + 1)
+    capture.start()
+    st.session_state.audio_capture = capture
+    st.session_state.audio_buffer = capture.buffer
+    st.session_state.waveform = WaveformEnvelope(SAMPLE_RATE, st.session_state.record_max_time)
 
-def record_chunk():
-    """Record a chunk of audio"""
-    audio = sd.rec(
-        int(CHUNK_SECONDS * SAMPLE_RATE),
-        samplerate=SAMPLE_RATE,
-        channels=1,
-        dtype="float32"
+    if st.session_state.wav_encoder is None:
+        st.session_state.wav_encoder = WavEncoder(SAMPLE_RATE)
+    if st.session_state.stt_stats is None:
+        st.session_state.stt_stats = SpeechStats()
+    st.session_state.transcriber = IncrementalTranscriber(
+        _transcribe_pcm,
+        SAMPLE_RATE,
+        min_new_seconds=TRANSCRIBE_EVERY,
     )
-    sd.wait()
-    st.session_state.audio_frames.append(audio)
+    st.session_state.partial_transcript = ""
+
+
+def stop_recording():
+    """Stop background capture if it is running"""
+    capture = st.session_state.get("audio_capture")
+    if capture is not None:
+        capture.stop()
+        st.session_state.audio_capture = None
+
+
+def input_level() -> float:
+    """Latest microphone level (0..1) without waiting for audio"""
+    capture = st.session_state.get("audio_capture")
+    return capture.level if capture is not None else 0.0
 
 
 def draw_waveform():
-    """Draw the current audio waveform"""
-    if not st.session_state.audio_frames:
+    """Draw the current audio waveform envelope"""
+    buffer = st.session_state.audio_buffer
+    if not buffer:
         return
-    
-    audio = np.concatenate(st.session_state.audio_frames, axis=0)
-    fig, ax = plt.subplots(figsize=(6, 2))
-    ax.plot(audio, linewidth=0.5, color='#1f77b4')
-    ax.set_ylim(-1, 1)
-    ax.axis("off")
-    st.pyplot(fig)
-    plt.close(fig)
+
+    waveform = st.session_state.waveform
+    waveform.update(buffer.samples())
+    st.area_chart(waveform.chart_data(), height=120, color=["#1f77b4", "#1f77b4"])
+
+
+def _transcribe_pcm(audio_int16, prompt: str = "") -> str:
+    """Trim silence, compress and send int16 PCM to Whisper; return the text"""
+    client = init_openai()
+
+    # A 5 s segment mid-answer rarely holds silence, so its own energy cannot tell
+    # quiet words from background; the level is measured over the whole recording
+    recording = st.session_state.audio_buffer.pcm()
+    threshold = speech_threshold(frame_energy_db(recording, SAMPLE_RATE))
+    trimmed = trim_silence(audio_int16, SAMPLE_RATE, threshold=threshold)
+    if not len(trimmed):
+        return ""
+
+    flac = encode_flac(trimmed, SAMPLE_RATE)
+    if flac is not None:
+        upload = io.BytesIO(flac)
+        upload.name = "audio.flac"
+    else:
+        # Encoded in memory into the session's reusable WAV stream
+        upload = st.session_state.wav_encoder.encode(trimmed)
+
+    uploaded_bytes = upload.getbuffer().nbytes
+
+    # The previous text keeps segment boundaries consistent
+    started = time.perf_counter()
+    res = client.audio.transcriptions.create(
+        model="whisper-1",
+        file=upload,
+        prompt=prompt,
+    )
+    st.session_state.stt_stats.record_upload(
+        44 + audio_int16.nbytes,
+        uploaded_bytes,
+        len(audio_int16) / SAMPLE_RATE,
+        len(trimmed) / SAMPLE_RATE,
+        time.perf_counter() - started,
+    )
+    return res.text
 
 
 def transcribe_partial():
-    """Transcribe audio recorded so far (for live preview)"""
-    if not st.session_state.audio_frames:
+    """Transcribe newly recorded audio (for live preview), at most every TRANSCRIBE_EVERY seconds"""
+    buffer = st.session_state.audio_buffer
+    if not buffer:
         return
-    
-    tmp_path = None
+
     try:
-        client = OpenAI()
-        
-        audio = np.concatenate(st.session_state.audio_frames, axis=0)
-        
-        # Convert float32 audio to int16 for WAV file
-        audio_int16 = (audio * 32767).astype(np.int16)
-        
-        # Create temporary file and close it immediately
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        tmp_path = tmp.name
-        tmp.close()
-        
-        # Write audio to the closed file
-        write(tmp_path, SAMPLE_RATE, audio_int16)
-        
-        # Open and transcribe
-        with open(tmp_path, "rb") as f:
-            res = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=f
-            )
-        
-        st.session_state.partial_transcript = res.text
-        
+        st.session_state.partial_transcript = st.session_state.transcriber.update(buffer.pcm())
     except Exception as e:
         st.warning(f"Transcription error: {e}")
-    finally:
-        # Clean up in finally block
-        if tmp_path and Path(tmp_path).exists():
-            try:
-                Path(tmp_path).unlink()
-            except Exception:
-                pass  # Ignore cleanup errors
 
 
 def stop_and_transcribe():
-    """Stop recording and return final transcription"""
-    if not st.session_state.audio_frames:
+    """Stop recording and return final transcription (only the untranscribed tail is sent)"""
+    stop_recording()
+    buffer = st.session_state.audio_buffer
+    if not buffer:
         return ""
-    
-    tmp_path = None
+
+    transcriber = st.session_state.transcriber
     try:
-        client = OpenAI()
-        audio = np.concatenate(st.session_state.audio_frames, axis=0)
-        
-        # Convert float32 audio to int16 for WAV file
-        audio_int16 = (audio * 32767).astype(np.int16)
-        
-        # Create temporary file and close it immediately
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        tmp_path = tmp.name
-        tmp.close()
-        
-        # Write audio to the closed file
-        write(tmp_path, SAMPLE_RATE, audio_int16)
-        
-        # Open and transcribe
-        with open(tmp_path, "rb") as f:
-            res = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=f
-            )
-        
-        return res.text.strip()
-        
+        return transcriber.finish(buffer.pcm()).strip()
     except Exception as e:
         st.error(f"Final transcription error: {e}")
-        return ""
-    finally:
-        # Clean up in finally block to ensure it runs
-        if tmp_path and Path(tmp_path).exists():
-            try:
-                Path(tmp_path).unlink()
-            except Exception:
-                pass  # Ignore cleanup errors
\ No newline at end of file
+        return transcriber.transcript
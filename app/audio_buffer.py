@@ -0,0 +1,69 @@
+# app/audio_buffer.py
+import numpy as np
+
+
+class CaptureBuffer:
+    """
+    Preallocated, growable buffer for recorded audio.
+
+    Holds the recording twice: float32 samples for drawing and int16 PCM for
+    WAV encoding. Each chunk is converted once on append, so appends cost
+    O(chunk) and every reader gets a zero-copy view instead of concatenating
+    all frames on each rerun.
+    """
+
+    def __init__(self, sample_rate: int, capacity_seconds: float):
+        self.sample_rate = sample_rate
+        capacity = max(int(sample_rate * capacity_seconds), 1)
+        self._samples = np.empty(capacity, dtype=np.float32)
+        self._pcm = np.empty(capacity, dtype=np.int16)
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        return self._samples.size
+
+    @property
+    def duration(self) -> float:
+        return self._length / self.sample_rate
+
+    def append(self, chunk: np.ndarray):
+        """Copy a chunk of float32 samples (any shape, mono) into the buffer"""
+        chunk = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        start, end = self._length, self._length + chunk.size
+
+        if end > self._samples.size:
+            self._grow(end)
+
+        samples, pcm = self._samples, self._pcm
+        samples[start:end] = chunk
+        pcm[start:end] = np.clip(chunk, -1.0, 1.0) * 32767
+        # Publish the new length last so readers never see unwritten samples
+        self._length = end
+
+    # Readers take the length before the array: arrays are swapped before the
+    # length is published, so the data up to that length is always valid even
+    # while a capture thread is appending.
+    def samples(self, start: int = 0) -> np.ndarray:
+        """Zero-copy float32 view of the recording from `start`"""
+        length = self._length
+        return self._samples[start:length]
+
+    def pcm(self, start: int = 0) -> np.ndarray:
+        """Zero-copy int16 view of the recording from `start`"""
+        length = self._length
+        return self._pcm[start:length]
+
+    def clear(self):
+        self._length = 0
+
+    def _grow(self, required: int):
+        capacity = max(required, self._samples.size * 2)
+        samples = np.empty(capacity, dtype=np.float32)
+        pcm = np.empty(capacity, dtype=np.int16)
+        samples[:self._length] = self._samples[:self._length]
+        pcm[:self._length] = self._pcm[:self._length]
+        self._samples, self._pcm = samples, pcm
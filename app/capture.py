@@ -0,0 +1,53 @@
+# app/capture.py
+import numpy as np
+
+from app.audio_buffer import CaptureBuffer
+
+BLOCK_SECONDS = 0.05       # PortAudio callback granularity
+
+
+class AudioCapture:
+    """
+    Gapless microphone capture on a sounddevice callback stream.
+
+    PortAudio calls `_callback` on its own thread and it is the only writer
+    of `buffer`; the Streamlit script only reads views and `level`, so no
+    lock is taken and a rerun never waits for audio.
+    """
+
+    def __init__(self, sample_rate: int, capacity_seconds: float):
+        self.sample_rate = sample_rate
+        self.buffer = CaptureBuffer(sample_rate, capacity_seconds)
+        self.level = 0.0           # RMS of the latest block, 0..1
+        self.overflows = 0
+        self._stream = None
+
+    @property
+    def active(self) -> bool:
+        return self._stream is not None and self._stream.active
+
+    def start(self):
+        # Deferred: PortAudio is only loaded once recording starts
+        import sounddevice as sd
+
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            blocksize=int(self.sample_rate * BLOCK_SECONDS),
+            callback=self._callback,
+        )
+        self._stream.start()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def _callback(self, indata, frames, time_info, status):
+        if status.input_overflow:
+            self.overflows += 1
+        block = indata[:, 0]
+        self.buffer.append(block)
+        self.level = float(np.sqrt(np.dot(block, block) / max(len(block), 1)))
@@ -1,12 +1,21 @@
 # app/database.py
 import os
 from datetime import datetime
+from typing import TYPE_CHECKING
 import streamlit as st
-from supabase import create_client, Client
-from supabase.client import ClientOptions
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+HISTORY_TTL_SECONDS = 60
+HISTORY_PAGE_SIZE = 25
+INTERVIEW_COLUMNS = "id, candidate_name, job_title, interview_type, final_score, created_at"
+
+def supabase_configured() -> bool:
+    return bool(os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_SERVICE_ROLE_KEY"))
 
 @st.cache_resource
-def init_supabase() -> Client | None:
+def init_supabase() -> "Client | None":
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
@@ -14,6 +23,10 @@ def init_supabase() -> Client | None:
         st.error("Supabase credentials missing")
         return None
 
+    # Deferred: the supabase package is only imported once storage is used
+    from supabase import create_client
+    from supabase.client import ClientOptions
+
     return create_client(
         url,
         key,
@@ -23,9 +36,49 @@ def init_supabase() -> Client | None:
         )
     )
 
+def _with_labels(interview: dict) -> dict:
+    """Parse the timestamp once and attach display labels"""
+    created = datetime.fromisoformat(interview["created_at"])
+    return interview | {
+        "label": f"{interview['candidate_name']} | {interview['job_title']} | {created:%Y-%m-%d}",
+        "date_label": f"{created:%B %d, %Y %H:%M}",
+    }
+
+
+# Read-through caches shared by all sessions; the client argument is not hashed
+@st.cache_data(ttl=HISTORY_TTL_SECONDS, show_spinner=False)
+def _fetch_interview_page(_supabase: "Client", page: int, page_size: int) -> tuple[list, int]:
+    start = page * page_size
+    response = _supabase.table("interviews").select(
+        INTERVIEW_COLUMNS, count="exact"
+    ).order("created_at", desc=True).range(start, start + page_size - 1).execute()
+    return [_with_labels(i) for i in response.data or []], response.count or 0
+
+
+@st.cache_data(ttl=HISTORY_TTL_SECONDS, show_spinner=False)
+def _fetch_interview(_supabase: "Client", interview_id: str) -> dict | None:
+    rows = _supabase.table("interviews").select(INTERVIEW_COLUMNS).eq(
+        "id", interview_id
+    ).execute().data
+    return _with_labels(rows[0]) if rows else None
+
+
+@st.cache_data(ttl=HISTORY_TTL_SECONDS, show_spinner=False)
+def _fetch_questions(_supabase: "Client", interview_id: str) -> list:
+    return _supabase.table("questions").select("*").eq(
+        "interview_id", interview_id
+    ).order("question_number").execute().data or []
+
+
 class DatabaseManager:
-    def __init__(self, supabase: Client):
-        self.supabase = supabase
+    def __init__(self, connect):
+        # Called on first query, so pages that never touch storage skip the client
+        self._connect = connect
+
+    @property
+    def supabase(self) -> "Client | None":
+        return self._connect()
+
     def create_tables(self) -> str:
             """
             Returns SQL schema for Supabase (display-only).
@@ -77,14 +130,22 @@ class DatabaseManager:
         } for qa in interview_data["qa_pairs"]]
 
         self.supabase.table("questions").insert(questions).execute()
+
+        # New rows shift every page of the history list
+        _fetch_interview_page.clear()
         return interview_id
 
+    def get_interview_page(self, page: int, page_size: int = HISTORY_PAGE_SIZE):
+        """Return (interviews, total count) for one page, newest first"""
+        return _fetch_interview_page(self.supabase, page, page_size)
+
+    def get_interview(self, interview_id):
+        return _fetch_interview(self.supabase, interview_id)
+
     def get_all_interviews(self):
         return self.supabase.table("interviews").select("*").order(
             "created_at", desc=True
         ).execute().data or []
 
     def get_questions(self, interview_id):
-        return self.supabase.table("questions").select("*").eq(
-            "interview_id", interview_id
-        ).order("question_number").execute().data or []
+        return _fetch_questions(self.supabase, interview_id)
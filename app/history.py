@@ -1,12 +1,20 @@
 # app/history.py
+import math
 import streamlit as st
-from datetime import datetime
+
+from app.database import HISTORY_PAGE_SIZE
 
 
 def render_history(db):
     st.markdown("### 📚 Interview History")
 
-    interviews = db.get_all_interviews()
+    page = st.session_state.history_page
+    interviews, total = db.get_interview_page(page)
+
+    if not interviews and page > 0:
+        # The list shrank below the current page
+        st.session_state.history_page = 0
+        st.rerun()
 
     if not interviews:
         st.info("No interviews found.")
@@ -21,16 +29,23 @@ def render_history(db):
         st.markdown("#### Past Interviews")
 
         for interview in interviews:
-            label = (
-                f"{interview['candidate_name']} | "
-                f"{interview['job_title']} | "
-                f"{datetime.fromisoformat(interview['created_at']).strftime('%Y-%m-%d')}"
-            )
-
-            if st.button(label, key=f"int_{interview['id']}"):
+            if st.button(interview["label"], key=f"int_{interview['id']}"):
                 st.session_state.selected_interview_id = interview["id"]
                 st.rerun()
 
+        pages = max(math.ceil(total / HISTORY_PAGE_SIZE), 1)
+        prev_col, page_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if st.button("◀", disabled=page == 0, key="history_prev"):
+                st.session_state.history_page -= 1
+                st.rerun()
+        with page_col:
+            st.caption(f"Page {page + 1} of {pages} ({total} interviews)")
+        with next_col:
+            if st.button("▶", disabled=page + 1 >= pages, key="history_next"):
+                st.session_state.history_page += 1
+                st.rerun()
+
     with col2:
         interview_id = st.session_state.get("selected_interview_id")
 
@@ -40,7 +55,7 @@ def render_history(db):
 
         interview = next(
             (i for i in interviews if i["id"] == interview_id), None
-        )
+        ) or db.get_interview(interview_id)
 
         if not interview:
             st.error("Interview not found.")
@@ -51,10 +66,7 @@ def render_history(db):
         st.write(f"**Role:** {interview['job_title']}")
         st.write(f"**Type:** {interview['interview_type']}")
         st.write(f"**Final Score:** {interview['final_score']:.1f}/10")
-        st.write(
-            f"**Date:** "
-            f"{datetime.fromisoformat(interview['created_at']).strftime('%B %d, %Y %H:%M')}"
-        )
+        st.write(f"**Date:** {interview['date_label']}")
 
         st.markdown("---")
         st.markdown("#### Questions & Answers")
@@ -2,7 +2,11 @@
 import os
 import json
 import streamlit as st
-from openai import OpenAI
+
+from backend.http_clients import get_openai_client
+
+def openai_configured() -> bool:
+    return bool(os.getenv("OPENAI_API_KEY"))
 
 @st.cache_resource
 def init_openai():
@@ -10,7 +14,7 @@ def init_openai():
     if not key:
         st.error("OpenAI API key missing")
         return None
-    return OpenAI(api_key=key)
+    return get_openai_client(key, os.getenv("OPENAI_BASE_URL"))
 
 def ask_ai_question(client, resume, jd, interview_type, q_num, history):
     context = ""
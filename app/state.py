@@ -24,7 +24,12 @@ def init_session_state():
         # recording state
         "recording": False,
         "recording_start_time": None,
-        "audio_frames": [],
+        "audio_capture": None,
+        "audio_buffer": None,
+        "waveform": None,
+        "transcriber": None,
+        "wav_encoder": None,
+        "stt_stats": None,
         "partial_transcript": "",
 
         # modes
@@ -32,6 +37,7 @@ def init_session_state():
 
         # ui
         "show_history": False,
+        "history_page": 0,
     }
 
     for k, v in defaults.items():
@@ -0,0 +1,67 @@
+import numpy as np
+
+from app.audio_buffer import CaptureBuffer
+
+RATE = 100
+
+
+def ramp(start, count):
+    return (np.arange(start, start + count, dtype=np.float32) / 1000)
+
+
+def test_append_fills_to_capacity_then_grows():
+    """Test that appends fill the preallocated arrays and grow past capacity without losing samples"""
+    buffer = CaptureBuffer(RATE, capacity_seconds=1)
+    buffer.append(ramp(0, 60))
+    buffer.append(ramp(60, 40))
+    assert buffer.capacity == 100 and len(buffer) == 100
+
+    buffer.append(ramp(100, 30))
+    assert buffer.capacity == 200
+    assert np.array_equal(buffer.samples(), ramp(0, 130))
+    assert buffer.duration == 1.3
+
+    buffer.append(ramp(130, 500))
+    assert buffer.capacity == 630
+    assert np.array_equal(buffer.samples(120), ramp(120, 510))
+
+
+def test_views_taken_before_growth_stay_valid():
+    """Test that a reader's view survives the arrays being replaced"""
+    buffer = CaptureBuffer(RATE, capacity_seconds=1)
+    buffer.append(ramp(0, 100))
+    view = buffer.samples()
+    buffer.append(ramp(100, 50))
+    assert np.array_equal(view, ramp(0, 100))
+
+
+def test_pcm_matches_float_samples():
+    """Test that the int16 copy is the clipped float32 copy scaled to full range"""
+    buffer = CaptureBuffer(RATE, capacity_seconds=1)
+    chunk = np.array([[0.0], [0.5], [-0.5], [1.0], [-1.0], [1.5], [-2.0]], dtype=np.float32)
+    buffer.append(chunk)
+
+    assert np.array_equal(buffer.samples(), chunk.reshape(-1))
+    assert buffer.pcm().tolist() == [0, 16383, -16383, 32767, -32767, 32767, -32767]
+    assert buffer.pcm(3).base is not None  # a view, not a copy
+    buffer.clear()
+    assert len(buffer.samples()) == len(buffer.pcm()) == 0
+
+
+def test_length_is_published_after_the_samples():
+    """Test that both arrays are written before the new length becomes visible"""
+    buffer = CaptureBuffer(RATE, capacity_seconds=1)
+    lengths_during_writes = []
+
+    class Recording(np.ndarray):
+        def __setitem__(self, key, value):
+            lengths_during_writes.append(len(buffer))
+            super().__setitem__(key, value)
+
+    buffer._samples = buffer._samples.view(Recording)
+    buffer._pcm = buffer._pcm.view(Recording)
+    buffer.append(ramp(0, 10))
+    buffer.append(ramp(10, 10))
+
+    assert lengths_during_writes == [0, 0, 10, 10]
+    assert len(buffer) == 20
@@ -0,0 +1,72 @@
+import numpy as np
+
+from app.transcription import IncrementalTranscriber, stitch
+
+RATE = 1000
+
+
+def test_stitch_drops_repeated_boundary_words():
+    """Test that words transcribed twice from the overlap are removed"""
+    assert stitch("we deployed it to the Cluster.", "the cluster, then scaled it") == "then scaled it"
+
+
+def test_stitch_keeps_segment_without_overlap():
+    """Test that a segment sharing no boundary words is kept whole"""
+    assert stitch("we deployed it", "then scaled it") == "then scaled it"
+    assert stitch("", "first words") == "first words"
+
+
+def test_stitch_only_looks_at_the_boundary():
+    """Test that repeats beyond the overlap window are not treated as overlap"""
+    assert stitch("a b c d e", "a b c d e f", max_overlap_words=3) == "a b c d e f"
+
+
+class FakeWhisper:
+    """Returns scripted text per call and records the audio span and prompt"""
+
+    def __init__(self, *texts):
+        self.texts = list(texts)
+        self.calls = []
+
+    def __call__(self, pcm, prompt):
+        self.calls.append((len(pcm), prompt))
+        return self.texts.pop(0)
+
+
+def test_segments_are_committed_and_stitched():
+    """Test that only new audio plus the overlap is sent and the overlap is stitched out"""
+    whisper = FakeWhisper("hello there", "there my name", "name is Sam")
+    transcriber = IncrementalTranscriber(whisper, RATE, min_new_seconds=2, overlap_seconds=0.5)
+    audio = np.zeros(6 * RATE, dtype=np.int16)
+
+    assert transcriber.update(audio[:1500]) == ""        # not enough new audio yet
+    assert transcriber.update(audio[:2000]) == "hello there"
+    assert transcriber.update(audio[:4000]) == "hello there my name"
+    assert transcriber.finish(audio[:5000]) == "hello there my name is Sam"
+
+    assert [n for n, _ in whisper.calls] == [2000, 2500, 1500]
+    assert whisper.calls[2][1] == "hello there my name"
+    assert transcriber.committed == 5000
+
+
+def test_empty_partial_adds_no_segment():
+    """Test that a silent segment advances the commit point without adding text"""
+    whisper = FakeWhisper("  ", "hello")
+    transcriber = IncrementalTranscriber(whisper, RATE, min_new_seconds=1, overlap_seconds=0)
+    audio = np.zeros(3 * RATE, dtype=np.int16)
+
+    assert transcriber.update(audio[:1000]) == ""
+    assert transcriber.segments == [] and transcriber.committed == 1000
+    assert transcriber.finish(audio[:1500]) == "hello"
+    assert [n for n, _ in whisper.calls] == [1000, 500]
+
+
+def test_finish_after_everything_was_committed():
+    """Test that finishing with no new audio sends nothing"""
+    whisper = FakeWhisper("complete answer")
+    transcriber = IncrementalTranscriber(whisper, RATE, min_new_seconds=1)
+    audio = np.zeros(RATE, dtype=np.int16)
+
+    transcriber.update(audio)
+    assert transcriber.finish(audio) == "complete answer"
+    assert len(whisper.calls) == 1
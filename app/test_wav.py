@@ -0,0 +1,36 @@
+import wave
+
+import numpy as np
+
+from app.wav import HEADER_SIZE, WavEncoder
+from backend.audio_processing import decode_wav
+
+RATE = 16000
+
+
+def test_round_trip():
+    """Test that the encoded stream reads back through wave and the backend decoder"""
+    pcm = (np.sin(np.arange(RATE) / 8) * 12000).astype(np.int16)
+    stream = WavEncoder(RATE).encode(pcm)
+    assert stream.name == "audio.wav" and stream.tell() == 0
+
+    with wave.open(stream) as wav:
+        assert (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) == (1, 2, RATE)
+        assert np.array_equal(np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2"), pcm)
+
+    decoded, sample_rate = decode_wav(stream.getvalue())
+    assert sample_rate == RATE and np.array_equal(decoded, pcm)
+
+
+def test_reused_stream_holds_only_the_latest_clip():
+    """Test that a shorter clip leaves no bytes of a longer previous one"""
+    encoder = WavEncoder(RATE)
+    encoder.encode(np.full(RATE, 1000, dtype=np.int16))
+    short = np.arange(100, dtype=np.int16)
+    stream = encoder.encode(short)
+
+    data = stream.getvalue()
+    assert len(data) == HEADER_SIZE + short.nbytes
+    assert int.from_bytes(data[4:8], "little") == len(data) - 8
+    assert int.from_bytes(data[40:44], "little") == short.nbytes
+    assert np.array_equal(decode_wav(data)[0], short)
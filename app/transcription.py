@@ -0,0 +1,87 @@
+# app/transcription.py
+import re
+from typing import Callable, List
+
+import numpy as np
+
+OVERLAP_SECONDS = 1.0       # audio re-sent before each segment for boundary words
+MAX_OVERLAP_WORDS = 8       # longest duplicated word run removed when stitching
+PROMPT_CHARS = 200          # previous transcript passed to Whisper as context
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def stitch(previous: str, segment: str, max_overlap_words: int = MAX_OVERLAP_WORDS) -> str:
+    """
+    Return the part of `segment` that is new relative to `previous`.
+
+    The overlapping audio at a segment boundary is transcribed twice, so the
+    longest run of words ending `previous` that also starts `segment` is
+    dropped (ignoring case and punctuation).
+    """
+    new_words = segment.split()
+    old = [_normalize(w) for w in previous.split()[-max_overlap_words:]]
+    new = [_normalize(w) for w in new_words[:max_overlap_words]]
+
+    for size in range(min(len(old), len(new)), 0, -1):
+        if old[-size:] == new[:size]:
+            return " ".join(new_words[size:])
+    return segment
+
+
+class IncrementalTranscriber:
+    """
+    Transcribes a growing recording one committed segment at a time.
+
+    Each call only sends audio recorded since the last committed segment
+    (plus a short overlap), stitches the result onto the running transcript
+    and advances the commit point. `finish` sends just the remaining tail.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[np.ndarray, str], str],
+        sample_rate: int,
+        min_new_seconds: float,
+        overlap_seconds: float = OVERLAP_SECONDS,
+    ):
+        self._transcribe = transcribe
+        self.sample_rate = sample_rate
+        self.min_new_samples = int(min_new_seconds * sample_rate)
+        self.overlap_samples = int(overlap_seconds * sample_rate)
+        self.committed = 0
+        self.segments: List[str] = []
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(self.segments)
+
+    def due(self, total_samples: int) -> bool:
+        """Whether enough new audio has arrived to transcribe another segment"""
+        return total_samples - self.committed >= self.min_new_samples
+
+    def update(self, pcm: np.ndarray) -> str:
+        """Transcribe the next segment if one is due; return the transcript"""
+        if self.due(len(pcm)):
+            self._commit(pcm)
+        return self.transcript
+
+    def finish(self, pcm: np.ndarray) -> str:
+        """Transcribe whatever is left after the last segment"""
+        if len(pcm) > self.committed:
+            self._commit(pcm)
+        return self.transcript
+
+    def _commit(self, pcm: np.ndarray):
+        end = len(pcm)
+        start = max(self.committed - self.overlap_samples, 0)
+        prompt = self.transcript[-PROMPT_CHARS:]
+
+        text = self._transcribe(pcm[start:end], prompt).strip()
+        if self.segments:
+            text = stitch(self.transcript, text)
+        if text:
+            self.segments.append(text)
+        self.committed = end
@@ -8,22 +8,43 @@ from app.utils import extract_text_from_pdf
 from app.audio import (
     text_to_speech,
     start_recording,
-    record_chunk,
+    input_level,
     draw_waveform,
     transcribe_partial,
     stop_and_transcribe,
+    REFRESH_SECONDS,
 )
-from app.openai_client import ask_ai_question, evaluate_answer
+from app.database import supabase_configured
+from app.openai_client import ask_ai_question, evaluate_answer, init_openai, openai_configured
 from app.history import render_history
+from backend.http_clients import client_stats
+
+COUNTDOWN_SECONDS = 3
 
 
 # ---------- Sidebar ----------
 def render_sidebar(supabase_connected: bool, openai_connected: bool, db):
     with st.sidebar:
         st.markdown("### 📊 System Status")
-        st.markdown(f"**Supabase:** {'✅ Connected' if supabase_connected else '❌ Not Connected'}")
+        st.markdown(f"**Supabase:** {'✅ Configured' if supabase_connected else '❌ Not Configured'}")
         st.markdown(f"**OpenAI:** {'✅ Ready' if openai_connected else '❌ Not Configured'}")
 
+        stats = st.session_state.stt_stats
+        if stats is not None and stats.answers:
+            summary = stats.summary()
+            st.caption(
+                f"🎙️ STT upload: {summary['avg_uploaded_bytes'] / 1024:.0f} KB per request "
+                f"(raw {summary['avg_input_bytes'] / 1024:.0f} KB), "
+                f"{summary['avg_stt_latency_seconds']:.1f}s latency"
+            )
+
+        pool = client_stats()
+        if pool["requests"]:
+            st.caption(
+                f"🔌 OpenAI connections reused: {pool['reuse_ratio']:.0%} "
+                f"of {pool['requests']} requests"
+            )
+
         st.markdown("---")
         if st.button("📚 View Past Interviews"):
             st.session_state.show_history = True
@@ -34,7 +55,7 @@ def render_sidebar(supabase_connected: bool, openai_connected: bool, db):
 
 
 # ---------- Setup Screen ----------
-def render_setup(openai_client):
+def render_setup():
     st.markdown("### 📋 Interview Setup")
 
     col1, col2 = st.columns(2)
@@ -78,7 +99,7 @@ def render_setup(openai_client):
 
         with st.spinner("🤖 Preparing first question..."):
             st.session_state.current_question = ask_ai_question(
-                openai_client,
+                init_openai(),
                 resume_text,
                 jd_text,
                 interview_type,
@@ -94,7 +115,7 @@ def render_setup(openai_client):
 
 
 # ---------- Interview Screen ----------
-def render_interview(openai_client):
+def render_interview():
     q_num = st.session_state.current_question_num
     now = time.time()
 
@@ -125,58 +146,69 @@ def render_interview(openai_client):
     else:
         st.caption("🔒 Repeat disabled")
 
-    # ⏱️ Start recording after repeat window
-    if elapsed > st.session_state.repeat_window and not st.session_state.recording:
-        for i in [3, 2, 1]:
-            st.warning(f"Recording starts in {i}...")
-            time.sleep(1)
+    # Live widgets refresh in fragments; the full script only reruns on phase changes
+    if st.session_state.recording:
+        render_recording()
+    else:
+        render_countdown()
+
 
+# ⏱️ Start recording after repeat window
+@st.fragment(run_every=1)
+def render_countdown():
+    elapsed = time.time() - st.session_state.question_start_time
+    starts_in = st.session_state.repeat_window + COUNTDOWN_SECONDS - elapsed
+
+    if starts_in > COUNTDOWN_SECONDS:
+        st.caption(f"⏱️ Recording starts in {int(starts_in - COUNTDOWN_SECONDS)} seconds")
+    elif starts_in > 0:
+        st.warning(f"Recording starts in {int(starts_in) + 1}...")
+    else:
         st.session_state.recording = True
         st.session_state.recording_start_time = time.time()
         start_recording()
-        st.rerun()
+        st.rerun(scope="app")
 
-    # 🎙️ Recording phase
-    if st.session_state.recording:
-        rec_elapsed = time.time() - st.session_state.recording_start_time
-        remaining = st.session_state.record_max_time - rec_elapsed
 
-        st.info(f"🎙️ Recording… {int(remaining)} seconds remaining")
+# 🎙️ Recording phase
+@st.fragment(run_every=REFRESH_SECONDS)
+def render_recording():
+    rec_elapsed = time.time() - st.session_state.recording_start_time
+    remaining = st.session_state.record_max_time - rec_elapsed
 
-        record_chunk()
-        draw_waveform()
+    st.info(f"🎙️ Recording… {int(remaining)} seconds remaining")
 
-        # Partial transcription every 5s
-        if int(rec_elapsed) % 5 == 0:
-            transcribe_partial()
+    # Audio is captured in the background; just poll level and waveform
+    st.progress(min(input_level() * 4, 1.0), text="Input level")
+    draw_waveform()
 
-        # Show live transcript near end
-        if remaining <= st.session_state.preview_time:
-            st.text_area(
-                "Live Transcription Preview",
-                value=st.session_state.partial_transcript,
-                height=150,
-            )
+    # Partial transcription of new audio (no-op until 5s have accumulated)
+    transcribe_partial()
 
-        # Stop button after 1.5 min
-        if rec_elapsed >= st.session_state.stop_button_time:
-            if st.button("⏹️ Stop & Submit"):
-                finalize_answer(openai_client)
-                return
+    # Show live transcript near end
+    if remaining <= st.session_state.preview_time:
+        st.text_area(
+            "Live Transcription Preview",
+            value=st.session_state.partial_transcript,
+            height=150,
+        )
 
-        # Auto stop
-        if remaining <= 0:
-            finalize_answer(openai_client)
+    # Stop button after 1.5 min
+    if rec_elapsed >= st.session_state.stop_button_time:
+        if st.button("⏹️ Stop & Submit"):
+            finalize_answer()
             return
 
-        time.sleep(0.1)
-        st.rerun()
+    # Auto stop
+    if remaining <= 0:
+        finalize_answer()
 
 
 # ---------- Finalize Answer ----------
-def finalize_answer(openai_client):
+def finalize_answer():
     answer = stop_and_transcribe()
     q = st.session_state.current_question
+    openai_client = init_openai()
 
     score, feedback = evaluate_answer(
         openai_client,
@@ -216,7 +248,7 @@ def finalize_answer(openai_client):
             st.session_state.conversation_history,
         )
 
-    st.rerun()
+    st.rerun(scope="app")
 
 
 # ---------- Results ----------
@@ -244,16 +276,16 @@ def render_results(db):
 
 
 # ---------- App Orchestrator ----------
-def render_app(db, openai_client):
+def render_app(db):
     st.markdown('<div class="main-header">🎯 AI Interview System</div>', unsafe_allow_html=True)
 
-    render_sidebar(bool(db.supabase), bool(openai_client), db)
+    render_sidebar(supabase_configured(), openai_configured(), db)
 
     if st.session_state.show_history:
         render_history(db)
     elif not st.session_state.interview_started:
-        render_setup(openai_client)
+        render_setup()
     elif st.session_state.current_question_num <= st.session_state.total_questions:
-        render_interview(openai_client)
+        render_interview()
     else:
         render_results(db)
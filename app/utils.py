@@ -1,7 +1,8 @@
 # app/utils.py
 import io
-import PyPDF2
 
 def extract_text_from_pdf(file):
+    import PyPDF2  # deferred: only PDF uploads need it
+
     reader = PyPDF2.PdfReader(io.BytesIO(file.read()))
     return "".join(page.extract_text() or "" for page in reader.pages)
@@ -0,0 +1,43 @@
+# app/wav.py
+import io
+import struct
+
+import numpy as np
+
+HEADER_SIZE = 44
+
+
+class WavEncoder:
+    """
+    Encodes int16 PCM into a reusable in-memory WAV stream.
+
+    The 44-byte RIFF header is built once; each call only patches the two
+    size fields and copies the samples into the same BytesIO, so no temp
+    files or per-call allocations are involved.
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1, name: str = "audio.wav"):
+        block_align = channels * 2
+        self._header = bytearray(struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36, b"WAVE",
+            b"fmt ", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, 16,
+            b"data", 0,
+        ))
+        self._stream = io.BytesIO()
+        # The OpenAI client uses the name to detect the upload format
+        self._stream.name = name
+
+    def encode(self, pcm: np.ndarray) -> io.BytesIO:
+        """Return the shared stream positioned at the start of a WAV of `pcm`"""
+        data = np.ascontiguousarray(pcm, dtype="<i2")
+        struct.pack_into("<I", self._header, 4, 36 + data.nbytes)
+        struct.pack_into("<I", self._header, 40, data.nbytes)
+
+        stream = self._stream
+        stream.seek(0)
+        stream.write(self._header)
+        stream.write(data)
+        stream.truncate()
+        stream.seek(0)
+        return stream
@@ -0,0 +1,45 @@
+# app/waveform.py
+import numpy as np
+
+COLUMNS = 400              # fixed chart width in min/max buckets
+
+
+class WaveformEnvelope:
+    """
+    Min/max envelope of a recording at a fixed number of columns.
+
+    Each column covers a fixed span of the longest allowed recording, so
+    `update` only reduces samples captured since the last call (plus the
+    partially filled column) and the chart always has `columns` points,
+    however long the answer runs.
+    """
+
+    def __init__(self, sample_rate: int, max_seconds: float, columns: int = COLUMNS):
+        self.columns = columns
+        self.bucket = max(int(np.ceil(sample_rate * max_seconds / columns)), 1)
+        self.mins = np.zeros(columns, dtype=np.float32)
+        self.maxs = np.zeros(columns, dtype=np.float32)
+        self.filled = 0            # completed columns
+
+    def update(self, samples: np.ndarray):
+        """Fold newly captured samples into the envelope"""
+        end = min(len(samples), self.columns * self.bucket)
+        start = self.filled * self.bucket
+        if end <= start:
+            return
+
+        new = samples[start:end]
+        full = len(new) // self.bucket
+        if full:
+            blocks = new[:full * self.bucket].reshape(full, self.bucket)
+            self.mins[self.filled:self.filled + full] = blocks.min(axis=1)
+            self.maxs[self.filled:self.filled + full] = blocks.max(axis=1)
+            self.filled += full
+
+        tail = new[full * self.bucket:]
+        if tail.size:
+            self.mins[self.filled] = tail.min()
+            self.maxs[self.filled] = tail.max()
+
+    def chart_data(self) -> dict:
+        return {"max": self.maxs, "min": self.mins}
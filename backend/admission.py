@@ -0,0 +1,188 @@
+"""Admission control for endpoints that wait on OpenAI.
+
+Each worker allows ``ADMISSION_MAX_IN_FLIGHT`` LLM-backed requests at once.
+Beyond that, requests for interviews already in progress wait in a FIFO queue.
+A request that cannot get a slot within ``ADMISSION_MAX_QUEUE_WAIT_SECONDS``,
+or finds the queue full, gets 503 with ``Retry-After``.
+
+New interviews (``/interview/start``) never queue. They are refused at once
+with 429 and ``Retry-After`` while any of these holds:
+
+- only the ``ADMISSION_RESERVED_SLOTS`` slots kept for running interviews are left;
+- requests are queued;
+- the recent queueing delay is above ``ADMISSION_START_MAX_DELAY_SECONDS``.
+
+When upstream latency spikes, candidates already mid-interview keep their
+latency, and new load is turned away quickly instead of piling up.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, Deque, Dict
+
+from backend import metrics
+from backend.config import settings
+
+EWMA_WEIGHT = 0.2        # weight of the newest sample in the delay and service-time averages
+DELAY_HALF_LIFE = 5.0    # seconds; the delay average fades when nothing is admitted
+MAX_RETRY_AFTER = 60
+
+
+class Priority(str, Enum):
+    INTERVIEW = "interview"   # a running interview: questions, answers, speech
+    NEW = "new"               # starting another interview
+
+
+class Rejected(Exception):
+    """Request refused by admission control"""
+
+    def __init__(self, status_code: int, retry_after: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        max_queue_wait: float,
+        reserved_slots: int,
+        start_max_delay: float,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+        self.reserved_slots = min(reserved_slots, max_in_flight - 1)
+        self.start_max_delay = start_max_delay
+
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self._queue_delay = 0.0      # averaged over admitted requests, 0 for those not queued
+        self._delay_updated = time.monotonic()
+        self.service_time = 0.0      # average time a slot is held
+        self.counts: Dict[str, int] = {}
+
+    @property
+    def queued(self) -> int:
+        return len(self.waiters)
+
+    def _count(self, priority: Priority, outcome: str):
+        name = f"{priority.value}_{outcome}"
+        self.counts[name] = self.counts.get(name, 0) + 1
+        metrics.admission_decisions.inc((priority.value, outcome))
+
+    @property
+    def queue_delay(self) -> float:
+        """Recent queueing delay, decaying while no requests are admitted"""
+        idle = time.monotonic() - self._delay_updated
+        return self._queue_delay * 0.5 ** (idle / DELAY_HALF_LIFE)
+
+    def _observe_delay(self, priority: Priority, seconds: float):
+        self._queue_delay = self.queue_delay + EWMA_WEIGHT * (seconds - self.queue_delay)
+        self._delay_updated = time.monotonic()
+        metrics.admission_queue_duration.observe(seconds, (priority.value,))
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained"""
+        if not self.service_time:
+            return 1
+        backlog = (self.in_flight + self.queued) / self.max_in_flight
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(backlog * self.service_time)))
+
+    def _reject(self, priority: Priority, status_code: int, outcome: str, detail: str) -> Rejected:
+        self._count(priority, outcome)
+        return Rejected(status_code, self.retry_after(), detail)
+
+    async def acquire(self, priority: Priority):
+        """Take a slot, waiting in the queue if allowed; raises Rejected"""
+        if priority is Priority.NEW:
+            if (
+                self.in_flight >= self.max_in_flight - self.reserved_slots
+                or self.waiters
+                or self.queue_delay > self.start_max_delay
+            ):
+                raise self._reject(priority, 429, "shed", "Busy with running interviews, try again shortly")
+        elif self.in_flight >= self.max_in_flight or self.waiters:
+            if len(self.waiters) >= self.max_queue:
+                raise self._reject(priority, 503, "queue_full", "Server is at capacity, try again shortly")
+            await self._wait(priority)
+            return
+
+        self.in_flight += 1
+        self._count(priority, "admitted")
+        self._observe_delay(priority, 0.0)
+
+    async def _wait(self, priority: Priority):
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_queue_wait)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                self.waiters.remove(waiter)
+                raise self._reject(priority, 503, "timeout", "Server is at capacity, try again shortly")
+        except asyncio.CancelledError:
+            # Client went away; hand on a slot that was already granted
+            if waiter.done():
+                self.release()
+            else:
+                self.waiters.remove(waiter)
+            raise
+        self._count(priority, "admitted")
+        self._observe_delay(priority, time.perf_counter() - started)
+
+    def release(self, held: float = 0.0):
+        """Free a slot, handing it straight to the next waiter"""
+        if held:
+            self.service_time += EWMA_WEIGHT * (held - self.service_time)
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # in_flight is unchanged: the slot moves on
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def admit(self, priority: Priority) -> AsyncIterator[None]:
+        if not self.enabled:
+            yield
+            return
+        await self.acquire(priority)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "reserved_slots": self.reserved_slots,
+            "queue_delay_ms": round(self.queue_delay * 1000, 1),
+            "service_time_ms": round(self.service_time * 1000, 1),
+            "retry_after_s": self.retry_after(),
+            **self.counts,
+        }
+
+
+# Singleton instance
+admission = AdmissionController(
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    max_queue_wait=settings.ADMISSION_MAX_QUEUE_WAIT_SECONDS,
+    reserved_slots=settings.ADMISSION_RESERVED_SLOTS,
+    start_max_delay=settings.ADMISSION_START_MAX_DELAY_SECONDS,
+    enabled=settings.ADMISSION_ENABLED,
+)
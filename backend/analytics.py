@@ -0,0 +1,195 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Ten one-point buckets over the 0-10 score range; 10 falls in the last bucket
+HISTOGRAM_EDGES = np.arange(0, 11, dtype=np.float64)
+QUANTILES = (25, 50, 75, 90)
+
+Cohort = Tuple[str, str]
+
+
+def percentile_rank(below: int, equal: int, total: int) -> float:
+    """Mid-rank percentile: share of the cohort below a score, counting ties as half"""
+    if not total:
+        return 0.0
+    return (below + 0.5 * equal) / total * 100
+
+
+def histogram_quantiles(histogram: Iterable[int], quantiles: Iterable[float] = QUANTILES) -> Dict[str, float]:
+    """Approximate quantiles by interpolating within histogram buckets"""
+    counts = np.asarray(list(histogram), dtype=np.float64)
+    cumulative = np.concatenate(([0.0], np.cumsum(counts)))
+    if cumulative[-1] == 0:
+        return {f"p{q}": 0.0 for q in quantiles}
+
+    targets = np.asarray(list(quantiles), dtype=np.float64) / 100 * cumulative[-1]
+    values = np.interp(targets, cumulative, HISTOGRAM_EDGES)
+    return {f"p{q}": float(v) for q, v in zip(quantiles, values)}
+
+
+def summarize_scores(
+    job_title: str,
+    interview_type: str,
+    scores: np.ndarray,
+    question_sums: Optional[np.ndarray] = None,
+    question_counts: Optional[np.ndarray] = None,
+) -> dict:
+    """Exact distribution summary for a cohort held in memory"""
+    histogram, _ = np.histogram(np.clip(scores, 0, 10), bins=HISTOGRAM_EDGES)
+    values = np.percentile(scores, QUANTILES) if scores.size else np.zeros(len(QUANTILES))
+
+    return {
+        "job_title": job_title,
+        "interview_type": interview_type,
+        "interview_count": int(scores.size),
+        "mean_score": float(scores.mean()) if scores.size else 0.0,
+        "std_score": float(scores.std()) if scores.size else 0.0,
+        "min_score": float(scores.min()) if scores.size else 0.0,
+        "max_score": float(scores.max()) if scores.size else 0.0,
+        "histogram": histogram.tolist(),
+        "quantiles": {f"p{q}": float(v) for q, v in zip(QUANTILES, values)},
+        "question_averages": _question_averages(question_sums, question_counts),
+    }
+
+
+def summarize_aggregates(row: dict, question_rows: List[dict]) -> dict:
+    """Distribution summary from a trigger-maintained aggregate row"""
+    count = row["interview_count"] or 0
+    mean = row["score_sum"] / count if count else 0.0
+    variance = row["score_sq_sum"] / count - mean * mean if count else 0.0
+
+    return {
+        "job_title": row["job_title"],
+        "interview_type": row["interview_type"],
+        "interview_count": count,
+        "mean_score": mean,
+        "std_score": float(np.sqrt(max(variance, 0.0))),
+        "min_score": row["min_score"] or 0.0,
+        "max_score": row["max_score"] or 0.0,
+        "histogram": list(row["histogram"]),
+        "quantiles": histogram_quantiles(row["histogram"]),
+        "question_averages": sorted(
+            (
+                {
+                    "question_number": q["question_number"],
+                    "answer_count": q["answer_count"],
+                    "average_score": q["score_sum"] / q["answer_count"] if q["answer_count"] else 0.0,
+                }
+                for q in question_rows
+            ),
+            key=lambda q: q["question_number"],
+        ),
+    }
+
+
+def _question_averages(sums: Optional[np.ndarray], counts: Optional[np.ndarray]) -> List[dict]:
+    if sums is None or counts is None:
+        return []
+    numbers = np.flatnonzero(counts)
+    averages = sums[numbers] / counts[numbers]
+    return [
+        {"question_number": int(n), "answer_count": int(c), "average_score": float(a)}
+        for n, c, a in zip(numbers, counts[numbers], averages)
+    ]
+
+
+class CohortIndex:
+    """In-memory score index for the local backend.
+
+    Keeps one sorted score array per (job_title, interview_type) cohort plus
+    per-question-number running sums, so summaries and percentile ranks are
+    NumPy operations rather than table scans. Updated incrementally on save
+    and delete.
+    """
+
+    def __init__(self):
+        self._scores: Dict[Cohort, np.ndarray] = {}
+        self._question_sums: Dict[Cohort, np.ndarray] = {}
+        self._question_counts: Dict[Cohort, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def load(self, interviews: Iterable[Tuple[str, str, float]], questions: Iterable[Tuple[str, str, int, float]]):
+        """Bulk-build the index from (job_title, interview_type, score) rows"""
+        grouped: Dict[Cohort, List[float]] = {}
+        for job_title, interview_type, score in interviews:
+            if score is not None:
+                grouped.setdefault((job_title, interview_type), []).append(score)
+
+        question_grouped: Dict[Cohort, List[Tuple[int, float]]] = {}
+        for job_title, interview_type, number, score in questions:
+            if score is not None:
+                question_grouped.setdefault((job_title, interview_type), []).append((number, score))
+
+        with self._lock:
+            self._scores = {cohort: np.sort(np.asarray(s, dtype=np.float64)) for cohort, s in grouped.items()}
+            self._question_sums = {}
+            self._question_counts = {}
+            for cohort, rows in question_grouped.items():
+                self._add_questions(cohort, rows, sign=1)
+
+    def add(self, job_title: str, interview_type: str, score: Optional[float], question_scores: Iterable[Tuple[int, float]]):
+        """Account for a newly saved interview"""
+        cohort = (job_title, interview_type)
+        with self._lock:
+            if score is not None:
+                scores = self._scores.get(cohort, np.empty(0, dtype=np.float64))
+                self._scores[cohort] = np.insert(scores, np.searchsorted(scores, score), score)
+            self._add_questions(cohort, question_scores, sign=1)
+
+    def remove(self, job_title: str, interview_type: str, score: Optional[float], question_scores: Iterable[Tuple[int, float]]):
+        """Account for a deleted interview"""
+        cohort = (job_title, interview_type)
+        with self._lock:
+            scores = self._scores.get(cohort)
+            if score is not None and scores is not None:
+                position = np.searchsorted(scores, score)
+                if position < scores.size and scores[position] == score:
+                    self._scores[cohort] = np.delete(scores, position)
+            self._add_questions(cohort, question_scores, sign=-1)
+
+    def summaries(self) -> List[dict]:
+        """Distribution summary for every cohort"""
+        with self._lock:
+            return [
+                summarize_scores(
+                    job_title,
+                    interview_type,
+                    scores,
+                    self._question_sums.get((job_title, interview_type)),
+                    self._question_counts.get((job_title, interview_type)),
+                )
+                for (job_title, interview_type), scores in self._scores.items()
+                if scores.size
+            ]
+
+    def rank(self, job_title: str, interview_type: str, score: float) -> dict:
+        """Percentile rank of a score within its cohort (two binary searches)"""
+        with self._lock:
+            scores = self._scores.get((job_title, interview_type), np.empty(0, dtype=np.float64))
+            below = int(np.searchsorted(scores, score, side="left"))
+            equal = int(np.searchsorted(scores, score, side="right")) - below
+            return {
+                "cohort_size": int(scores.size),
+                "percentile": percentile_rank(below, equal, int(scores.size)),
+            }
+
+    def _add_questions(self, cohort: Cohort, question_scores: Iterable[Tuple[int, float]], sign: int):
+        rows = [(n, s) for n, s in question_scores if s is not None]
+        if not rows:
+            return
+        numbers = np.fromiter((n for n, _ in rows), dtype=np.int64, count=len(rows))
+        values = np.fromiter((s for _, s in rows), dtype=np.float64, count=len(rows))
+
+        sums = self._question_sums.get(cohort, np.zeros(0, dtype=np.float64))
+        counts = self._question_counts.get(cohort, np.zeros(0, dtype=np.int64))
+        size = int(numbers.max()) + 1
+        if size > sums.size:
+            sums = np.pad(sums, (0, size - sums.size))
+            counts = np.pad(counts, (0, size - counts.size))
+
+        np.add.at(sums, numbers, sign * values)
+        np.add.at(counts, numbers, sign)
+        self._question_sums[cohort] = sums
+        self._question_counts[cohort] = counts
@@ -0,0 +1,284 @@
+import io
+import threading
+import wave
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+FRAME_MS = 30             # analysis frame for voice activity detection
+PAD_MS = 150              # audio kept around detected speech
+MAX_PAUSE_MS = 700        # internal silences are shortened to this
+NOISE_MARGIN_DB = 12      # speech must be this far above the noise floor
+MIN_SPEECH_DB = -50       # ...and at least this loud (dBFS)
+SILENCE_DB = -45          # frames below this count as silence when estimating the floor
+MIN_SILENT_FRACTION = 0.1 # the floor is only trusted when this share of frames is silent
+
+# Leading bytes of the containers the transcription API accepts: (offset, magic, extension)
+AUDIO_SIGNATURES = (
+    (8, b"WAVE", "wav"),
+    (0, b"fLaC", "flac"),
+    (0, b"OggS", "ogg"),
+    (0, b"\x1aE\xdf\xa3", "webm"),
+    (0, b"ID3", "mp3"),
+    (4, b"ftyp", "m4a"),
+)
+
+
+@dataclass
+class PreparedAudio:
+    """Audio ready for upload to the transcription API"""
+    data: bytes
+    filename: str
+    input_bytes: int
+    input_seconds: float
+    output_seconds: float
+
+    @property
+    def output_bytes(self) -> int:
+        return len(self.data)
+
+
+def frame_energy_db(pcm: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """RMS level of each analysis frame in dBFS"""
+    frame = max(int(sample_rate * frame_ms / 1000), 1)
+    count = -(-len(pcm) // frame)
+    padded = np.zeros(count * frame, dtype=np.float32)
+    padded[:len(pcm)] = pcm
+    frames = padded.reshape(count, frame) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+
+def speech_threshold(energy_db: np.ndarray) -> float:
+    """Level a frame must exceed to count as speech.
+
+    The 10th percentile is used as the noise floor only when enough frames are
+    actually silent. In continuous speech it would land inside the speech and
+    cut its quieter parts, so only MIN_SPEECH_DB applies then.
+    """
+    if not energy_db.size or np.mean(energy_db < SILENCE_DB) < MIN_SILENT_FRACTION:
+        return MIN_SPEECH_DB
+    return max(float(np.percentile(energy_db, 10)) + NOISE_MARGIN_DB, MIN_SPEECH_DB)
+
+
+def voiced_frames(energy_db: np.ndarray, threshold: Optional[float] = None) -> np.ndarray:
+    """Boolean mask of frames that contain speech, relative to the noise floor"""
+    return energy_db > (speech_threshold(energy_db) if threshold is None else threshold)
+
+
+def speech_mask(
+    pcm: np.ndarray,
+    sample_rate: int,
+    pad_ms: int = PAD_MS,
+    max_pause_ms: int = MAX_PAUSE_MS,
+    frame_ms: int = FRAME_MS,
+    threshold: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Per-frame keep mask: speech plus padding, with leading and trailing
+    silence dropped and internal pauses capped at `max_pause_ms`.
+
+    `threshold` overrides the speech level estimated from `pcm` itself, for
+    pieces of a longer recording whose own energy says little about the room.
+    """
+    voiced = voiced_frames(frame_energy_db(pcm, sample_rate, frame_ms), threshold)
+    if not voiced.any():
+        return voiced
+
+    pad = pad_ms // frame_ms
+    keep = np.convolve(voiced, np.ones(2 * pad + 1), mode="same") > 0
+
+    # Silence runs as [start, end) frame ranges
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], (~keep).astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    internal = (starts > 0) & (ends < keep.size)
+
+    max_pause = max_pause_ms // frame_ms
+    half = max_pause // 2
+    for start, end in zip(starts[internal], ends[internal]):
+        if end - start <= max_pause:
+            keep[start:end] = True
+        else:
+            keep[start:start + half] = True
+            keep[end - half:end] = True
+    return keep
+
+
+def trim_silence(pcm: np.ndarray, sample_rate: int, **kwargs) -> np.ndarray:
+    """Drop leading/trailing silence and shorten long pauses"""
+    keep = speech_mask(pcm, sample_rate, **kwargs)
+    frame = max(int(sample_rate * kwargs.get("frame_ms", FRAME_MS) / 1000), 1)
+    return pcm[np.repeat(keep, frame)[:len(pcm)]]
+
+
+def sniff_audio_format(data: bytes, default: str = "wav") -> str:
+    """File extension for encoded audio, from its leading bytes"""
+    for offset, magic, extension in AUDIO_SIGNATURES:
+        if data[offset:offset + len(magic)] == magic:
+            return extension
+    if len(data) > 1 and data[0] == 0xFF and data[1] & 0xE6 in (0xE2, 0xE4, 0xE6):
+        return "mp3"  # bare MPEG audio frame sync (layer I-III)
+    return default
+
+
+def parse_wav_header(data: bytes) -> Optional[Tuple[int, int, int, int]]:
+    """(sample rate, channels, bits per sample, offset of the samples) from the
+    start of a WAV stream, or None until the header is complete. Data chunk
+    sizes are ignored, so streamed WAV with placeholder sizes works."""
+    if len(data) < 12:
+        return None
+    position = 12
+    fmt = None
+    while position + 8 <= len(data):
+        chunk_id = data[position:position + 4]
+        size = int.from_bytes(data[position + 4:position + 8], "little")
+        if chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            return fmt + (position + 8,)
+        if position + 8 + size > len(data):
+            return None
+        if chunk_id == b"fmt ":
+            channels = int.from_bytes(data[position + 10:position + 12], "little")
+            sample_rate = int.from_bytes(data[position + 12:position + 16], "little")
+            bits = int.from_bytes(data[position + 22:position + 24], "little")
+            fmt = (sample_rate, channels, bits)
+        position += 8 + size + (size & 1)
+    return None
+
+
+def decode_wav(data: bytes) -> Optional[Tuple[np.ndarray, int]]:
+    """Decode 16-bit PCM WAV bytes to mono int16 samples, or None if not that format"""
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    try:
+        with wave.open(io.BytesIO(data)) as wav:
+            if wav.getsampwidth() != 2:
+                return None
+            channels = wav.getnchannels()
+            sample_rate = wav.getframerate()
+            pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+    except (wave.Error, EOFError):
+        return None
+
+    if channels > 1:
+        pcm = pcm[:len(pcm) // channels * channels].reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return pcm, sample_rate
+
+
+def encode_wav(pcm: np.ndarray, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.ascontiguousarray(pcm, dtype="<i2").tobytes())
+    return buffer.getvalue()
+
+
+def encode_flac(pcm: np.ndarray, sample_rate: int) -> Optional[bytes]:
+    """Lossless FLAC encoding, or None when soundfile is not installed"""
+    try:
+        import soundfile as sf
+    except (ImportError, OSError):
+        return None
+    buffer = io.BytesIO()
+    sf.write(buffer, pcm, sample_rate, format="FLAC", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+def audio_duration(data: bytes) -> Optional[float]:
+    """Duration of encoded audio (WAV, FLAC, MP3...) in seconds, or None if unreadable"""
+    try:
+        import soundfile as sf
+    except (ImportError, OSError):
+        return None
+    try:
+        return sf.info(io.BytesIO(data)).duration
+    except Exception:
+        return None
+
+
+def prepare_for_stt(pcm: np.ndarray, sample_rate: int, input_bytes: Optional[int] = None) -> PreparedAudio:
+    """Trim silence and compress int16 PCM for upload"""
+    trimmed = trim_silence(pcm, sample_rate)
+    flac = encode_flac(trimmed, sample_rate)
+    return PreparedAudio(
+        data=flac if flac is not None else encode_wav(trimmed, sample_rate),
+        filename="audio.flac" if flac is not None else "audio.wav",
+        input_bytes=input_bytes if input_bytes is not None else 44 + pcm.nbytes,
+        input_seconds=len(pcm) / sample_rate,
+        output_seconds=len(trimmed) / sample_rate,
+    )
+
+
+def passthrough(data: bytes) -> PreparedAudio:
+    """Upload as received, named after its sniffed format"""
+    return PreparedAudio(
+        data=data,
+        filename=f"audio.{sniff_audio_format(data)}",
+        input_bytes=len(data),
+        input_seconds=0.0,
+        output_seconds=0.0,
+    )
+
+
+def prepare_upload(data: bytes) -> PreparedAudio:
+    """Preprocess an uploaded recording; formats other than PCM WAV pass through"""
+    decoded = decode_wav(data)
+    if decoded is None:
+        return passthrough(data)
+    pcm, sample_rate = decoded
+    return prepare_for_stt(pcm, sample_rate, input_bytes=len(data))
+
+
+class SpeechStats:
+    """Running totals of STT upload size and latency, before and after preprocessing"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.answers = 0
+        self.input_bytes = 0
+        self.uploaded_bytes = 0
+        self.input_seconds = 0.0
+        self.uploaded_seconds = 0.0
+        self.latency_seconds = 0.0
+
+    def record(self, prepared: PreparedAudio, latency: float):
+        self.record_upload(
+            prepared.input_bytes,
+            prepared.output_bytes,
+            prepared.input_seconds,
+            prepared.output_seconds,
+            latency,
+        )
+
+    def record_upload(
+        self,
+        input_bytes: int,
+        uploaded_bytes: int,
+        input_seconds: float,
+        uploaded_seconds: float,
+        latency: float,
+    ):
+        with self._lock:
+            self.answers += 1
+            self.input_bytes += input_bytes
+            self.uploaded_bytes += uploaded_bytes
+            self.input_seconds += input_seconds
+            self.uploaded_seconds += uploaded_seconds
+            self.latency_seconds += latency
+
+    def summary(self) -> dict:
+        with self._lock:
+            answers = self.answers or 1
+            return {
+                "answers": self.answers,
+                "avg_input_bytes": self.input_bytes / answers,
+                "avg_uploaded_bytes": self.uploaded_bytes / answers,
+                "upload_reduction": 1 - self.uploaded_bytes / self.input_bytes if self.input_bytes else 0.0,
+                "avg_input_seconds": self.input_seconds / answers,
+                "avg_uploaded_seconds": self.uploaded_seconds / answers,
+                "avg_stt_latency_seconds": self.latency_seconds / answers,
+            }
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry and hit/miss accounting"""
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by every invalidation
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._hit_seconds = 0.0
+        self._load_seconds = 0.0
+        self._max_load_seconds = 0.0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for a live entry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value with its own time-to-live"""
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Read-through lookup: return the cached value or load and store it.
+
+        ``None`` results are returned but not cached, and loader exceptions
+        propagate without touching the cache. A load that overlaps an
+        invalidation may have read data from before the write, so its result
+        is returned but not cached either.
+        """
+        started = time.perf_counter()
+        found, value = self.get(key)
+        if found:
+            with self._lock:
+                self.hits += 1
+                self._hit_seconds += time.perf_counter() - started
+            return value
+
+        with self._lock:
+            generation = self._generation
+        value = loader()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.misses += 1
+            self._load_seconds += elapsed
+            self._max_load_seconds = max(self._max_load_seconds, elapsed)
+            fresh = generation == self._generation
+
+        if value is not None and fresh:
+            self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, *keys: Hashable):
+        """Drop the given keys if present"""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry (statistics are kept)"""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and latency figures for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "avg_hit_ms": (self._hit_seconds / self.hits * 1000) if self.hits else 0.0,
+                "avg_load_ms": (self._load_seconds / self.misses * 1000) if self.misses else 0.0,
+                "max_load_ms": self._max_load_seconds * 1000,
+            }
@@ -0,0 +1,213 @@
+"""Record/replay of outbound HTTP traffic to OpenAI and Supabase.
+
+In ``record`` mode every request made through the OpenAI and Supabase HTTP
+clients is forwarded as usual and the response is appended, with its latency,
+to a gzip-compressed JSON Lines cassette. In ``replay`` mode nothing leaves the
+process: responses are served from the cassette after sleeping for the
+recorded latency times ``CASSETTE_LATENCY_SCALE`` (0 for no delay).
+
+Requests are matched on method, URL and a hash of the body (multipart
+boundaries are ignored), falling back to method and full URL, query string
+included, in recorded order. A request with no match raises
+``CassetteMissError`` and is reported on stderr, since storage errors are
+otherwise swallowed by the services. Request bodies themselves are never
+stored.
+
+    CASSETTE_MODE=record CASSETTE_PATH=interview.jsonl.gz uvicorn backend.main:app
+    python -m backend.cassette interview.jsonl.gz     # per-endpoint latency summary
+"""
+import base64
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional
+
+import httpx
+
+from backend import http_clients
+
+MODES = ("", "record", "replay")
+# Re-framing headers no longer apply once the body is buffered
+DROPPED_HEADERS = {"transfer-encoding", "connection", "keep-alive"}
+
+
+class CassetteMissError(RuntimeError):
+    """Raised in replay mode for a request the cassette has no response for"""
+
+
+def _body_digest(request: httpx.Request) -> str:
+    body = request.content
+    content_type = request.headers.get("content-type", "")
+    if "boundary=" in content_type:
+        boundary = content_type.split("boundary=", 1)[1].split(";")[0].strip('"')
+        body = body.replace(boundary.encode(), b"")
+    return hashlib.sha1(body).hexdigest()[:16]
+
+
+def request_key(request: httpx.Request) -> str:
+    return f"{request.method} {request.url} {_body_digest(request)}"
+
+
+def _route(method: str, url: str) -> str:
+    """Endpoint without its query string, for summaries"""
+    return f"{method} {httpx.URL(url).copy_with(query=None)}"
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str, latency_scale: float = 1.0):
+        if mode not in MODES[1:]:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Choose 'record' or 'replay'")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.recorded = 0
+        self.replayed = 0
+        self.missed = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._by_key: Dict[str, Deque[dict]] = defaultdict(deque)
+        self._by_url: Dict[str, Deque[dict]] = defaultdict(deque)
+        if mode == "replay":
+            for entry in load_entries(path):
+                entry["used"] = False
+                self._by_key[entry["key"]].append(entry)
+                # PostgREST filters live in the query, so it is never ignored
+                self._by_url[f"{entry['method']} {entry['url']}"].append(entry)
+
+    def wrap(self, transport: httpx.BaseTransport) -> httpx.BaseTransport:
+        return CassetteTransport(transport, self)
+
+    def http_client(self, **kwargs) -> httpx.Client:
+        """Plain httpx client routed through the cassette (for Supabase)"""
+        return httpx.Client(transport=self.wrap(httpx.HTTPTransport()), follow_redirects=True, **kwargs)
+
+    def record(self, request: httpx.Request, response: httpx.Response, body: bytes, elapsed: float):
+        entry = {
+            "key": request_key(request),
+            "method": request.method,
+            "url": str(request.url),
+            "request_bytes": len(request.content),
+            "status": response.status_code,
+            "headers": [[k, v] for k, v in response.headers.multi_items() if k.lower() not in DROPPED_HEADERS],
+            "body": base64.b64encode(body).decode("ascii"),
+            "elapsed": round(elapsed, 6),
+            "offset": round(time.monotonic() - self._started, 6),
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            # Each append is its own gzip member; gzip.open reads them back as one stream
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(line)
+            self.recorded += 1
+
+    def match(self, request: httpx.Request) -> dict:
+        with self._lock:
+            for queue in (self._by_key.get(request_key(request)), self._by_url.get(f"{request.method} {request.url}")):
+                while queue:
+                    entry = queue.popleft()
+                    if not entry["used"]:
+                        entry["used"] = True
+                        self.replayed += 1
+                        return entry
+            self.missed += 1
+        message = f"No recorded response for {request.method} {request.url}"
+        print(f"Cassette miss: {message}", file=sys.stderr)
+        raise CassetteMissError(message)
+
+
+class CassetteTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        if self.cassette.mode == "replay":
+            entry = self.cassette.match(request)
+            if self.cassette.latency_scale:
+                time.sleep(entry["elapsed"] * self.cassette.latency_scale)
+            return httpx.Response(
+                entry["status"],
+                headers=entry["headers"],
+                content=base64.b64decode(entry["body"]),
+                request=request,
+            )
+
+        started = time.perf_counter()
+        response = self.inner.handle_request(request)
+        try:
+            body = b"".join(response.stream)
+        finally:
+            response.close()
+        elapsed = time.perf_counter() - started
+        self.cassette.record(request, response, body, elapsed)
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in DROPPED_HEADERS]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def close(self):
+        self.inner.close()
+
+
+def load_entries(path: str) -> List[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+_active: Optional[Cassette] = None
+_configured = False
+
+
+def configure(mode: str, path: str, latency_scale: float = 1.0) -> Optional[Cassette]:
+    """Activate a cassette for all pooled OpenAI clients ("" disables)"""
+    global _active, _configured
+    _active = Cassette(path, mode, latency_scale) if mode else None
+    http_clients.set_transport_wrapper(_active.wrap if _active else None)
+    _configured = True
+    return _active
+
+
+def from_settings() -> Optional[Cassette]:
+    """The cassette selected by CASSETTE_MODE, configured on first use"""
+    if not _configured:
+        from backend.config import settings
+        configure(settings.CASSETTE_MODE, settings.CASSETTE_PATH, settings.CASSETTE_LATENCY_SCALE)
+    return _active
+
+
+def summarize(entries: List[dict]) -> dict:
+    """Request count and latency per endpoint"""
+    routes: Dict[str, List[float]] = defaultdict(list)
+    for entry in entries:
+        routes[_route(entry["method"], entry["url"])].append(entry["elapsed"])
+    return {
+        route: {
+            "requests": len(values),
+            "total_seconds": round(sum(values), 3),
+            "avg_ms": round(sum(values) / len(values) * 1000, 1),
+            "max_ms": round(max(values) * 1000, 1),
+        }
+        for route, values in sorted(routes.items())
+    }
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        print("usage: python -m backend.cassette CASSETTE_PATH", file=sys.stderr)
+        return 2
+    print(json.dumps(summarize(load_entries(args[0])), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
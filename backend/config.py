@@ -16,11 +16,22 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4"
     OPENAI_TTS_MODEL: str = "tts-1"
     OPENAI_STT_MODEL: str = "whisper-1"
+    # Alternative endpoint, e.g. the local stand-in: python -m backend.fake_openai
+    OPENAI_BASE_URL: Optional[str] = None
+    
+    # Trim silence and compress PCM WAV uploads before transcription
+    STT_PREPROCESS: bool = True
+    # Speech segments transcribed in parallel while an answer is streamed
+    STT_STREAM_CONCURRENCY: int = 2
     
     # Supabase
     SUPABASE_URL: str
     SUPABASE_SERVICE_ROLE_KEY: str
     
+    # Storage backend: "supabase" or "sqlite" (local file, no network)
+    DATABASE_BACKEND: str = "supabase"
+    SQLITE_PATH: str = "interviews.db"
+    
     # File Upload
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS: list = [".pdf", ".txt"]
@@ -32,6 +43,55 @@ class Settings(BaseSettings):
     STOP_BUTTON_TIME_SECONDS: int = 90
     PREVIEW_TIME_SECONDS: int = 20
     
+    # WebSocket interview channel: frames queued per connection before
+    # producers wait, bytes of recent frames kept for resume, TTS frame size
+    WS_SEND_QUEUE_FRAMES: int = 32
+    WS_RESUME_BUFFER_BYTES: int = 2 * 1024 * 1024
+    WS_AUDIO_CHUNK_BYTES: int = 16 * 1024
+    # Channel state (resume buffer, partial answer) without a client is dropped after this
+    WS_IDLE_STATE_SECONDS: float = 30 * 60
+    
+    # Read-through cache for stored interviews
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_TTL_INTERVIEW_LIST_SECONDS: float = 30
+    CACHE_TTL_INTERVIEW_SECONDS: float = 300
+    
+    # Admission control for OpenAI-backed endpoints, per worker. Running
+    # interviews queue for a slot; new interviews are refused (429) once only
+    # the reserved slots are left or queueing delay builds up.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_IN_FLIGHT: int = 16
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_MAX_QUEUE_WAIT_SECONDS: float = 10
+    ADMISSION_RESERVED_SLOTS: int = 4
+    ADMISSION_START_MAX_DELAY_SECONDS: float = 1.0
+    
+    # Results of keyed answer submissions and saves, replayed to retries
+    IDEMPOTENCY_TTL_SECONDS: float = 3600
+    IDEMPOTENCY_MAX_KEYS: int = 10000
+    
+    # Bulk export (interviews fetched per page)
+    EXPORT_PAGE_SIZE: int = 100
+    
+    # Startup: clients are created lazily; warm-up creates them and opens
+    # connections in the background before /ready reports ready. Priming sends
+    # a one-token completion so the first interview question skips cold paths.
+    WARMUP_ENABLED: bool = True
+    WARMUP_PRIME_COMPLETION: bool = False
+    
+    # Record/replay of OpenAI and Supabase HTTP traffic: "record", "replay" or ""
+    CASSETTE_MODE: str = ""
+    CASSETTE_PATH: str = "cassette.jsonl.gz"
+    CASSETTE_LATENCY_SCALE: float = 1.0
+    
+    # Tracing: Server-Timing header on every response; a sampled fraction of
+    # traces exported as OTLP/JSON ("file", "otlp" or "" to disable export)
+    SERVER_TIMING_ENABLED: bool = True
+    TRACE_EXPORTER: str = ""
+    TRACE_SAMPLE_RATE: float = 0.01
+    TRACE_FILE_PATH: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
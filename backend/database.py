@@ -1,26 +1,95 @@
+import html
 import os
+import threading
+import time
 from datetime import datetime
-from typing import List, Optional
-from supabase import create_client, Client
-from supabase.client import ClientOptions
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 
+from backend import cassette
+from backend.analytics import percentile_rank, summarize_aggregates
+from backend.cache import TTLCache
 from backend.config import settings
+from backend.metrics import database_errors, database_query_duration, timed
+from backend.tracing import span
 from backend.models import InterviewDB, QuestionDB, QAPair
 
+# Private-use characters the search queries place around matches; see highlight()
+MATCH_START, MATCH_END = "\ue000", "\ue001"
+SNIPPET_FIELDS = ('question_snippet', 'answer_snippet', 'feedback_snippet')
+INIT_RETRY_SECONDS = 5.0  # minimum gap between client creation attempts on request paths
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-escape a search snippet, then wrap its matches in <mark>"""
+    escaped = html.escape(snippet or '')
+    return escaped.replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
+
 class DatabaseService:
+    backend_name = "supabase"
+    
     def __init__(self):
-        self.client: Optional[Client] = None
-        self._initialize()
+        self._client: Optional["Client"] = None
+        self._initialized = False
+        self._initializing = False
+        self._retry_at = 0.0
+        self._init_lock = threading.RLock()
+        self.cache = TTLCache(max_entries=settings.CACHE_MAX_ENTRIES)
+    
+    @property
+    def client(self):
+        """Storage client, created on first use (or by connect() during warm-up)"""
+        if not self._initialized and time.monotonic() >= self._retry_at:
+            self._create_client()
+        return self._client
+    
+    def _create_client(self):
+        """Initialize once; after a failure, later calls try again"""
+        with self._init_lock:
+            # _initialize() itself reads the client back once it is assigned
+            if not self._initialized and not self._initializing:
+                self._initializing = True
+                try:
+                    self._initialize()
+                finally:
+                    self._initializing = False
+                    self._initialized = self._client is not None
+                    if not self._initialized:
+                        # Requests keep failing fast until the next attempt is due
+                        self._retry_at = time.monotonic() + INIT_RETRY_SECONDS
+    
+    @client.setter
+    def client(self, value):
+        self._client = value
+    
+    @property
+    def connected(self) -> bool:
+        """Whether a client exists, without creating one"""
+        return self._initialized and self._client is not None
+    
+    def connect(self):
+        """Create the client and open a connection ahead of the first request"""
+        self._create_client()
+        if self._client is None:
+            raise RuntimeError(f"{self.backend_name} client failed to initialize")
+        self._timed('ping', self._ping)
     
     def _initialize(self):
         """Initialize Supabase client"""
         try:
+            from supabase import create_client
+            from supabase.client import ClientOptions
+            
+            recorder = cassette.from_settings()
             self.client = create_client(
                 settings.SUPABASE_URL,
                 settings.SUPABASE_SERVICE_ROLE_KEY,
                 options=ClientOptions(
                     postgrest_client_timeout=30,
                     storage_client_timeout=30,
+                    httpx_client=recorder.http_client(timeout=30) if recorder else None,
                 )
             )
         except Exception as e:
@@ -33,39 +102,35 @@ class DatabaseService:
             return None
         
         try:
-            # Insert interview
-            response = self.client.table('interviews').insert({
-                'candidate_name': interview_data['candidate_name'],
-                'job_title': interview_data['job_title'],
-                'interview_type': interview_data['interview_type'],
-                'final_score': interview_data['final_score'],
-                'start_time': interview_data['start_time'],
-                'completed_at': datetime.now().isoformat(),
-            }).execute()
-            
-            if not response.data:
-                return None
-            
-            interview_id = response.data[0]['id']
-            
-            # Insert questions
-            questions_data = []
-            for qa in interview_data['qa_pairs']:
-                questions_data.append({
-                    'interview_id': interview_id,
-                    'question_number': qa['number'],
-                    'question_text': qa['question'],
-                    'answer': qa['answer'],
-                    'score': qa['score'],
-                    'feedback': qa['feedback']
-                })
-            
-            self.client.table('questions').insert(questions_data).execute()
-            
+            interview_id = self._timed('insert_interview', self._insert_interview, interview_data)
+            if interview_id:
+                # A read between the interview and questions inserts may have cached no questions
+                self.cache.invalidate(('interview', interview_id), ('questions', interview_id))
             return interview_id
         except Exception as e:
             print(f"Error saving interview: {e}")
             return None
+        finally:
+            self.cache.invalidate(('interviews',), ('analytics',))
+    
+    def delete_interview(self, interview_id: str) -> Optional[bool]:
+        """Delete an interview (questions cascade); False if none existed, None on error"""
+        if not self.client:
+            return None
+        
+        try:
+            deleted = self._timed('delete_interview', self._delete_interview, interview_id)
+        except Exception as e:
+            print(f"Error deleting interview: {e}")
+            return None
+        finally:
+            self.cache.invalidate(
+                ('interviews',),
+                ('interview', interview_id),
+                ('questions', interview_id),
+                ('analytics',),
+            )
+        return deleted
     
     def get_all_interviews(self) -> List[dict]:
         """Get all interviews"""
@@ -73,8 +138,11 @@ class DatabaseService:
             return []
         
         try:
-            response = self.client.table('interviews').select('*').order('created_at', desc=True).execute()
-            return response.data if response.data else []
+            return self.cache.get_or_load(
+                ('interviews',),
+                lambda: self._timed('fetch_all_interviews', self._fetch_all_interviews),
+                ttl=settings.CACHE_TTL_INTERVIEW_LIST_SECONDS,
+            )
         except Exception as e:
             print(f"Error fetching interviews: {e}")
             return []
@@ -85,8 +153,11 @@ class DatabaseService:
             return None
         
         try:
-            response = self.client.table('interviews').select('*').eq('id', interview_id).execute()
-            return response.data[0] if response.data else None
+            return self.cache.get_or_load(
+                ('interview', interview_id),
+                lambda: self._timed('fetch_interview', self._fetch_interview, interview_id),
+                ttl=settings.CACHE_TTL_INTERVIEW_SECONDS,
+            )
         except Exception as e:
             print(f"Error fetching interview: {e}")
             return None
@@ -97,12 +168,222 @@ class DatabaseService:
             return []
         
         try:
-            response = self.client.table('questions').select('*').eq('interview_id', interview_id).order('question_number').execute()
-            return response.data if response.data else []
+            return self.cache.get_or_load(
+                ('questions', interview_id),
+                lambda: self._timed('fetch_questions', self._fetch_questions, interview_id),
+                ttl=settings.CACHE_TTL_INTERVIEW_SECONDS,
+            )
         except Exception as e:
             print(f"Error fetching questions: {e}")
             return []
     
+    def get_score_analytics(self) -> List[dict]:
+        """Get per-cohort score distributions and per-question averages"""
+        if not self.client:
+            return []
+        
+        try:
+            return self.cache.get_or_load(
+                ('analytics',),
+                lambda: self._timed('fetch_score_analytics', self._fetch_score_analytics),
+                ttl=settings.CACHE_TTL_INTERVIEW_LIST_SECONDS,
+            )
+        except Exception as e:
+            print(f"Error fetching analytics: {e}")
+            return []
+    
+    def get_percentile_rank(self, job_title: str, interview_type: str, score: float) -> Optional[dict]:
+        """Rank a score against its job title / interview type cohort"""
+        if not self.client:
+            return None
+        
+        try:
+            return self._timed('fetch_percentile_rank', self._fetch_percentile_rank, job_title, interview_type, score)
+        except Exception as e:
+            print(f"Error ranking score: {e}")
+            return None
+    
+    def search_questions(self, query: str, limit: int = 20, offset: int = 0) -> List[dict]:
+        """Full-text search over questions, answers and feedback, best match first"""
+        if not self.client or not query.strip():
+            return []
+        
+        try:
+            rows = self._timed('search_questions', self._search_questions, query, limit, offset)
+            return [{**row, **{field: highlight(row.get(field)) for field in SNIPPET_FIELDS}} for row in rows]
+        except Exception as e:
+            print(f"Error searching questions: {e}")
+            return []
+    
+    def iter_interview_pages(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        job_title: Optional[str] = None,
+        page_size: int = 100,
+    ) -> Iterator[List[Tuple[dict, List[dict]]]]:
+        """Yield pages of (interview, questions) in created_at order.
+        
+        Uses keyset pagination on (created_at, id), so memory stays bounded by
+        one page no matter how large the archive is. Errors propagate.
+        """
+        if not self.client:
+            return
+        
+        cursor = None
+        while True:
+            interviews = self._timed(
+                'fetch_interview_page', self._fetch_interview_page, since, until, job_title, cursor, page_size
+            )
+            if not interviews:
+                return
+            
+            questions = {}
+            ids = [interview['id'] for interview in interviews]
+            for question in self._timed('fetch_questions_for', self._fetch_questions_for, ids):
+                questions.setdefault(question['interview_id'], []).append(question)
+            
+            yield [(interview, questions.get(interview['id'], [])) for interview in interviews]
+            
+            if len(interviews) < page_size:
+                return
+            cursor = (interviews[-1]['created_at'], interviews[-1]['id'])
+    
+    def _timed(self, operation: str, query, *args):
+        """Run a raw storage operation, recording its latency and failures"""
+        labels = (self.backend_name, operation)
+        with span(f"db.{operation}", backend=self.backend_name), timed(database_query_duration, labels, database_errors):
+            return query(*args)
+    
+    # Raw storage operations; errors propagate so failures are never cached
+    def _ping(self):
+        self.client.table('interviews').select('id').limit(1).execute()
+    
+    def _insert_interview(self, interview_data: dict) -> Optional[str]:
+        response = self.client.table('interviews').insert({
+            'candidate_name': interview_data['candidate_name'],
+            'job_title': interview_data['job_title'],
+            'interview_type': interview_data['interview_type'],
+            'final_score': interview_data['final_score'],
+            'start_time': interview_data['start_time'],
+            'completed_at': datetime.now().isoformat(),
+        }).execute()
+        
+        if not response.data:
+            return None
+        
+        interview_id = response.data[0]['id']
+        
+        # Insert questions
+        questions_data = []
+        for qa in interview_data['qa_pairs']:
+            questions_data.append({
+                'interview_id': interview_id,
+                'question_number': qa['number'],
+                'question_text': qa['question'],
+                'answer': qa['answer'],
+                'score': qa['score'],
+                'feedback': qa['feedback']
+            })
+        
+        self.client.table('questions').insert(questions_data).execute()
+        
+        return interview_id
+    
+    def _delete_interview(self, interview_id: str) -> bool:
+        response = self.client.table('interviews').delete().eq('id', interview_id).execute()
+        return bool(response.data)
+    
+    def _fetch_all_interviews(self) -> List[dict]:
+        response = self.client.table('interviews').select('*').order('created_at', desc=True).execute()
+        return response.data if response.data else []
+    
+    def _fetch_interview(self, interview_id: str) -> Optional[dict]:
+        response = self.client.table('interviews').select('*').eq('id', interview_id).execute()
+        return response.data[0] if response.data else None
+    
+    def _fetch_questions(self, interview_id: str) -> List[dict]:
+        response = self.client.table('questions').select('*').eq('interview_id', interview_id).order('question_number').execute()
+        return response.data if response.data else []
+    
+    def _fetch_interview_page(
+        self,
+        since: Optional[str],
+        until: Optional[str],
+        job_title: Optional[str],
+        cursor: Optional[Tuple[str, str]],
+        limit: int,
+    ) -> List[dict]:
+        query = self.client.table('interviews').select('*')
+        if since:
+            query = query.gte('created_at', since)
+        if until:
+            query = query.lt('created_at', until)
+        if job_title:
+            query = query.eq('job_title', job_title)
+        if cursor:
+            created_at, last_id = cursor
+            query = query.or_(
+                f'created_at.gt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.gt.{last_id})'
+            )
+        response = query.order('created_at').order('id').limit(limit).execute()
+        return response.data or []
+    
+    def _fetch_questions_for(self, interview_ids) -> List[dict]:
+        ids = list(interview_ids)
+        rows: List[dict] = []
+        # PostgREST caps rows per response, so page through the question set too
+        while True:
+            response = (
+                self.client.table('questions').select('*')
+                .in_('interview_id', ids)
+                .order('interview_id').order('question_number')
+                .range(len(rows), len(rows) + 999)
+                .execute()
+            )
+            batch = response.data or []
+            rows.extend(batch)
+            if len(batch) < 1000:
+                return rows
+    
+    def _search_questions(self, query: str, limit: int, offset: int) -> List[dict]:
+        response = self.client.rpc('search_questions', {
+            'p_query': query,
+            'p_limit': limit,
+            'p_offset': offset,
+        }).execute()
+        return response.data or []
+    
+    def _fetch_score_analytics(self) -> List[dict]:
+        # Both tables are maintained by triggers, one row per cohort (and question number)
+        cohorts = self.client.table('interview_score_aggregates').select('*').execute().data or []
+        questions = self.client.table('question_score_aggregates').select('*').execute().data or []
+        
+        question_rows = {}
+        for row in questions:
+            question_rows.setdefault((row['job_title'], row['interview_type']), []).append(row)
+        
+        return [
+            summarize_aggregates(row, question_rows.get((row['job_title'], row['interview_type']), []))
+            for row in cohorts
+        ]
+    
+    def _fetch_percentile_rank(self, job_title: str, interview_type: str, score: float) -> Optional[dict]:
+        response = self.client.rpc('interview_percentile_rank', {
+            'p_job_title': job_title,
+            'p_interview_type': interview_type,
+            'p_score': score,
+        }).execute()
+        if not response.data:
+            return None
+        
+        row = response.data[0]
+        return {
+            'cohort_size': row['cohort_size'],
+            'percentile': percentile_rank(row['below'], row['equal'], row['cohort_size']),
+        }
+    
     @staticmethod
     def get_table_schema() -> str:
         """Return SQL schema for creating tables"""
@@ -130,7 +411,207 @@ class DatabaseService:
             feedback TEXT,
             created_at TIMESTAMP DEFAULT NOW()
         );
+
+        -- Full-text search over questions, answers and feedback
+        ALTER TABLE questions ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(answer, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(question_text, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(feedback, '')), 'C')
+            ) STORED;
+
+        CREATE INDEX IF NOT EXISTS questions_search_idx
+            ON questions USING GIN (search_vector);
+
+        -- Ranked search with highlighted snippets; headlines are built for the page only.
+        -- Matches are delimited by U+E000/U+E001; the service escapes the text and turns them into <mark>
+        CREATE OR REPLACE FUNCTION search_questions(
+            p_query TEXT, p_limit INT DEFAULT 20, p_offset INT DEFAULT 0
+        )
+        RETURNS TABLE (
+            question_id UUID,
+            interview_id UUID,
+            candidate_name TEXT,
+            job_title TEXT,
+            interview_type TEXT,
+            question_number INT,
+            score FLOAT,
+            rank REAL,
+            question_snippet TEXT,
+            answer_snippet TEXT,
+            feedback_snippet TEXT
+        ) AS $$
+            WITH search AS (
+                SELECT websearch_to_tsquery('english', p_query) AS query
+            ),
+            matches AS (
+                SELECT q.*, ts_rank_cd(q.search_vector, search.query) AS rank
+                FROM questions q, search
+                WHERE q.search_vector @@ search.query
+                ORDER BY rank DESC
+                LIMIT p_limit OFFSET p_offset
+            )
+            SELECT m.id, m.interview_id, i.candidate_name, i.job_title, i.interview_type,
+                   m.question_number, m.score, m.rank,
+                   ts_headline('english', coalesce(m.question_text, ''), search.query,
+                               'StartSel=' || chr(57344) || ', StopSel=' || chr(57345) || ', MaxWords=30, MinWords=10'),
+                   ts_headline('english', coalesce(m.answer, ''), search.query,
+                               'StartSel=' || chr(57344) || ', StopSel=' || chr(57345) || ', MaxWords=30, MinWords=10'),
+                   ts_headline('english', coalesce(m.feedback, ''), search.query,
+                               'StartSel=' || chr(57344) || ', StopSel=' || chr(57345) || ', MaxWords=30, MinWords=10')
+            FROM matches m
+            JOIN interviews i ON i.id = m.interview_id
+            CROSS JOIN search
+            ORDER BY m.rank DESC;
+        $$ LANGUAGE sql STABLE;
+
+        -- Analytics: cohort lookups and percentile ranking
+        CREATE INDEX IF NOT EXISTS interviews_cohort_score_idx
+            ON interviews (job_title, interview_type, final_score);
+
+        -- Analytics: per-cohort score aggregates, maintained incrementally by triggers
+        CREATE TABLE IF NOT EXISTS interview_score_aggregates (
+            job_title TEXT NOT NULL,
+            interview_type TEXT NOT NULL,
+            interview_count BIGINT NOT NULL DEFAULT 0,
+            score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            score_sq_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            min_score DOUBLE PRECISION,
+            max_score DOUBLE PRECISION,
+            histogram BIGINT[] NOT NULL DEFAULT array_fill(0::BIGINT, ARRAY[10]),
+            PRIMARY KEY (job_title, interview_type)
+        );
+
+        -- Analytics: per-cohort, per-question-number averages
+        CREATE TABLE IF NOT EXISTS question_score_aggregates (
+            job_title TEXT NOT NULL,
+            interview_type TEXT NOT NULL,
+            question_number INT NOT NULL,
+            answer_count BIGINT NOT NULL DEFAULT 0,
+            score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            PRIMARY KEY (job_title, interview_type, question_number)
+        );
+
+        CREATE OR REPLACE FUNCTION add_interview_score_aggregate() RETURNS TRIGGER AS $$
+        DECLARE
+            bin INT;
+        BEGIN
+            IF NEW.final_score IS NULL THEN
+                RETURN NEW;
+            END IF;
+            bin := LEAST(GREATEST(FLOOR(NEW.final_score)::INT, 0), 9) + 1;
+
+            INSERT INTO interview_score_aggregates AS agg
+                (job_title, interview_type, interview_count, score_sum, score_sq_sum, min_score, max_score)
+            VALUES
+                (NEW.job_title, NEW.interview_type, 1, NEW.final_score,
+                 NEW.final_score * NEW.final_score, NEW.final_score, NEW.final_score)
+            ON CONFLICT (job_title, interview_type) DO UPDATE SET
+                interview_count = agg.interview_count + 1,
+                score_sum = agg.score_sum + EXCLUDED.score_sum,
+                score_sq_sum = agg.score_sq_sum + EXCLUDED.score_sq_sum,
+                min_score = LEAST(agg.min_score, EXCLUDED.min_score),
+                max_score = GREATEST(agg.max_score, EXCLUDED.max_score);
+
+            UPDATE interview_score_aggregates
+            SET histogram[bin] = histogram[bin] + 1
+            WHERE job_title = NEW.job_title AND interview_type = NEW.interview_type;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION add_question_score_aggregate() RETURNS TRIGGER AS $$
+        BEGIN
+            IF NEW.score IS NULL THEN
+                RETURN NEW;
+            END IF;
+
+            INSERT INTO question_score_aggregates AS agg
+                (job_title, interview_type, question_number, answer_count, score_sum)
+            SELECT i.job_title, i.interview_type, NEW.question_number, 1, NEW.score
+            FROM interviews i
+            WHERE i.id = NEW.interview_id
+            ON CONFLICT (job_title, interview_type, question_number) DO UPDATE SET
+                answer_count = agg.answer_count + 1,
+                score_sum = agg.score_sum + EXCLUDED.score_sum;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Deletes are rare: rebuild the affected cohort instead of decrementing min/max
+        CREATE OR REPLACE FUNCTION rebuild_cohort_score_aggregates() RETURNS TRIGGER AS $$
+        BEGIN
+            DELETE FROM interview_score_aggregates
+            WHERE job_title = OLD.job_title AND interview_type = OLD.interview_type;
+            DELETE FROM question_score_aggregates
+            WHERE job_title = OLD.job_title AND interview_type = OLD.interview_type;
+
+            INSERT INTO interview_score_aggregates
+                (job_title, interview_type, interview_count, score_sum, score_sq_sum, min_score, max_score, histogram)
+            SELECT job_title, interview_type, COUNT(*), SUM(final_score), SUM(final_score * final_score),
+                   MIN(final_score), MAX(final_score),
+                   ARRAY(
+                       SELECT COUNT(i2.id)
+                       FROM generate_series(1, 10) AS b
+                       LEFT JOIN interviews i2
+                         ON i2.job_title = OLD.job_title
+                        AND i2.interview_type = OLD.interview_type
+                        AND LEAST(GREATEST(FLOOR(i2.final_score)::INT, 0), 9) + 1 = b
+                       GROUP BY b ORDER BY b
+                   )
+            FROM interviews
+            WHERE job_title = OLD.job_title AND interview_type = OLD.interview_type
+              AND final_score IS NOT NULL
+            GROUP BY job_title, interview_type;
+
+            INSERT INTO question_score_aggregates
+                (job_title, interview_type, question_number, answer_count, score_sum)
+            SELECT i.job_title, i.interview_type, q.question_number, COUNT(*), SUM(q.score)
+            FROM questions q
+            JOIN interviews i ON i.id = q.interview_id
+            WHERE i.job_title = OLD.job_title AND i.interview_type = OLD.interview_type
+              AND q.score IS NOT NULL
+            GROUP BY i.job_title, i.interview_type, q.question_number;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS interviews_score_aggregate ON interviews;
+        CREATE TRIGGER interviews_score_aggregate
+            AFTER INSERT ON interviews
+            FOR EACH ROW EXECUTE FUNCTION add_interview_score_aggregate();
+
+        DROP TRIGGER IF EXISTS questions_score_aggregate ON questions;
+        CREATE TRIGGER questions_score_aggregate
+            AFTER INSERT ON questions
+            FOR EACH ROW EXECUTE FUNCTION add_question_score_aggregate();
+
+        DROP TRIGGER IF EXISTS interviews_score_aggregate_delete ON interviews;
+        CREATE TRIGGER interviews_score_aggregate_delete
+            AFTER DELETE ON interviews
+            FOR EACH ROW EXECUTE FUNCTION rebuild_cohort_score_aggregates();
+
+        -- Analytics: mid-rank percentile of a score within its cohort (one round trip)
+        CREATE OR REPLACE FUNCTION interview_percentile_rank(
+            p_job_title TEXT, p_interview_type TEXT, p_score DOUBLE PRECISION
+        )
+        RETURNS TABLE (cohort_size BIGINT, below BIGINT, equal BIGINT) AS $$
+            SELECT COUNT(*),
+                   COUNT(*) FILTER (WHERE final_score < p_score),
+                   COUNT(*) FILTER (WHERE final_score = p_score)
+            FROM interviews
+            WHERE job_title = p_job_title
+              AND interview_type = p_interview_type
+              AND final_score IS NOT NULL;
+        $$ LANGUAGE sql STABLE;
         """
 
+def create_database_service() -> DatabaseService:
+    """Build the storage backend selected by DATABASE_BACKEND"""
+    if settings.DATABASE_BACKEND == "sqlite":
+        from backend.local_database import SQLiteDatabaseService
+        return SQLiteDatabaseService(settings.SQLITE_PATH)
+    return DatabaseService()
+
 # Singleton instance
-db_service = DatabaseService()
+db_service = create_database_service()
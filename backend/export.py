@@ -0,0 +1,214 @@
+"""Streaming bulk export of stored interviews joined with their questions.
+
+Rows are produced page by page from DatabaseService.iter_interview_pages and
+encoded incrementally, so memory use is bounded by one page regardless of
+archive size. Used by the /export/interviews endpoint and as a CLI:
+
+    python -m backend.export --format csv --since 2024-01-01 -o interviews.csv
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional
+
+EXPORT_COLUMNS = [
+    "interview_id",
+    "candidate_name",
+    "job_title",
+    "interview_type",
+    "final_score",
+    "start_time",
+    "completed_at",
+    "created_at",
+    "question_number",
+    "question_text",
+    "answer",
+    "score",
+    "feedback",
+]
+
+INTERVIEW_COLUMNS = EXPORT_COLUMNS[1:8]
+QUESTION_COLUMNS = EXPORT_COLUMNS[8:]
+
+
+class ExportFormatError(ValueError):
+    """Raised for unknown formats or missing optional encoders"""
+
+
+def iter_export_rows(pages: Iterable[list]) -> Iterator[List[dict]]:
+    """Flatten (interview, questions) pages into one row per question.
+
+    Interviews without questions still produce a single row with empty
+    question columns.
+    """
+    for page in pages:
+        rows = []
+        for interview, questions in page:
+            base = {"interview_id": interview["id"]}
+            base.update({column: interview.get(column) for column in INTERVIEW_COLUMNS})
+            if not questions:
+                rows.append({**base, **dict.fromkeys(QUESTION_COLUMNS)})
+            for question in questions:
+                rows.append({**base, **{column: question.get(column) for column in QUESTION_COLUMNS}})
+        yield rows
+
+
+def encode_ndjson(row_pages: Iterable[List[dict]]) -> Iterator[bytes]:
+    """One JSON object per line, one chunk per page"""
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+    for rows in row_pages:
+        if rows:
+            yield ("\n".join(dumps(row) for row in rows) + "\n").encode("utf-8")
+
+
+def encode_csv(row_pages: Iterable[List[dict]]) -> Iterator[bytes]:
+    """RFC 4180 CSV with a header row, one chunk per page"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in row_pages:
+        writer.writerows([row[column] for column in EXPORT_COLUMNS] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the caller"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def encode_parquet(row_pages: Iterable[List[dict]]) -> Iterator[bytes]:
+    """Columnar Parquet, one row group per page (requires pyarrow)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ExportFormatError("Parquet export requires pyarrow") from e
+
+    schema = pa.schema([
+        ("interview_id", pa.string()),
+        ("candidate_name", pa.string()),
+        ("job_title", pa.string()),
+        ("interview_type", pa.string()),
+        ("final_score", pa.float64()),
+        ("start_time", pa.string()),
+        ("completed_at", pa.string()),
+        ("created_at", pa.string()),
+        ("question_number", pa.int32()),
+        ("question_text", pa.string()),
+        ("answer", pa.string()),
+        ("score", pa.float64()),
+        ("feedback", pa.string()),
+    ])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in row_pages:
+            if not rows:
+                continue
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+EXPORT_FORMATS: Dict[str, tuple] = {
+    "ndjson": ("application/x-ndjson", "ndjson", encode_ndjson),
+    "csv": ("text/csv; charset=utf-8", "csv", encode_csv),
+    "parquet": ("application/vnd.apache.parquet", "parquet", encode_parquet),
+}
+
+
+def get_encoder(export_format: str) -> tuple:
+    """Return (media_type, extension, encoder) for a format name"""
+    if export_format not in EXPORT_FORMATS:
+        raise ExportFormatError(
+            f"Unsupported export format '{export_format}'. Choose one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    if export_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ExportFormatError("Parquet export requires pyarrow") from e
+    return EXPORT_FORMATS[export_format]
+
+
+def stream_export(
+    db,
+    export_format: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    job_title: Optional[str] = None,
+    page_size: int = 100,
+) -> Iterator[bytes]:
+    """Encoded export byte stream for a DatabaseService"""
+    _, _, encoder = get_encoder(export_format)
+    pages = db.iter_interview_pages(since=since, until=until, job_title=job_title, page_size=page_size)
+    return encoder(iter_export_rows(pages))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export stored interviews and answers")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--since", help="Only interviews created at or after this ISO date")
+    parser.add_argument("--until", help="Only interviews created before this ISO date")
+    parser.add_argument("--job-title", help="Only interviews for this job title")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    from backend.database import db_service
+
+    try:
+        chunks = stream_export(
+            db_service,
+            args.format,
+            since=args.since,
+            until=args.until,
+            job_title=args.job_title,
+            page_size=args.page_size,
+        )
+        output = open(args.output, "wb") if args.output else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+        finally:
+            if args.output:
+                output.close()
+    except ExportFormatError as e:
+        print(e, file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Local stand-in for the OpenAI endpoints OpenAIService uses.
+
+Implements the model list, chat completions (including ``stream=true``),
+audio speech and audio transcriptions with configurable latency, error and rate-limit rates,
+so the interview flow can be load tested offline. Point the backend at it with
+``OPENAI_BASE_URL=http://127.0.0.1:8100/v1``:
+
+    python -m backend.fake_openai --port 8100 --chat-latency-ms 1200 --rate-limit-rate 0.02
+"""
+import argparse
+import asyncio
+import io
+import json
+import random
+import re
+import time
+import uuid
+import wave
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+QUESTIONS = [
+    "Can you walk me through a recent project where you had to make a difficult technical trade-off?",
+    "How do you approach debugging a production issue you cannot reproduce locally?",
+    "Describe a time you disagreed with a teammate and how you resolved it.",
+    "How would you design a service that has to handle a sudden tenfold increase in traffic?",
+    "What does good code review look like to you?",
+]
+TRANSCRIPT = (
+    "In my last role I led the migration of our reporting pipeline to a streaming "
+    "architecture, which cut our data latency from hours to minutes."
+)
+SPEECH_SAMPLE_RATE = 8000
+CHARS_PER_SPEECH_SECOND = 15
+
+
+@dataclass
+class FakeOpenAIConfig:
+    """Median latencies are in milliseconds; actual latency is lognormal around them"""
+    chat_latency_ms: float = 800.0
+    speech_latency_ms: float = 400.0
+    transcription_latency_ms: float = 600.0
+    latency_sigma: float = 0.35
+    stream_chunk_ms: float = 20.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+    seed: Optional[int] = None
+
+
+def _count_tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+@lru_cache(maxsize=64)
+def _silence_wav(seconds: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SPEECH_SAMPLE_RATE)
+        wav.writeframes(b"\0\0" * SPEECH_SAMPLE_RATE * seconds)
+    return buffer.getvalue()
+
+
+def create_app(config: Optional[FakeOpenAIConfig] = None) -> FastAPI:
+    config = config or FakeOpenAIConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI(title="Fake OpenAI")
+    app.state.config = config
+    app.state.requests = 0
+
+    def latency(median_ms: float) -> float:
+        return rng.lognormvariate(0, config.latency_sigma) * median_ms / 1000
+
+    def injected_failure() -> Optional[JSONResponse]:
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": str(config.retry_after_seconds)},
+                content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "The server had an error", "type": "server_error", "code": None}},
+            )
+        return None
+
+    @app.middleware("http")
+    async def count_requests(request: Request, call_next):
+        app.state.requests += 1
+        return await call_next(request)
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {
+            "object": "list",
+            "data": [
+                {"id": model, "object": "model", "created": 0, "owned_by": "fake-openai"}
+                for model in ("gpt-4", "tts-1", "whisper-1")
+            ],
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        failure = injected_failure()
+        if failure:
+            return failure
+
+        model = body.get("model", "gpt-4")
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        if re.search(r"valid JSON", prompt):
+            content = json.dumps({
+                "score": rng.randint(4, 9),
+                "feedback": "Clear structure and relevant examples. Go deeper on measurable impact.",
+            })
+        else:
+            content = rng.choice(QUESTIONS)
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": _count_tokens(prompt),
+            "completion_tokens": _count_tokens(content),
+            "total_tokens": _count_tokens(prompt) + _count_tokens(content),
+        }
+
+        if body.get("stream"):
+            async def events():
+                await asyncio.sleep(latency(config.chat_latency_ms))
+                for word in re.findall(r"\S+\s*", content):
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    await asyncio.sleep(config.stream_chunk_ms / 1000)
+                final = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(latency(config.chat_latency_ms))
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }
+
+    @app.post("/v1/audio/speech")
+    async def speech(request: Request):
+        body = await request.json()
+        failure = injected_failure()
+        if failure:
+            return failure
+
+        await asyncio.sleep(latency(config.speech_latency_ms))
+        seconds = max(len(body.get("input", "")) // CHARS_PER_SPEECH_SECOND, 1)
+        return Response(_silence_wav(seconds), media_type="audio/wav")
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(file: UploadFile = File(...), model: str = Form("whisper-1")):
+        await file.read()
+        failure = injected_failure()
+        if failure:
+            return failure
+
+        await asyncio.sleep(latency(config.transcription_latency_ms))
+        return {"text": TRANSCRIPT}
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    for field in fields(FakeOpenAIConfig):
+        option = "--" + field.name.replace("_", "-")
+        parser.add_argument(option, type=int if field.name in ("retry_after_seconds", "seed") else float,
+                            default=field.default)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    config = FakeOpenAIConfig(**{field.name: getattr(args, field.name) for field in fields(FakeOpenAIConfig)})
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
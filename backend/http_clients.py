@@ -0,0 +1,135 @@
+"""Process-wide registry of pooled OpenAI clients.
+
+Every caller that talks to OpenAI (the FastAPI services and the Streamlit app)
+gets the same client for a given key and base URL. The underlying httpx client
+keeps connections alive between calls and negotiates HTTP/2 (``h2`` comes
+with the ``httpx[http2]`` requirement; without it the client falls back to
+HTTP/1.1), so periodic calls such as partial transcription
+reuse one TLS connection instead of handshaking each time.
+
+Kept free of backend.config so the Streamlit app can import it. The openai
+package takes about half a second to import, so it is loaded with the first
+client rather than with this module.
+"""
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+import httpx
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+POOL_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=120,
+)
+TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+MAX_RETRIES = 2
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ConnectionStats:
+    """Counts requests and newly opened connections from httpcore trace events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.http2_requests = 0
+
+    def on_request(self, request: httpx.Request):
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    def _trace(self, event: str, info: dict):
+        if event == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+        elif event == "http2.send_request_headers.started":
+            with self._lock:
+                self.http2_requests += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            reused = max(self.requests - self.connections_opened, 0)
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": reused,
+                "reuse_ratio": reused / self.requests if self.requests else 0.0,
+                "http2_requests": self.http2_requests,
+            }
+
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[Optional[str], Optional[str]], "OpenAI"] = {}
+_transport_wrapper: Optional[Callable[[httpx.BaseTransport], httpx.BaseTransport]] = None
+stats = ConnectionStats()
+
+
+def set_transport_wrapper(wrapper: Optional[Callable[[httpx.BaseTransport], httpx.BaseTransport]]):
+    """Wrap the transport of clients created from now on (e.g. a recording cassette)"""
+    global _transport_wrapper
+    with _lock:
+        _transport_wrapper = wrapper
+        # Existing clients keep the old transport; close their pools before dropping them
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def create_http_client() -> httpx.Client:
+    transport: httpx.BaseTransport = httpx.HTTPTransport(http2=http2_available(), limits=POOL_LIMITS)
+    if _transport_wrapper is not None:
+        transport = _transport_wrapper(transport)
+    return httpx.Client(
+        transport=transport,
+        timeout=TIMEOUT,
+        event_hooks={"request": [stats.on_request]},
+    )
+
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> "OpenAI":
+    """Return the shared client for this key and base URL, creating it on first use"""
+    key = (api_key, base_url)
+    client = _clients.get(key)
+    if client is None:
+        from openai import OpenAI
+
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    timeout=TIMEOUT,
+                    max_retries=MAX_RETRIES,
+                    http_client=create_http_client(),
+                )
+                _clients[key] = client
+    return client
+
+
+def client_stats() -> dict:
+    return {
+        "clients": len(_clients),
+        "http2_enabled": http2_available(),
+        **stats.summary(),
+    }
+
+
+def close_clients():
+    """Close every pooled connection (on shutdown)"""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,107 @@
+"""Idempotency keys for mutating endpoints.
+
+A retried request with the same key gets the stored result of the first
+attempt instead of running again. A retry that arrives while the first
+attempt is still running waits for it and gets the same result. Results are
+kept for ``IDEMPOTENCY_TTL_SECONDS``, in a bounded LRU.
+
+Successful results and client errors (4xx) are stored. Server errors are
+not, so a retry after a transient failure runs the request again. Callers
+whose key stands for the state of a session rather than one request pass
+``store_errors=False``, so a 4xx is not replayed once the state changes.
+Reusing a key for a different request body is rejected with 422.
+"""
+import asyncio
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from starlette.concurrency import run_in_threadpool
+
+from backend import metrics
+from backend.cache import TTLCache
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class Outcome(NamedTuple):
+    fingerprint: str
+    value: Any = None
+    error: Optional[HTTPException] = None
+
+    def result(self, replayed: bool = False) -> Any:
+        if self.error is not None:
+            headers = {REPLAYED_HEADER: "true"} if replayed else None
+            raise HTTPException(status_code=self.error.status_code, detail=self.error.detail, headers=headers)
+        return self.value
+
+
+class IdempotencyStore:
+    """Completed results by key, plus the attempts still running"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.completed = TTLCache(max_entries=max_entries, default_ttl=ttl)
+        self.pending: Dict[Tuple[str, ...], Tuple[str, asyncio.Future]] = {}
+
+    async def run(
+        self,
+        key: Tuple[str, ...],
+        fingerprint: str,
+        handler: Callable[[], Any],
+        response: Optional[Response] = None,
+        store_errors: bool = True,
+    ) -> Any:
+        """Run handler in the threadpool once per key and return its result to every caller.
+
+        ``key[0]`` names the endpoint in metrics.
+        """
+        found, outcome = self.completed.get(key)
+        if found:
+            self._check(outcome, fingerprint)
+            self._replayed(key, "replayed", response)
+            return outcome.result(replayed=True)
+
+        if key in self.pending:
+            pending_fingerprint, future = self.pending[key]
+            self._check(Outcome(pending_fingerprint), fingerprint)
+            self._replayed(key, "coalesced", response)
+            return (await asyncio.shield(future)).result(replayed=True)
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[key] = (fingerprint, future)
+        metrics.idempotent_requests.inc((key[0], "executed"))
+        try:
+            outcome = Outcome(fingerprint, value=await run_in_threadpool(handler))
+        except HTTPException as e:
+            if e.status_code >= 500:
+                self._abandon(key, future, e)
+                raise
+            outcome = Outcome(fingerprint, error=e)
+        except BaseException as e:
+            self._abandon(key, future, e)
+            raise
+
+        self.pending.pop(key, None)
+        if outcome.error is None or store_errors:
+            self.completed.set(key, outcome)
+        future.set_result(outcome)
+        return outcome.result()
+
+    def _abandon(self, key: Tuple[str, ...], future: asyncio.Future, error: BaseException):
+        """Release the key so a later retry runs again; waiting duplicates get the same error"""
+        self.pending.pop(key, None)
+        if isinstance(error, asyncio.CancelledError):
+            future.cancel()
+            return
+        future.set_exception(error)
+        future.exception()  # mark as retrieved when nobody is waiting
+
+    @staticmethod
+    def _replayed(key: Tuple[str, ...], kind: str, response: Optional[Response]):
+        metrics.idempotent_requests.inc((key[0], kind))
+        if response is not None:
+            response.headers[REPLAYED_HEADER] = "true"
+
+    @staticmethod
+    def _check(outcome: Outcome, fingerprint: str):
+        if outcome.fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
@@ -0,0 +1,457 @@
+"""WebSocket channel that runs a whole interview over one connection.
+
+Client to server:
+    text    {"type": "hello", "last_seq": 0, "tts": true}   first frame of every connection
+            optional "audio": {"format": "pcm16", "sample_rate": 16000} for raw microphone samples
+    binary  microphone audio for the current answer, in chunks
+    text    {"type": "answer_end"}                          transcribe, evaluate, ask the next question
+    text    {"type": "answer_end", "answer_text": "..."}    typed answer, skips transcription
+    text    {"type": "save"}                                store the completed interview
+
+Server to client, every frame numbered with a per-session ``seq``:
+    text    question, audio_start, audio_end, transcript, evaluation, complete, saved, error
+            transcript frames with "final": false arrive while the answer is still spoken
+            error frames from admission control carry "retry_after" in seconds; question
+            generation, evaluation, question audio and each transcribed segment take a slot
+    binary  4-byte big-endian seq followed by a chunk of question audio
+
+The first reply on each connection is an unnumbered ``ready`` frame with a
+snapshot of the session. Recent frames are kept per session, so a client that
+reconnects with the last ``seq`` it processed has the rest replayed. If the
+buffer no longer reaches back that far, ``ready`` carries ``"gap": true`` and
+the client rebuilds from the snapshot. Answer processing is not tied to the
+connection and carries on while the client is away.
+
+Each connection has a bounded send queue. A slow client makes producers wait,
+including the TTS stream from OpenAI, rather than letting frames pile up in
+memory.
+"""
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Union
+
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from backend.admission import Priority, Rejected, admission
+from backend.config import settings
+from backend.database import db_service
+from backend.models import QAPair
+from backend.openai_service import openai_service
+from backend.session_manager import session_manager
+from backend.streaming_stt import StreamingTranscriber
+
+SEQ_HEADER = struct.Struct(">I")
+
+CLOSE_SESSION_NOT_FOUND = 4404
+CLOSE_PROTOCOL_ERROR = 4400
+CLOSE_SUPERSEDED = 4409
+CLOSE_TOO_LARGE = 1009
+
+
+class Frame(NamedTuple):
+    seq: int
+    data: Union[str, bytes]
+
+
+class ChannelState:
+    """Per-session channel state that outlives individual connections"""
+
+    def __init__(self, session_id: str, buffer_bytes: int):
+        self.session_id = session_id
+        self.buffer_bytes = buffer_bytes
+        self.next_seq = 1
+        self.outbox: Deque[Frame] = deque()
+        self.outbox_size = 0
+        self.transcriber: Optional[StreamingTranscriber] = None
+        self.audio_format: dict = {}
+        self.asked = 0               # last question number sent
+        self.tts = True
+        self.task: Optional[asyncio.Task] = None
+        self.websocket: Optional[WebSocket] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self.idle_since: Optional[float] = time.monotonic()   # None while a client is connected
+
+    @property
+    def busy(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    async def emit(self, message: Union[dict, bytes]):
+        """Number a frame, keep it for replay and queue it for the connected client"""
+        seq = self.next_seq
+        self.next_seq += 1
+        if isinstance(message, dict):
+            data: Union[str, bytes] = json.dumps({**message, "seq": seq})
+        else:
+            data = SEQ_HEADER.pack(seq) + message
+
+        self.outbox.append(Frame(seq, data))
+        self.outbox_size += len(data)
+        while self.outbox_size > self.buffer_bytes and len(self.outbox) > 1:
+            self.outbox_size -= len(self.outbox.popleft().data)
+
+        if self.queue is not None:
+            # Waits while the client is behind
+            await self.queue.put(data)
+
+    def start_answer(self) -> StreamingTranscriber:
+        """Transcriber for the answer being recorded, created on its first chunk"""
+        if self.transcriber is None:
+            number = self.asked
+
+            async def partial(text: str):
+                await self.emit({"type": "transcript", "question_number": number, "text": text, "final": False})
+
+            self.transcriber = StreamingTranscriber(
+                self.audio_format.get("format"), self.audio_format.get("sample_rate"), on_partial=partial
+            )
+        return self.transcriber
+
+    def discard_answer(self):
+        if self.transcriber is not None:
+            self.transcriber.cancel()
+            self.transcriber = None
+
+    def replay(self, last_seq: int) -> Optional[List[Union[str, bytes]]]:
+        """Frames after last_seq, or None if some were already evicted"""
+        if self.outbox and self.outbox[0].seq > last_seq + 1:
+            return None
+        if not self.outbox and self.next_seq > last_seq + 1:
+            return None
+        return [frame.data for frame in self.outbox if frame.seq > last_seq]
+
+    def attach(self, websocket: WebSocket, queue: asyncio.Queue) -> Optional[WebSocket]:
+        previous = self.websocket
+        self.detach()
+        self.websocket, self.queue = websocket, queue
+        self.idle_since = None
+        return previous
+
+    def detach(self):
+        queue, self.websocket, self.queue = self.queue, None, None
+        self.idle_since = time.monotonic()
+        if queue is not None:
+            # Release producers blocked on the dead connection; frames remain in the outbox
+            while not queue.empty():
+                queue.get_nowait()
+
+    def release(self):
+        """Drop buffered audio and frames once the session is gone"""
+        self.discard_answer()
+        self.outbox.clear()
+        self.outbox_size = 0
+
+
+class InterviewChannels:
+    def __init__(self):
+        self.states: Dict[str, ChannelState] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        session_manager.delete_listeners.append(self.discard)
+
+    def discard(self, session_id: str):
+        """Forget a deleted session's channel; safe to call from worker threads"""
+        state = self.states.pop(session_id, None)
+        if state is None or self.loop is None or self.loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            state.release()
+        else:
+            self.loop.call_soon_threadsafe(state.release)
+
+    def expire_idle(self, now: Optional[float] = None):
+        """Drop states that have had no client and no work for WS_IDLE_STATE_SECONDS"""
+        cutoff = (now if now is not None else time.monotonic()) - settings.WS_IDLE_STATE_SECONDS
+        for session_id, state in list(self.states.items()):
+            if state.idle_since is not None and state.idle_since < cutoff and not state.busy:
+                self.states.pop(session_id, None)
+                state.release()
+
+    @property
+    def connected(self) -> int:
+        return sum(1 for state in self.states.values() if state.websocket is not None)
+
+    async def serve(self, websocket: WebSocket, session_id: str):
+        self.loop = asyncio.get_running_loop()
+        self.expire_idle()
+        await websocket.accept()
+        session = session_manager.get_session(session_id)
+        if session is None:
+            self.states.pop(session_id, None)
+            await websocket.close(code=CLOSE_SESSION_NOT_FOUND, reason="Session not found")
+            return
+
+        try:
+            hello = await websocket.receive_json()
+        except (WebSocketDisconnect, ValueError, KeyError):
+            await self._close(websocket, CLOSE_PROTOCOL_ERROR, "Expected hello")
+            return
+        if not isinstance(hello, dict) or hello.get("type") != "hello":
+            await self._close(websocket, CLOSE_PROTOCOL_ERROR, "Expected hello")
+            return
+
+        try:
+            last_seq = int(hello.get("last_seq") or 0)
+        except (TypeError, ValueError):
+            await self._close(websocket, CLOSE_PROTOCOL_ERROR, "Invalid last_seq")
+            return
+
+        state = self.states.get(session_id)
+        if state is None:
+            state = self.states[session_id] = ChannelState(session_id, settings.WS_RESUME_BUFFER_BYTES)
+        state.tts = bool(hello.get("tts", True))
+        if isinstance(hello.get("audio"), dict):
+            state.audio_format = hello["audio"]
+
+        replayed = state.replay(last_seq)
+        ready = json.dumps({
+            "type": "ready",
+            "session_id": session_id,
+            "resumed": last_seq > 0,
+            "gap": replayed is None,
+            "last_seq": state.next_seq - 1,
+            "question_number": session.current_question_num,
+            "question_text": session.current_question,
+            "total_questions": session.total_questions,
+            "answered": len(session_manager.get_qa_pairs(session_id)),
+            "audio_received": state.transcriber.received if state.transcriber else 0,
+            "busy": state.busy,
+        })
+
+        # Replayed frames are handed to the sender before any new frame is queued
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.WS_SEND_QUEUE_FRAMES)
+        previous = state.attach(websocket, queue)
+        sender = asyncio.create_task(self._send_loop(websocket, [ready] + (replayed or []), queue))
+        if previous is not None:
+            await self._close(previous, CLOSE_SUPERSEDED, "Superseded by a newer connection")
+
+        if not state.busy and state.asked < session.current_question_num <= session.total_questions:
+            state.task = asyncio.create_task(self._ask_current(state))
+
+        try:
+            await self._receive_loop(websocket, state)
+        finally:
+            if state.websocket is websocket:
+                state.detach()
+            sender.cancel()
+
+    async def _receive_loop(self, websocket: WebSocket, state: ChannelState):
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+            if message.get("bytes") is not None:
+                if state.busy:
+                    await state.emit({"type": "error", "detail": "Audio received while the previous answer is processed"})
+                    continue
+                try:
+                    transcriber = state.start_answer()
+                except ValueError as e:
+                    await state.emit({"type": "error", "detail": str(e)})
+                    continue
+                if transcriber.received + len(message["bytes"]) > settings.MAX_UPLOAD_SIZE:
+                    state.discard_answer()
+                    await self._close(websocket, CLOSE_TOO_LARGE, "Answer audio too large")
+                    return
+                await transcriber.feed(message["bytes"])
+                continue
+
+            try:
+                command = json.loads(message.get("text") or "")
+                kind = command["type"]
+            except (ValueError, KeyError, TypeError):
+                await state.emit({"type": "error", "detail": "Invalid message"})
+                continue
+
+            if kind in ("answer_end", "save") and state.busy:
+                await state.emit({"type": "error", "detail": "Still processing the previous answer"})
+            elif kind == "answer_end":
+                state.task = asyncio.create_task(self._answer(state, command.get("answer_text")))
+            elif kind == "save":
+                state.task = asyncio.create_task(self._save(state))
+            else:
+                await state.emit({"type": "error", "detail": f"Unknown message type '{kind}'"})
+
+    async def _send_loop(self, websocket: WebSocket, initial: List[Union[str, bytes]], queue: asyncio.Queue):
+        try:
+            for data in initial:
+                await self._send(websocket, data)
+            while True:
+                await self._send(websocket, await queue.get())
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+
+    @staticmethod
+    async def _send(websocket: WebSocket, data: Union[str, bytes]):
+        if isinstance(data, bytes):
+            await websocket.send_bytes(data)
+        else:
+            await websocket.send_text(data)
+
+    @staticmethod
+    async def _close(websocket: WebSocket, code: int, reason: str):
+        try:
+            await websocket.close(code=code, reason=reason)
+        except RuntimeError:
+            pass
+
+    async def _ask_current(self, state: ChannelState):
+        session = session_manager.get_session(state.session_id)
+        if session is None:
+            return
+        try:
+            text = session.current_question
+            if not text:
+                async with admission.admit(Priority.INTERVIEW):
+                    text = await run_in_threadpool(
+                        openai_service.generate_question,
+                        resume=session.resume,
+                        jd=session.jd,
+                        interview_type=session.interview_type,
+                        question_num=session.current_question_num,
+                        conversation_history=session_manager.get_conversation_history(state.session_id),
+                    )
+                session_manager.update_session(state.session_id, current_question=text)
+            await self._ask(state, session.current_question_num, text)
+        except Rejected as e:
+            # A new hello asks again
+            await state.emit({"type": "error", "detail": e.detail, "retry_after": e.retry_after})
+        except Exception as e:
+            await state.emit({"type": "error", "detail": str(e)})
+
+    async def _ask(self, state: ChannelState, number: int, text: str):
+        """Send a question followed by its speech audio"""
+        state.asked = number
+        await state.emit({"type": "question", "question_number": number, "question_text": text})
+        if not state.tts:
+            return
+
+        await state.emit({"type": "audio_start", "question_number": number, "media_type": "audio/mpeg"})
+        # Unbounded on purpose: one question's audio, so a slow client never holds the admission slot
+        chunks: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._read_speech(text, chunks))
+        total = 0
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                total += len(chunk)
+                await state.emit(chunk)
+        except BaseException:
+            reader.cancel()
+            raise
+        error = await reader
+        if isinstance(error, Rejected):
+            # The question text is already out; only its audio is skipped
+            await state.emit({"type": "error", "detail": f"Text-to-speech skipped: {error.detail}", "retry_after": error.retry_after})
+        elif error is not None:
+            await state.emit({"type": "error", "detail": f"Text-to-speech failed: {error}"})
+        await state.emit({"type": "audio_end", "question_number": number, "bytes": total})
+
+    @staticmethod
+    async def _read_speech(text: str, chunks: asyncio.Queue) -> Optional[Exception]:
+        """Read question audio from OpenAI under an admission slot; None marks the end of `chunks`"""
+        try:
+            async with admission.admit(Priority.INTERVIEW):
+                stream = openai_service.stream_speech(text, settings.WS_AUDIO_CHUNK_BYTES)
+                try:
+                    while True:
+                        chunk = await run_in_threadpool(next, stream, None)
+                        if chunk is None:
+                            return None
+                        chunks.put_nowait(chunk)
+                finally:
+                    await run_in_threadpool(stream.close)
+        except Exception as e:
+            return e
+        finally:
+            chunks.put_nowait(None)
+
+    async def _answer(self, state: ChannelState, answer_text: Optional[str]):
+        session = session_manager.get_session(state.session_id)
+        if session is None:
+            return
+        number = session.current_question_num
+        question = session.current_question or ""
+        try:
+            transcriber, state.transcriber = state.transcriber, None
+            if answer_text is None:
+                answer_text = await transcriber.finish() if transcriber is not None else ""
+                await state.emit({"type": "transcript", "question_number": number, "text": answer_text, "final": True})
+            elif transcriber is not None:
+                transcriber.cancel()
+
+            async with admission.admit(Priority.INTERVIEW):
+                score, feedback = await run_in_threadpool(
+                    openai_service.evaluate_answer,
+                    question=question,
+                    answer=answer_text,
+                    jd=session.jd,
+                    interview_type=session.interview_type,
+                )
+            session_manager.record_answer(state.session_id, QAPair(
+                number=number, question=question, answer=answer_text, score=score, feedback=feedback
+            ))
+            await state.emit({"type": "evaluation", "question_number": number, "score": score, "feedback": feedback})
+
+            if number < session.total_questions:
+                async with admission.admit(Priority.INTERVIEW):
+                    text = await run_in_threadpool(
+                        openai_service.generate_question,
+                        resume=session.resume,
+                        jd=session.jd,
+                        interview_type=session.interview_type,
+                        question_num=number + 1,
+                        conversation_history=session_manager.get_conversation_history(state.session_id),
+                    )
+                session_manager.update_session(state.session_id, current_question=text)
+                await self._ask(state, number + 1, text)
+            else:
+                qa_pairs = session_manager.get_qa_pairs(state.session_id)
+                final_score = sum(qa.score for qa in qa_pairs) / len(qa_pairs)
+                await state.emit({
+                    "type": "complete",
+                    "final_score": final_score,
+                    "percentage": final_score / 10 * 100,
+                    "answered": len(qa_pairs),
+                })
+        except Rejected as e:
+            # Resubmit with answer_text after retry_after; a new hello re-asks a pending question
+            await state.emit({"type": "error", "question_number": number, "detail": e.detail, "retry_after": e.retry_after})
+        except Exception as e:
+            await state.emit({"type": "error", "question_number": number, "detail": str(e)})
+
+    async def _save(self, state: ChannelState):
+        session = session_manager.get_session(state.session_id)
+        qa_pairs = session_manager.get_qa_pairs(state.session_id)
+        if session is None or not qa_pairs:
+            await state.emit({"type": "error", "detail": "No answers to save"})
+            return
+
+        interview_id = await run_in_threadpool(db_service.save_interview, {
+            'candidate_name': session.candidate_name,
+            'job_title': session.job_title,
+            'interview_type': session.interview_type,
+            'final_score': sum(qa.score for qa in qa_pairs) / len(qa_pairs),
+            'start_time': session.start_time.isoformat(),
+            'qa_pairs': [qa.model_dump() for qa in qa_pairs]
+        })
+        if not interview_id:
+            await state.emit({"type": "error", "detail": "Failed to save interview"})
+            return
+
+        session_manager.delete_session(state.session_id)
+        await state.emit({"type": "saved", "interview_id": interview_id})
+        self.states.pop(state.session_id, None)
+
+
+# Singleton instance
+interview_channels = InterviewChannels()
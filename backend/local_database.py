@@ -0,0 +1,308 @@
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from backend.analytics import CohortIndex
+from backend.database import MATCH_END, MATCH_START, DatabaseService
+
+# Quoted phrases or bare words; everything else in a query is treated as a separator
+_QUERY_TERM = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def to_fts5_query(query: str) -> str:
+    """Translate a web-style search string into a safe FTS5 MATCH expression.
+
+    Words and "quoted phrases" are ANDed together, ``OR`` between terms is kept
+    as an operator, and FTS5 syntax characters in user input are neutralised.
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM.findall(query):
+        if word == "OR":
+            if terms and terms[-1] != "OR":
+                terms.append("OR")
+            continue
+        text = " ".join(re.findall(r"\w+", phrase or word))
+        if text:
+            terms.append(f'"{text}"')
+    while terms and terms[-1] == "OR":
+        terms.pop()
+    return " ".join(terms)
+
+
+class SQLiteDatabaseService(DatabaseService):
+    """DatabaseService backed by a local SQLite file.
+
+    Used for development, tests and offline load testing. Exposes the same
+    interface as the Supabase-backed service; analytics are served from an
+    in-memory NumPy index maintained on save and delete.
+    """
+    backend_name = "sqlite"
+
+    def __init__(self, path: str = "interviews.db"):
+        self.path = path
+        self._lock = threading.RLock()
+        self._cohorts: Optional[CohortIndex] = None
+        super().__init__()
+
+    def _initialize(self):
+        """Open the SQLite database and create tables"""
+        try:
+            self.client = sqlite3.connect(self.path, check_same_thread=False)
+            self.client.row_factory = sqlite3.Row
+            self.client.execute("PRAGMA foreign_keys = ON")
+            if self.path != ":memory:":
+                self.client.execute("PRAGMA journal_mode = WAL")
+            has_search_index = self.client.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'questions_fts'"
+            ).fetchone()
+            self.client.executescript(self.get_local_schema())
+            if not has_search_index:
+                # Index rows saved before the search table existed
+                with self.client:
+                    self.client.execute("INSERT INTO questions_fts (questions_fts) VALUES ('rebuild')")
+        except Exception as e:
+            print(f"Failed to initialize SQLite: {e}")
+            self.client = None
+
+    def _ping(self):
+        with self._lock:
+            self.client.execute("SELECT 1").fetchone()
+
+    # Raw storage operations
+    def _insert_interview(self, interview_data: dict) -> Optional[str]:
+        interview_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+
+        with self._lock, self.client:
+            self.client.execute(
+                """
+                INSERT INTO interviews
+                    (id, candidate_name, job_title, interview_type, final_score, start_time, completed_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    interview_id,
+                    interview_data['candidate_name'],
+                    interview_data['job_title'],
+                    interview_data['interview_type'],
+                    interview_data['final_score'],
+                    interview_data['start_time'],
+                    now,
+                    now,
+                ),
+            )
+            self.client.executemany(
+                """
+                INSERT INTO questions
+                    (id, interview_id, question_number, question_text, answer, score, feedback, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        str(uuid.uuid4()),
+                        interview_id,
+                        qa['number'],
+                        qa['question'],
+                        qa['answer'],
+                        qa['score'],
+                        qa['feedback'],
+                        now,
+                    )
+                    for qa in interview_data['qa_pairs']
+                ],
+            )
+
+            if self._cohorts is not None:
+                self._cohorts.add(
+                    interview_data['job_title'],
+                    interview_data['interview_type'],
+                    interview_data['final_score'],
+                    [(qa['number'], qa['score']) for qa in interview_data['qa_pairs']],
+                )
+
+        return interview_id
+
+    def _delete_interview(self, interview_id: str) -> bool:
+        with self._lock, self.client:
+            interview = self._fetch_interview(interview_id)
+            if not interview:
+                return False
+            question_scores = [(q['question_number'], q['score']) for q in self._fetch_questions(interview_id)]
+
+            self.client.execute("DELETE FROM interviews WHERE id = ?", (interview_id,))
+
+            if self._cohorts is not None:
+                self._cohorts.remove(
+                    interview['job_title'],
+                    interview['interview_type'],
+                    interview['final_score'],
+                    question_scores,
+                )
+        return True
+
+    def _fetch_all_interviews(self) -> List[dict]:
+        return self._query("SELECT * FROM interviews ORDER BY created_at DESC")
+
+    def _fetch_interview(self, interview_id: str) -> Optional[dict]:
+        rows = self._query("SELECT * FROM interviews WHERE id = ?", (interview_id,))
+        return rows[0] if rows else None
+
+    def _fetch_questions(self, interview_id: str) -> List[dict]:
+        return self._query(
+            "SELECT * FROM questions WHERE interview_id = ? ORDER BY question_number",
+            (interview_id,),
+        )
+
+    def _fetch_interview_page(
+        self,
+        since: Optional[str],
+        until: Optional[str],
+        job_title: Optional[str],
+        cursor: Optional[Tuple[str, str]],
+        limit: int,
+    ) -> List[dict]:
+        clauses, params = [], []
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("created_at < ?")
+            params.append(until)
+        if job_title:
+            clauses.append("job_title = ?")
+            params.append(job_title)
+        if cursor:
+            clauses.append("(created_at, id) > (?, ?)")
+            params.extend(cursor)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(
+            f"SELECT * FROM interviews {where} ORDER BY created_at, id LIMIT ?",
+            (*params, limit),
+        )
+
+    def _fetch_questions_for(self, interview_ids) -> List[dict]:
+        ids = list(interview_ids)
+        if not ids:
+            return []
+        placeholders = ",".join("?" * len(ids))
+        return self._query(
+            f"SELECT * FROM questions WHERE interview_id IN ({placeholders}) "
+            "ORDER BY interview_id, question_number",
+            tuple(ids),
+        )
+
+    def _search_questions(self, query: str, limit: int, offset: int) -> List[dict]:
+        match = to_fts5_query(query)
+        if not match:
+            return []
+        return self._query(
+            """
+            SELECT q.id AS question_id,
+                   q.interview_id,
+                   i.candidate_name,
+                   i.job_title,
+                   i.interview_type,
+                   q.question_number,
+                   q.score,
+                   -bm25(questions_fts, 2.0, 4.0, 1.0) AS rank,
+                   snippet(questions_fts, 0, ?1, ?2, '…', 24) AS question_snippet,
+                   snippet(questions_fts, 1, ?1, ?2, '…', 24) AS answer_snippet,
+                   snippet(questions_fts, 2, ?1, ?2, '…', 24) AS feedback_snippet
+            FROM questions_fts
+            JOIN questions q ON q.rowid = questions_fts.rowid
+            JOIN interviews i ON i.id = q.interview_id
+            WHERE questions_fts MATCH ?3
+            ORDER BY bm25(questions_fts, 2.0, 4.0, 1.0)
+            LIMIT ?4 OFFSET ?5
+            """,
+            (MATCH_START, MATCH_END, match, limit, offset),
+        )
+
+    def _fetch_score_analytics(self) -> List[dict]:
+        return self._cohort_index().summaries()
+
+    def _fetch_percentile_rank(self, job_title: str, interview_type: str, score: float) -> Optional[dict]:
+        return self._cohort_index().rank(job_title, interview_type, score)
+
+    def _cohort_index(self) -> CohortIndex:
+        # Built once from two narrow projections, then maintained incrementally
+        with self._lock:
+            if self._cohorts is None:
+                cohorts = CohortIndex()
+                cohorts.load(
+                    self.client.execute(
+                        "SELECT job_title, interview_type, final_score FROM interviews"
+                    ).fetchall(),
+                    self.client.execute(
+                        """
+                        SELECT i.job_title, i.interview_type, q.question_number, q.score
+                        FROM questions q JOIN interviews i ON i.id = q.interview_id
+                        """
+                    ).fetchall(),
+                )
+                self._cohorts = cohorts
+            return self._cohorts
+
+    def _query(self, sql: str, params: tuple = ()) -> List[dict]:
+        with self._lock:
+            return [dict(row) for row in self.client.execute(sql, params).fetchall()]
+
+    @staticmethod
+    def get_local_schema() -> str:
+        """Return SQLite schema equivalent to get_table_schema"""
+        return """
+        CREATE TABLE IF NOT EXISTS interviews (
+            id TEXT PRIMARY KEY,
+            candidate_name TEXT NOT NULL,
+            job_title TEXT NOT NULL,
+            interview_type TEXT NOT NULL,
+            final_score REAL,
+            start_time TEXT,
+            completed_at TEXT,
+            created_at TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS questions (
+            id TEXT PRIMARY KEY,
+            interview_id TEXT REFERENCES interviews(id) ON DELETE CASCADE,
+            question_number INTEGER,
+            question_text TEXT,
+            answer TEXT,
+            score REAL,
+            feedback TEXT,
+            created_at TEXT
+        );
+
+        CREATE INDEX IF NOT EXISTS interviews_created_at_idx ON interviews (created_at, id);
+        CREATE INDEX IF NOT EXISTS interviews_cohort_score_idx
+            ON interviews (job_title, interview_type, final_score);
+        CREATE INDEX IF NOT EXISTS questions_interview_idx ON questions (interview_id, question_number);
+
+        -- Full-text search (external content table kept in sync by triggers)
+        CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+            question_text, answer, feedback,
+            content='questions', content_rowid='rowid',
+            tokenize='porter unicode61'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+            INSERT INTO questions_fts (rowid, question_text, answer, feedback)
+            VALUES (new.rowid, new.question_text, new.answer, new.feedback);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+            INSERT INTO questions_fts (questions_fts, rowid, question_text, answer, feedback)
+            VALUES ('delete', old.rowid, old.question_text, old.answer, old.feedback);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE ON questions BEGIN
+            INSERT INTO questions_fts (questions_fts, rowid, question_text, answer, feedback)
+            VALUES ('delete', old.rowid, old.question_text, old.answer, old.feedback);
+            INSERT INTO questions_fts (rowid, question_text, answer, feedback)
+            VALUES (new.rowid, new.question_text, new.answer, new.feedback);
+        END;
+        """
@@ -1,10 +1,17 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+# Imported first so the cold-start phase timings cover every import below
+from backend.startup import WarmupStep, startup
+
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Header, Query, Request, Response, WebSocket
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import io
 import base64
+import time
 
 from backend.config import settings
 from backend.models import (
@@ -17,17 +24,60 @@ from backend.models import (
     QAPair,
     TTSRequest,
     AudioResponse,
-    FileUploadResponse
+    FileUploadResponse,
+    ScoreAnalytics,
+    CandidateRank,
+    SearchResponse,
 )
+from backend.admission import Priority, Rejected, admission
+from backend.analytics import HISTOGRAM_EDGES
+from backend.audio_processing import SpeechStats, audio_duration, passthrough, prepare_upload
+from backend import metrics, tracing
+from backend.export import ExportFormatError, get_encoder, stream_export
+from backend.http_clients import client_stats, close_clients
+from backend.interview_channel import interview_channels
 from backend.database import db_service
 from backend.openai_service import openai_service
 from backend.session_manager import session_manager
-from backend.utils import extract_text_from_pdf, extract_text_from_txt, validate_file_extension
+from backend.streaming_stt import serve_stream
+from backend.utils import (
+    extract_text_from_pdf,
+    extract_text_from_txt,
+    validate_file_extension,
+    compute_etag,
+    etag_matches,
+)
+
+def warmup_steps() -> List[WarmupStep]:
+    """Client creation and connection set-up done before the first request"""
+    return [
+        WarmupStep("database", db_service.connect),
+        WarmupStep(
+            "openai",
+            lambda: openai_service.warm_up(prime=settings.WARMUP_PRIME_COMPLETION),
+            required=False,
+        ),
+    ]
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start tracing and background warm-up; close connections and flush traces on shutdown"""
+    startup.mark("lifespan")
+    tracing.configure(
+        settings.TRACE_SAMPLE_RATE,
+        tracing.create_exporter(settings.TRACE_EXPORTER, settings.TRACE_FILE_PATH, settings.TRACE_OTLP_ENDPOINT),
+        service_name=settings.API_TITLE,
+    )
+    startup.warm_up(warmup_steps() if settings.WARMUP_ENABLED else [])
+    yield
+    close_clients()
+    tracing.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.API_TITLE,
     version=settings.API_VERSION,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -39,17 +89,121 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+speech_stats = SpeechStats()
+
+# Gauges computed from existing state at scrape time
+metrics.registry.gauge(
+    "interview_active_sessions", "Interview sessions held in memory",
+    function=lambda: {(): len(session_manager.sessions)},
+)
+metrics.registry.gauge(
+    "cache_stat", "Read-through cache statistics", ("stat",),
+    function=lambda: {(name,): value for name, value in db_service.cache.stats().items()},
+)
+metrics.registry.gauge(
+    "openai_connection_stat", "OpenAI connection pool statistics", ("stat",),
+    function=lambda: {(name,): float(value) for name, value in client_stats().items()},
+)
+metrics.registry.gauge(
+    "interview_channel_connections", "Open interview WebSocket connections",
+    function=lambda: {(): interview_channels.connected},
+)
+metrics.registry.gauge(
+    "admission_stat", "Admission control: in-flight and queued requests, recent delays", ("stat",),
+    function=lambda: {
+        (name,): float(admission.stats()[name])
+        for name in ("in_flight", "queued", "queue_delay_ms", "service_time_ms", "retry_after_s")
+    },
+)
+metrics.registry.gauge(
+    "startup_phase_seconds", "Seconds from application import to each startup phase", ("phase",),
+    function=lambda: {(phase,): value for phase, value in startup.phases.items()},
+)
+
+# OpenAI-backed endpoints behind admission control, by priority
+ADMISSION_PRIORITIES = {
+    f"{settings.API_PREFIX}/interview/start": Priority.NEW,
+    f"{settings.API_PREFIX}/interview/question": Priority.INTERVIEW,
+    f"{settings.API_PREFIX}/interview/answer": Priority.INTERVIEW,
+    f"{settings.API_PREFIX}/audio/tts": Priority.INTERVIEW,
+    f"{settings.API_PREFIX}/audio/stt": Priority.INTERVIEW,
+}
+
+@app.middleware("http")
+async def admit_llm_requests(request: Request, call_next):
+    """Queue or refuse OpenAI-backed requests beyond capacity, running interviews first"""
+    priority = ADMISSION_PRIORITIES.get(request.url.path) if request.method == "POST" else None
+    if priority is None:
+        return await call_next(request)
+    try:
+        async with admission.admit(priority):
+            return await call_next(request)
+    except Rejected as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"detail": e.detail},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Per-route latency, status counts and in-flight requests"""
+    metrics.http_requests_in_flight.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        labels = (request.method, route.path if route is not None else "unmatched")
+        metrics.http_request_duration.observe(time.perf_counter() - started, labels)
+        metrics.http_requests.inc(labels + (str(status),))
+        metrics.http_requests_in_flight.dec()
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """Trace each request and report stage timings in Server-Timing"""
+    trace, tokens = tracing.start_trace(request.headers.get("traceparent"))
+    response = None
+    try:
+        response = await call_next(request)
+        return response
+    finally:
+        route = request.scope.get("route")
+        tracing.finish_trace(
+            trace,
+            tokens,
+            f"{request.method} {route.path if route is not None else 'unmatched'}",
+            **{"http.status_code": response.status_code if response is not None else 500},
+        )
+        if response is not None and settings.SERVER_TIMING_ENABLED:
+            response.headers["Server-Timing"] = trace.server_timing()
+
 # Health check
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Liveness check; never waits for or creates backend clients"""
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "supabase_connected": db_service.client is not None,
+        "supabase_connected": db_service.connected,
         "openai_configured": True
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: 503 until warm-up has connected the required backends"""
+    status = startup.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics"""
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 # File upload endpoints
 @app.post(f"{settings.API_PREFIX}/upload/pdf", response_model=FileUploadResponse)
 async def upload_pdf(file: UploadFile = File(...)):
@@ -59,6 +213,7 @@ async def upload_pdf(file: UploadFile = File(...)):
     
     try:
         content = await file.read()
+        metrics.upload_size.observe(len(content), ("pdf",))
         if len(content) > settings.MAX_UPLOAD_SIZE:
             raise HTTPException(status_code=400, detail="File too large")
         
@@ -78,6 +233,7 @@ async def upload_txt(file: UploadFile = File(...)):
     
     try:
         content = await file.read()
+        metrics.upload_size.observe(len(content), ("txt",))
         if len(content) > settings.MAX_UPLOAD_SIZE:
             raise HTTPException(status_code=400, detail="File too large")
         
@@ -91,17 +247,26 @@ async def upload_txt(file: UploadFile = File(...)):
 
 # Interview session endpoints
 @app.post(f"{settings.API_PREFIX}/interview/start")
-async def start_interview(setup: InterviewSetup):
-    """Start a new interview session"""
+async def start_interview(setup: InterviewSetup, response: Response, idempotency_key: Optional[str] = Header(None)):
+    """Start a new interview session (once per Idempotency-Key)"""
+    if idempotency_key:
+        return await session_manager.idempotency.run(
+            ("start", idempotency_key), compute_etag(setup.model_dump()), lambda: create_interview(setup), response
+        )
+    return await run_in_threadpool(create_interview, setup)
+
+def create_interview(setup: InterviewSetup) -> dict:
+    """Create a session and generate its first question"""
     try:
         # Create session
-        session_id = session_manager.create_session(
-            candidate_name=setup.candidate_name,
-            job_title=setup.job_title,
-            interview_type=setup.interview_type,
-            resume=setup.resume_text,
-            jd=setup.jd_text
-        )
+        with tracing.span("session.create"):
+            session_id = session_manager.create_session(
+                candidate_name=setup.candidate_name,
+                job_title=setup.job_title,
+                interview_type=setup.interview_type,
+                resume=setup.resume_text,
+                jd=setup.jd_text
+            )
         
         # Generate first question
         first_question = openai_service.generate_question(
@@ -111,6 +276,7 @@ async def start_interview(setup: InterviewSetup):
             question_num=1,
             conversation_history=[]
         )
+        session_manager.update_session(session_id, current_question=first_question)
         
         return {
             "session_id": session_id,
@@ -120,23 +286,31 @@ async def start_interview(setup: InterviewSetup):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.websocket(f"{settings.API_PREFIX}/interview/ws/{{session_id}}")
+async def interview_channel(websocket: WebSocket, session_id: str):
+    """Run an interview over one connection: questions, speech, answers and evaluations"""
+    await interview_channels.serve(websocket, session_id)
+
 @app.post(f"{settings.API_PREFIX}/interview/question", response_model=Question)
 async def get_next_question(request: QuestionRequest):
     """Get next question for interview"""
     try:
-        session = session_manager.get_session(request.session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        conversation_history = session_manager.get_conversation_history(request.session_id)
+        with tracing.span("session.read"):
+            session = session_manager.get_session(request.session_id)
+            if not session:
+                raise HTTPException(status_code=404, detail="Session not found")
+            
+            conversation_history = session_manager.get_conversation_history(request.session_id)
         
-        question_text = openai_service.generate_question(
+        question_text = await run_in_threadpool(
+            openai_service.generate_question,
             resume=session.resume,
             jd=session.jd,
             interview_type=session.interview_type,
             question_num=request.question_number,
             conversation_history=conversation_history
         )
+        session_manager.update_session(request.session_id, current_question=question_text)
         
         return Question(
             question_number=request.question_number,
@@ -148,10 +322,18 @@ async def get_next_question(request: QuestionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post(f"{settings.API_PREFIX}/interview/answer", response_model=AnswerEvaluation)
-async def submit_answer(submission: AnswerSubmission):
-    """Submit and evaluate answer"""
+async def submit_answer(submission: AnswerSubmission, response: Response, idempotency_key: Optional[str] = Header(None)):
+    """Submit and evaluate answer (retries are evaluated and recorded once)"""
+    fingerprint = compute_etag(submission.model_dump())
+    # Without a key, an identical resubmission of the same answer is the retry
+    key = ("answer", submission.session_id, idempotency_key or f"{submission.question_number}:{fingerprint}")
+    return await session_manager.idempotency.run(key, fingerprint, lambda: evaluate_submission(submission), response)
+
+def evaluate_submission(submission: AnswerSubmission) -> AnswerEvaluation:
+    """Evaluate an answer and record it in the session"""
     try:
-        session = session_manager.get_session(submission.session_id)
+        with tracing.span("session.read"):
+            session = session_manager.get_session(submission.session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         
@@ -163,28 +345,15 @@ async def submit_answer(submission: AnswerSubmission):
             interview_type=session.interview_type
         )
         
-        # Store Q&A pair
-        qa_pair = QAPair(
-            number=submission.question_number,
-            question=submission.question_text,
-            answer=submission.answer_text,
-            score=score,
-            feedback=feedback
-        )
-        session_manager.add_qa_pair(submission.session_id, qa_pair)
-        
-        # Add to conversation history
-        session_manager.add_conversation(
-            submission.session_id,
-            submission.question_text,
-            submission.answer_text
-        )
-        
-        # Update session
-        session_manager.update_session(
-            submission.session_id,
-            current_question_num=submission.question_number + 1
-        )
+        with tracing.span("session.update"):
+            # Store Q&A pair, add to conversation history and advance
+            session_manager.record_answer(submission.session_id, QAPair(
+                number=submission.question_number,
+                question=submission.question_text,
+                answer=submission.answer_text,
+                score=score,
+                feedback=feedback
+            ))
         
         return AnswerEvaluation(score=score, feedback=feedback)
     except HTTPException:
@@ -228,8 +397,17 @@ async def get_results(session_id: str):
 
 # Database endpoints
 @app.post(f"{settings.API_PREFIX}/interview/save/{{session_id}}")
-async def save_interview(session_id: str):
-    """Save interview to database"""
+async def save_interview(session_id: str, response: Response, idempotency_key: Optional[str] = Header(None)):
+    """Save interview to database (retries return the first interview_id)"""
+    # A session is saved at most once, so the session itself is the default key.
+    # That key outlives the request, so errors such as "No answers to save" are not kept under it.
+    key = ("save", session_id, idempotency_key or "")
+    return await session_manager.idempotency.run(
+        key, session_id, lambda: store_interview(session_id), response, store_errors=bool(idempotency_key)
+    )
+
+def store_interview(session_id: str) -> dict:
+    """Save a completed session to the database and end it"""
     try:
         session = session_manager.get_session(session_id)
         if not session:
@@ -251,7 +429,7 @@ async def save_interview(session_id: str):
             'interview_type': session.interview_type,
             'final_score': avg_score,
             'start_time': session.start_time.isoformat(),
-            'qa_pairs': [qa.dict() for qa in qa_pairs]
+            'qa_pairs': [qa.model_dump() for qa in qa_pairs]
         }
         
         interview_id = db_service.save_interview(interview_data)
@@ -278,8 +456,8 @@ async def get_all_interviews():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get(f"{settings.API_PREFIX}/interviews/{{interview_id}}")
-async def get_interview_details(interview_id: str):
-    """Get interview details by ID"""
+async def get_interview_details(interview_id: str, if_none_match: Optional[str] = Header(None)):
+    """Get interview details by ID (supports ETag revalidation)"""
     try:
         interview = db_service.get_interview_by_id(interview_id)
         if not interview:
@@ -287,21 +465,142 @@ async def get_interview_details(interview_id: str):
         
         questions = db_service.get_questions(interview_id)
         
-        return {
+        payload = jsonable_encoder({
             "interview": interview,
             "questions": questions
-        }
+        })
+        etag = compute_etag(payload)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        
+        return JSONResponse(content=payload, headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete(f"{settings.API_PREFIX}/interviews/{{interview_id}}")
+async def delete_interview(interview_id: str):
+    """Delete an interview and its questions"""
+    deleted = db_service.delete_interview(interview_id)
+    if deleted is None:
+        raise HTTPException(status_code=500, detail="Failed to delete interview")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    
+    return {"interview_id": interview_id, "success": True}
+
+@app.get(f"{settings.API_PREFIX}/cache/stats")
+async def get_cache_stats():
+    """Get read-through cache hit ratio and latency figures"""
+    return db_service.cache.stats()
+
+@app.get(f"{settings.API_PREFIX}/admission/stats")
+async def get_admission_stats():
+    """Get in-flight and queued LLM-backed requests and admission decisions"""
+    return admission.stats()
+
+@app.get(f"{settings.API_PREFIX}/clients/stats")
+async def get_client_stats():
+    """Get OpenAI connection pool reuse figures"""
+    return client_stats()
+
+# Analytics endpoints
+@app.get(f"{settings.API_PREFIX}/analytics/scores", response_model=ScoreAnalytics)
+async def get_score_analytics(job_title: Optional[str] = None, interview_type: Optional[str] = None):
+    """Get score distributions and per-question averages by job title and interview type"""
+    try:
+        cohorts = [
+            cohort for cohort in db_service.get_score_analytics()
+            if (job_title is None or cohort["job_title"] == job_title)
+            and (interview_type is None or cohort["interview_type"] == interview_type)
+        ]
+        return ScoreAnalytics(histogram_edges=HISTOGRAM_EDGES.tolist(), cohorts=cohorts)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get(f"{settings.API_PREFIX}/analytics/rank/{{interview_id}}", response_model=CandidateRank)
+async def get_candidate_rank(interview_id: str):
+    """Get the percentile rank of an interview within its job title / type cohort"""
+    try:
+        interview = db_service.get_interview_by_id(interview_id)
+        if not interview:
+            raise HTTPException(status_code=404, detail="Interview not found")
+        if interview.get("final_score") is None:
+            raise HTTPException(status_code=400, detail="Interview has no final score")
+        
+        rank = db_service.get_percentile_rank(
+            interview["job_title"],
+            interview["interview_type"],
+            interview["final_score"],
+        )
+        if rank is None:
+            raise HTTPException(status_code=500, detail="Failed to rank interview")
+        
+        return CandidateRank(
+            interview_id=interview_id,
+            job_title=interview["job_title"],
+            interview_type=interview["interview_type"],
+            final_score=interview["final_score"],
+            **rank
+        )
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Search endpoint
+@app.get(f"{settings.API_PREFIX}/search", response_model=SearchResponse)
+async def search_answers(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """Full-text search over stored questions, answers and feedback"""
+    try:
+        results = db_service.search_questions(q, limit=limit, offset=offset)
+        return SearchResponse(query=q, results=results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Export endpoints
+@app.get(f"{settings.API_PREFIX}/export/interviews")
+async def export_interviews(
+    export_format: str = Query("ndjson", alias="format"),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    job_title: Optional[str] = None,
+):
+    """Stream interviews joined with their questions as NDJSON, CSV or Parquet"""
+    try:
+        media_type, extension, _ = get_encoder(export_format)
+    except ExportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not db_service.client:
+        raise HTTPException(status_code=503, detail="Database not connected")
+    
+    return StreamingResponse(
+        stream_export(
+            db_service,
+            export_format,
+            since=since,
+            until=until,
+            job_title=job_title,
+            page_size=settings.EXPORT_PAGE_SIZE,
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=interviews.{extension}"}
+    )
+
 # Audio endpoints
 @app.post(f"{settings.API_PREFIX}/audio/tts")
 async def text_to_speech(request: TTSRequest):
     """Convert text to speech"""
     try:
-        audio_content = openai_service.text_to_speech(request.text)
+        audio_content = await run_in_threadpool(openai_service.text_to_speech, request.text)
         return StreamingResponse(
             io.BytesIO(audio_content),
             media_type="audio/mpeg",
@@ -316,18 +615,43 @@ async def speech_to_text(audio: UploadFile = File(...)):
     try:
         # Read audio file
         audio_content = await audio.read()
+        metrics.upload_size.observe(len(audio_content), ("audio",))
+        
+        # Trim silence and compress PCM WAV uploads; other formats pass through
+        if settings.STT_PREPROCESS:
+            with tracing.span("stt.prepare"):
+                prepared = prepare_upload(audio_content)
+        else:
+            prepared = passthrough(audio_content)
+        
+        if prepared.input_seconds and not prepared.output_seconds:
+            # Nothing but silence: skip the API call
+            return AudioResponse(success=True, data="")
         
         # Create file-like object
-        audio_file = io.BytesIO(audio_content)
-        audio_file.name = "audio.wav"
+        audio_file = io.BytesIO(prepared.data)
+        audio_file.name = prepared.filename
         
         # Transcribe
-        transcription = openai_service.speech_to_text(audio_file)
+        started = time.perf_counter()
+        transcription = await run_in_threadpool(openai_service.speech_to_text, audio_file)
+        speech_stats.record(prepared, time.perf_counter() - started)
+        metrics.audio_seconds.inc(("stt",), prepared.input_seconds or audio_duration(audio_content) or 0.0)
         
         return AudioResponse(success=True, data=transcription)
     except Exception as e:
         return AudioResponse(success=False, error=str(e))
 
+@app.websocket(f"{settings.API_PREFIX}/audio/stt/stream")
+async def speech_to_text_stream(websocket: WebSocket):
+    """Transcribe audio while it is being recorded"""
+    await serve_stream(websocket)
+
+@app.get(f"{settings.API_PREFIX}/audio/stats")
+async def get_audio_stats():
+    """Get STT upload size and latency per answer, before and after preprocessing"""
+    return speech_stats.summary()
+
 @app.get(f"{settings.API_PREFIX}/config")
 async def get_config():
     """Get frontend configuration"""
@@ -345,6 +669,8 @@ async def get_database_schema():
     """Get database schema SQL"""
     return {"schema": db_service.get_table_schema()}
 
+startup.mark("imported")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
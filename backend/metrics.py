@@ -0,0 +1,306 @@
+"""Prometheus text-format metrics for the API.
+
+Counters and histograms are sharded per thread: each thread updates its own
+dict without taking a lock, and shards are only summed when ``/metrics`` is
+scraped. When a thread exits (the threadpool retires idle workers), its shard
+is folded into a retired total, so the number of shards stays bounded. Gauges that mirror existing state (active sessions, cache and
+connection pool figures) are computed by callbacks at scrape time.
+"""
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7, 2.5e7)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Shard:
+    """One thread's values; a weak reference to it tells when the thread is gone"""
+    __slots__ = ("values", "__weakref__")
+
+    def __init__(self):
+        self.values: dict = {}
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: Dict[int, dict] = {}
+        self._retired: dict = {}
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard.values
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards[id(shard.values)] = shard.values
+            # Runs when the thread's locals are cleared, i.e. when it exits
+            weakref.finalize(shard, self._retire, shard.values)
+            return shard.values
+
+    def _retire(self, values: dict):
+        with self._shards_lock:
+            self._shards.pop(id(values), None)
+            self._merge(self._retired, values)
+
+    def _snapshot(self) -> List[dict]:
+        with self._shards_lock:
+            return [dict(self._retired)] + [dict(shard) for shard in self._shards.values()]
+
+    def _merge(self, totals: dict, shard: dict):
+        raise NotImplementedError
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return sum(shard.get(labels, 0.0) for shard in self._snapshot())
+
+    def _merge(self, totals: dict, shard: dict):
+        for labels, value in shard.items():
+            totals[labels] = totals.get(labels, 0.0) + value
+
+    def _totals(self) -> Dict[Labels, float]:
+        totals: Dict[Labels, float] = {}
+        for shard in self._snapshot():
+            self._merge(totals, shard)
+        return totals
+
+    def _samples(self) -> Iterator[str]:
+        for labels, value in sorted(self._totals().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Sharded up/down gauge, or a callback evaluated at scrape time"""
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], Dict[Labels, float]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def dec(self, labels: Labels = (), amount: float = 1.0):
+        self.inc(labels, -amount)
+
+    def _totals(self) -> Dict[Labels, float]:
+        if self.function is None:
+            return super()._totals()
+        try:
+            return self.function()
+        except Exception as e:
+            print(f"Error collecting {self.name}: {e}")
+            return {}
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # Per-bucket counts (last one is +Inf), sum, count
+            state = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def _merge(self, totals: dict, shard: dict):
+        for labels, (counts, total, count) in shard.items():
+            merged = totals.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+            merged[2] += count
+
+    def _totals(self) -> Dict[Labels, list]:
+        totals: Dict[Labels, list] = {}
+        for shard in self._snapshot():
+            self._merge(totals, shard)
+        return totals
+
+    def count(self, labels: Labels = ()) -> int:
+        state = self._totals().get(labels)
+        return state[2] if state else 0
+
+    def _samples(self) -> Iterator[str]:
+        for labels, (counts, total, count) in sorted(self._totals().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), function=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+)
+
+# OpenAI
+openai_request_duration = registry.histogram(
+    "openai_request_duration_seconds", "OpenAI call latency by task and model", ("task", "model")
+)
+openai_tokens = registry.counter(
+    "openai_tokens_total", "OpenAI tokens used by task, model and kind", ("task", "model", "kind")
+)
+openai_errors = registry.counter(
+    "openai_errors_total", "Failed OpenAI calls by task and model", ("task", "model")
+)
+
+# Storage
+database_query_duration = registry.histogram(
+    "database_query_duration_seconds", "Storage query latency by backend and operation", ("backend", "operation")
+)
+database_errors = registry.counter(
+    "database_errors_total", "Failed storage queries by backend and operation", ("backend", "operation")
+)
+
+# Admission control
+admission_decisions = registry.counter(
+    "admission_decisions_total",
+    "LLM-backed requests by priority and outcome (admitted, shed, queue_full, timeout)",
+    ("priority", "outcome"),
+)
+admission_queue_duration = registry.histogram(
+    "admission_queue_seconds", "Time admitted requests waited for a slot", ("priority",)
+)
+
+# Idempotency keys
+idempotent_requests = registry.counter(
+    "idempotent_requests_total",
+    "Keyed requests by outcome: executed, replayed from the store or coalesced onto a running attempt",
+    ("endpoint", "outcome"),
+)
+
+# Uploads and audio
+upload_size = registry.histogram(
+    "upload_size_bytes", "Uploaded file sizes by kind", ("kind",), buckets=SIZE_BUCKETS
+)
+audio_seconds = registry.counter(
+    "audio_seconds_total", "Seconds of audio synthesized (tts) or transcribed (stt)", ("direction",)
+)
+stt_finalize_duration = registry.histogram(
+    "stt_stream_finalize_seconds", "Time from end of a streamed answer to its full transcript"
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, labels: Labels = (), errors: Optional[Counter] = None):
+    """Observe the duration of a block, counting it in `errors` if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if errors is not None:
+            errors.inc(labels)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - started, labels)
+
+
+def record_usage(task: str, model: str, usage) -> None:
+    """Count prompt and completion tokens from an OpenAI usage object"""
+    if usage is None:
+        return
+    openai_tokens.inc((task, model, "prompt"), getattr(usage, "prompt_tokens", 0) or 0)
+    openai_tokens.inc((task, model, "completion"), getattr(usage, "completion_tokens", 0) or 0)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 # Interview Setup Models
@@ -19,6 +19,7 @@ class InterviewSession(BaseModel):
     jd: str
     start_time: datetime
     current_question_num: int = 1
+    current_question: Optional[str] = None
     total_questions: int = 10
 
 # Question Models
@@ -82,6 +83,54 @@ class QuestionDB(BaseModel):
     feedback: str
     created_at: Optional[str] = None
 
+# Analytics Models
+class QuestionScoreAverage(BaseModel):
+    question_number: int
+    answer_count: int
+    average_score: float
+
+class CohortScoreSummary(BaseModel):
+    job_title: str
+    interview_type: str
+    interview_count: int
+    mean_score: float
+    std_score: float
+    min_score: float
+    max_score: float
+    histogram: List[int]  # counts per one-point bucket over 0-10
+    quantiles: Dict[str, float]
+    question_averages: List[QuestionScoreAverage]
+
+class ScoreAnalytics(BaseModel):
+    histogram_edges: List[float]
+    cohorts: List[CohortScoreSummary]
+
+class CandidateRank(BaseModel):
+    interview_id: str
+    job_title: str
+    interview_type: str
+    final_score: float
+    cohort_size: int
+    percentile: float
+
+# Search Models
+class SearchResult(BaseModel):
+    question_id: str
+    interview_id: str
+    candidate_name: str
+    job_title: str
+    interview_type: str
+    question_number: Optional[int] = None
+    score: Optional[float] = None
+    rank: float
+    question_snippet: str  # HTML-escaped, matches wrapped in <mark></mark>
+    answer_snippet: str
+    feedback_snippet: str
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+
 # Audio Models
 class TTSRequest(BaseModel):
     text: str
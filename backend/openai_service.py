@@ -1,31 +1,36 @@
 import json
-from typing import List, Optional
-from openai import OpenAI
+from typing import Iterator, List, Optional
 
+from backend import cassette
+from backend.audio_processing import audio_duration
 from backend.config import settings
-
-class OpenAIService:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+from backend.http_clients import get_openai_client
+from backend.metrics import (
+    audio_seconds,
+    openai_errors,
+    openai_request_duration,
+    record_usage,
+    timed,
+)
+from backend.tracing import span
+
+def build_question_prompt(
+    resume: str,
+    jd: str,
+    interview_type: str,
+    question_num: int,
+    conversation_history: List[dict]
+) -> str:
+    """Prompt for the next interview question"""
+    # Build conversation context
+    context = ""
+    if conversation_history:
+        context = "\n\nPrevious Questions and Answers:\n" + "".join(
+            f"\nQ{i}: {qa['question']}\nA{i}: {qa['answer']}\n"
+            for i, qa in enumerate(conversation_history, 1)
+        )
     
-    def generate_question(
-        self,
-        resume: str,
-        jd: str,
-        interview_type: str,
-        question_num: int,
-        conversation_history: List[dict]
-    ) -> str:
-        """Generate interview question based on context"""
-        
-        # Build conversation context
-        context = ""
-        if conversation_history:
-            context = "\n\nPrevious Questions and Answers:\n"
-            for i, qa in enumerate(conversation_history, 1):
-                context += f"\nQ{i}: {qa['question']}\nA{i}: {qa['answer']}\n"
-        
-        prompt = f"""You are conducting a {interview_type} interview.
+    return f"""You are conducting a {interview_type} interview.
 
 Job Description:
 {jd}
@@ -47,31 +52,9 @@ Generate ONE relevant {interview_type} interview question that:
 
 Return ONLY the question text, nothing else."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are an expert technical and HR interviewer."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"Error generating question: {e}")
-            return "Tell me about your relevant experience for this role."
-    
-    def evaluate_answer(
-        self,
-        question: str,
-        answer: str,
-        jd: str,
-        interview_type: str
-    ) -> tuple[float, str]:
-        """Evaluate the candidate's answer"""
-        
-        prompt = f"""Evaluate this {interview_type} interview answer.
+def build_evaluation_prompt(question: str, answer: str, jd: str, interview_type: str) -> str:
+    """Prompt asking for a JSON score and feedback"""
+    return f"""Evaluate this {interview_type} interview answer.
 
 Job Requirements:
 {jd}
@@ -92,26 +75,88 @@ Consider:
 Return ONLY valid JSON in this exact format:
 {{"score": 8, "feedback": "Your feedback here"}}"""
 
-        try:
-            response = self.client.chat.completions.create(
+def extract_json(text: str) -> dict:
+    """Parse a JSON reply, unwrapping markdown code fences if present"""
+    text = text.strip()
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].strip()
+    return json.loads(text)
+
+class OpenAIService:
+    @property
+    def client(self):
+        """Shared pooled client, created on first use"""
+        cassette.from_settings()
+        return get_openai_client(settings.OPENAI_API_KEY, settings.OPENAI_BASE_URL)
+    
+    def warm_up(self, prime: bool = False):
+        """Open the pooled connection; optionally prime the completion path with a one-token request"""
+        self.client.models.list()
+        if prime:
+            self.client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are an expert interview evaluator. Return only valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
-                temperature=0.5
+                messages=[{"role": "user", "content": "Hi"}],
+                max_tokens=1,
             )
+    
+    def generate_question(
+        self,
+        resume: str,
+        jd: str,
+        interview_type: str,
+        question_num: int,
+        conversation_history: List[dict]
+    ) -> str:
+        """Generate interview question based on context"""
+        
+        prompt = build_question_prompt(resume, jd, interview_type, question_num, conversation_history)
+
+        labels = ("question", settings.OPENAI_MODEL)
+        try:
+            with span(f"openai.{labels[0]}", model=labels[1]), timed(openai_request_duration, labels, openai_errors):
+                response = self.client.chat.completions.create(
+                    model=settings.OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": "You are an expert technical and HR interviewer."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=300,
+                    temperature=0.7
+                )
+            record_usage(*labels, response.usage)
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            print(f"Error generating question: {e}")
+            return "Tell me about your relevant experience for this role."
+    
+    def evaluate_answer(
+        self,
+        question: str,
+        answer: str,
+        jd: str,
+        interview_type: str
+    ) -> tuple[float, str]:
+        """Evaluate the candidate's answer"""
+        
+        prompt = build_evaluation_prompt(question, answer, jd, interview_type)
+
+        labels = ("evaluation", settings.OPENAI_MODEL)
+        try:
+            with span(f"openai.{labels[0]}", model=labels[1]), timed(openai_request_duration, labels, openai_errors):
+                response = self.client.chat.completions.create(
+                    model=settings.OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": "You are an expert interview evaluator. Return only valid JSON."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=300,
+                    temperature=0.5
+                )
+            record_usage(*labels, response.usage)
             
-            result_text = response.choices[0].message.content.strip()
-            
-            # Clean up the response if it has markdown code blocks
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].strip()
-            
-            result = json.loads(result_text)
+            result = extract_json(response.choices[0].message.content)
             return float(result['score']), result['feedback']
         except Exception as e:
             print(f"Error evaluating answer: {e}")
@@ -120,23 +165,40 @@ Return ONLY valid JSON in this exact format:
     def text_to_speech(self, text: str) -> bytes:
         """Convert text to speech using OpenAI TTS"""
         try:
-            response = self.client.audio.speech.create(
-                model=settings.OPENAI_TTS_MODEL,
-                voice="alloy",
-                input=text
-            )
+            labels = ("tts", settings.OPENAI_TTS_MODEL)
+            with span("openai.tts", model=labels[1]), timed(openai_request_duration, labels, openai_errors):
+                response = self.client.audio.speech.create(
+                    model=settings.OPENAI_TTS_MODEL,
+                    voice="alloy",
+                    input=text
+                )
+            audio_seconds.inc(("tts",), audio_duration(response.content) or 0.0)
             return response.content
         except Exception as e:
             print(f"Error in text-to-speech: {e}")
             raise
     
-    def speech_to_text(self, audio_file) -> str:
-        """Convert speech to text using OpenAI Whisper"""
+    def stream_speech(self, text: str, chunk_size: int = 16 * 1024) -> Iterator[bytes]:
+        """Yield text-to-speech audio in chunks as it arrives"""
+        labels = ("tts", settings.OPENAI_TTS_MODEL)
+        with timed(openai_request_duration, labels, openai_errors):
+            with self.client.audio.speech.with_streaming_response.create(
+                model=settings.OPENAI_TTS_MODEL,
+                voice="alloy",
+                input=text
+            ) as response:
+                yield from response.iter_bytes(chunk_size)
+    
+    def speech_to_text(self, audio_file, prompt: Optional[str] = None) -> str:
+        """Convert speech to text using OpenAI Whisper; prompt carries preceding text for continuity"""
         try:
-            response = self.client.audio.transcriptions.create(
-                model=settings.OPENAI_STT_MODEL,
-                file=audio_file
-            )
+            labels = ("stt", settings.OPENAI_STT_MODEL)
+            with span("openai.stt", model=labels[1]), timed(openai_request_duration, labels, openai_errors):
+                response = self.client.audio.transcriptions.create(
+                    model=settings.OPENAI_STT_MODEL,
+                    file=audio_file,
+                    **({"prompt": prompt} if prompt else {})
+                )
             return response.text.strip()
         except Exception as e:
             print(f"Error in speech-to-text: {e}")
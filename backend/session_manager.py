@@ -1,7 +1,9 @@
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
+from backend.config import settings
+from backend.idempotency import IdempotencyStore
 from backend.models import InterviewSession, QAPair
 
 class SessionManager:
@@ -11,6 +13,10 @@ class SessionManager:
         self.sessions: Dict[str, InterviewSession] = {}
         self.conversation_history: Dict[str, List[dict]] = {}
         self.qa_pairs: Dict[str, List[QAPair]] = {}
+        # Kept past delete_session, so a retried save still gets its interview_id
+        self.idempotency = IdempotencyStore(settings.IDEMPOTENCY_MAX_KEYS, settings.IDEMPOTENCY_TTL_SECONDS)
+        # Called with the session id after a session is deleted, possibly from a worker thread
+        self.delete_listeners: List[Callable[[str], None]] = []
     
     def create_session(
         self,
@@ -70,6 +76,12 @@ class SessionManager:
         if session_id in self.qa_pairs:
             self.qa_pairs[session_id].append(qa_pair)
     
+    def record_answer(self, session_id: str, qa_pair: QAPair):
+        """Store an evaluated answer and advance to the next question"""
+        self.add_qa_pair(session_id, qa_pair)
+        self.add_conversation(session_id, qa_pair.question, qa_pair.answer)
+        self.update_session(session_id, current_question_num=qa_pair.number + 1)
+    
     def get_qa_pairs(self, session_id: str) -> List[QAPair]:
         """Get all Q&A pairs for session"""
         return self.qa_pairs.get(session_id, [])
@@ -79,6 +91,8 @@ class SessionManager:
         self.sessions.pop(session_id, None)
         self.conversation_history.pop(session_id, None)
         self.qa_pairs.pop(session_id, None)
+        for listener in self.delete_listeners:
+            listener(session_id)
 
 # Singleton instance
 session_manager = SessionManager()
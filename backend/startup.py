@@ -0,0 +1,106 @@
+"""Cold-start bookkeeping, background warm-up and readiness.
+
+``backend.main`` imports this module first so ``IMPORT_STARTED`` marks the
+beginning of application import. Phases are recorded as seconds since then:
+``imported`` (module import finished), ``lifespan`` (server startup began)
+and ``ready`` (every required warm-up step succeeded).
+
+Warm-up runs on a daemon thread so the server answers liveness probes
+straight away. Each step creates a client or opens a connection ahead of the
+first request. ``/ready`` reports 503 until every required step has
+succeeded. Required steps that fail, for example because the database is
+briefly unreachable at boot, are retried with exponential backoff, so
+readiness recovers without a restart.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+IMPORT_STARTED = time.perf_counter()
+
+
+class WarmupStep(NamedTuple):
+    name: str
+    run: Callable[[], None]
+    # Optional steps only pre-establish connections; failing one does not block readiness
+    required: bool = True
+
+
+class Startup:
+    def __init__(self, started: float = IMPORT_STARTED, retry_delay: float = 1.0, max_retry_delay: float = 30.0):
+        self.started = started
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.phases: Dict[str, float] = {}
+        self.components: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def mark(self, phase: str):
+        with self._lock:
+            self.phases[phase] = round(time.perf_counter() - self.started, 4)
+
+    def warm_up(self, steps: List[WarmupStep], background: bool = True):
+        """Run warm-up steps, on a daemon thread unless background is False.
+
+        Only the background thread retries failed required steps.
+        """
+        with self._lock:
+            self.components = {
+                step.name: {"status": "pending", "required": step.required, "attempts": 0} for step in steps
+            }
+        if not background:
+            self._run(steps)
+            return
+        self._thread = threading.Thread(target=self._run, args=(steps, True), name="warm-up", daemon=True)
+        self._thread.start()
+
+    def _run(self, steps: List[WarmupStep], retry: bool = False):
+        failed = [step for step in steps if not self._attempt(step)]
+        self._done.set()
+        delay = self.retry_delay
+        while retry and any(step.required for step in failed):
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+            failed = [step for step in failed if step.required and not self._attempt(step)]
+        if self.ready:
+            self.mark("ready")
+
+    def _attempt(self, step: WarmupStep) -> bool:
+        started = time.perf_counter()
+        try:
+            step.run()
+            status = {"status": "ready"}
+        except Exception as e:
+            print(f"Warm-up of {step.name} failed: {e}")
+            status = {"status": "failed", "error": str(e)}
+        with self._lock:
+            component = self.components[step.name]
+            component.pop("error", None)
+            component.update(status, seconds=round(time.perf_counter() - started, 4))
+            component["attempts"] += 1
+        return status["status"] == "ready"
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        if not self._done.is_set():
+            return False
+        with self._lock:
+            return all(c["status"] == "ready" for c in self.components.values() if c["required"])
+
+    def status(self) -> dict:
+        ready = self.ready
+        with self._lock:
+            return {
+                "ready": ready,
+                "warming_up": self._thread is not None and not self._done.is_set(),
+                "phases": dict(self.phases),
+                "components": {name: dict(component) for name, component in self.components.items()},
+            }
+
+
+startup = Startup()
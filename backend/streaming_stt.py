@@ -0,0 +1,391 @@
+"""Speech-to-text over a live audio stream.
+
+Audio arrives in chunks while the candidate speaks. For PCM input (raw
+16-bit samples declared up front, or a WAV stream), an incremental energy VAD
+splits the stream into segments at pauses. Each segment is transcribed while
+later audio is still arriving. On stop, only the trailing segment remains, so
+the full transcript is ready shortly after the stop button.
+
+Compressed formats (WebM/Opus, Ogg, MP3, ...) cannot be segmented without a
+decoder. They are buffered and transcribed once on stop, under a filename that
+matches their sniffed format.
+
+    WS /api/v1/audio/stt/stream
+    -> {"type": "start", "format": "pcm16", "sample_rate": 16000}   optional for WAV/compressed
+    -> binary audio chunks
+    <- {"type": "partial", "text": "..."}                            as segments complete
+    -> {"type": "stop"}
+    <- {"type": "final", "text": "...", "segments": 3, "latency_ms": 420.0}
+
+Each Whisper call takes an admission slot. A stream whose ``start`` names a
+live ``session_id`` counts as a running interview; any other stream is
+admitted like a new one. If admission refuses a call, the server sends
+``{"type": "error", "detail": "...", "retry_after": 2}`` and closes with 1013.
+"""
+import asyncio
+import io
+import json
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional
+
+import numpy as np
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from backend import metrics
+from backend.admission import Priority, Rejected, admission
+from backend.audio_processing import (
+    FRAME_MS,
+    MIN_SPEECH_DB,
+    PAD_MS,
+    encode_flac,
+    encode_wav,
+    frame_energy_db,
+    parse_wav_header,
+    passthrough,
+    prepare_upload,
+    sniff_audio_format,
+    speech_threshold,
+)
+from backend.config import settings
+from backend.openai_service import openai_service
+from backend.session_manager import session_manager
+
+SEGMENT_PAUSE_MS = 600       # silence that closes a segment
+MAX_SEGMENT_SECONDS = 20     # longer speech is cut regardless
+NOISE_HISTORY_SECONDS = 10   # window for the adaptive noise floor
+MIN_HISTORY_SECONDS = 1      # until then only MIN_SPEECH_DB applies
+MAX_HEADER_BYTES = 4096      # WAV header must be complete by then
+MAX_PENDING_SEGMENTS = 8     # ingest waits once this many transcriptions are queued
+PROMPT_CHARS = 200           # preceding transcript passed to Whisper for continuity
+
+CLOSE_PROTOCOL_ERROR = 4400
+CLOSE_TOO_LARGE = 1009
+CLOSE_INTERNAL_ERROR = 1011
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class SegmentDetector:
+    """Incremental energy VAD that cuts int16 PCM into speech segments at pauses"""
+
+    def __init__(
+        self,
+        sample_rate: int,
+        pause_ms: int = SEGMENT_PAUSE_MS,
+        pad_ms: int = PAD_MS,
+        max_segment_seconds: float = MAX_SEGMENT_SECONDS,
+    ):
+        self.sample_rate = sample_rate
+        self.frame = max(int(sample_rate * FRAME_MS / 1000), 1)
+        self.pause_frames = max(pause_ms // FRAME_MS, 1)
+        self.pad_frames = pad_ms // FRAME_MS
+        self.max_frames = int(max_segment_seconds * 1000 / FRAME_MS)
+        self.min_history = int(MIN_HISTORY_SECONDS * 1000 / FRAME_MS)
+        self._history: Deque[float] = deque(maxlen=int(NOISE_HISTORY_SECONDS * 1000 / FRAME_MS))
+        self._samples = np.zeros(0, dtype=np.int16)
+        self._base = 0               # frame index of _samples[0]
+        self._frames = 0             # frames analysed so far
+        self._cut_end = 0            # end frame of the last segment
+        self._speech_start: Optional[int] = None
+        self._last_voiced = 0
+
+    def _threshold(self) -> float:
+        if len(self._history) < self.min_history:
+            return MIN_SPEECH_DB
+        return speech_threshold(np.fromiter(self._history, dtype=float))
+
+    def _cut(self, start: int, end: int) -> np.ndarray:
+        start = max(start, self._cut_end, self._base)
+        self._cut_end = end
+        return self._samples[(start - self._base) * self.frame:(end - self._base) * self.frame].copy()
+
+    def push(self, pcm: np.ndarray) -> List[np.ndarray]:
+        """Add samples; returns the segments completed by them"""
+        self._samples = np.concatenate((self._samples, pcm))
+        analysed = (self._frames - self._base) * self.frame
+        available = (len(self._samples) - analysed) // self.frame
+        if available <= 0:
+            return []
+
+        energy = frame_energy_db(self._samples[analysed:analysed + available * self.frame], self.sample_rate)
+        voiced = energy > self._threshold()  # noise floor from earlier audio only
+        self._history.extend(energy.tolist())
+
+        segments = []
+        for index, is_voiced in enumerate(voiced, self._frames):
+            if is_voiced:
+                if self._speech_start is None:
+                    self._speech_start = index
+                self._last_voiced = index
+            elif self._speech_start is not None and index - self._last_voiced >= self.pause_frames:
+                segments.append(self._cut(self._speech_start - self.pad_frames, self._last_voiced + 1 + self.pad_frames))
+                self._speech_start = None
+            if self._speech_start is not None and index + 1 - self._speech_start >= self.max_frames:
+                segments.append(self._cut(self._speech_start - self.pad_frames, index + 1))
+                self._speech_start = None
+        self._frames += available
+
+        # Keep only what a future segment can still include
+        keep_from = (self._speech_start if self._speech_start is not None else self._frames) - self.pad_frames
+        drop = keep_from - self._base
+        if drop > 0:
+            self._samples = self._samples[drop * self.frame:]
+            self._base += drop
+        return segments
+
+    def flush(self) -> Optional[np.ndarray]:
+        """The speech still open at the end of the stream, if any"""
+        if self._speech_start is None:
+            return None
+        start = max(self._speech_start - self.pad_frames, self._cut_end, self._base)
+        self._speech_start = None
+        return self._samples[(start - self._base) * self.frame:].copy()
+
+
+def transcribe_pcm(pcm: np.ndarray, sample_rate: int, prompt: str = "") -> str:
+    """Transcribe one speech segment, FLAC-encoded when soundfile is available"""
+    flac = encode_flac(pcm, sample_rate)
+    audio_file = io.BytesIO(flac if flac is not None else encode_wav(pcm, sample_rate))
+    audio_file.name = "audio.flac" if flac is not None else "audio.wav"
+    text = openai_service.speech_to_text(audio_file, prompt=prompt or None)
+    metrics.audio_seconds.inc(("stt",), len(pcm) / sample_rate)
+    return text
+
+
+def transcribe_recording(data: bytes) -> str:
+    """Transcribe a complete recording in any supported format"""
+    prepared = prepare_upload(data) if settings.STT_PREPROCESS else passthrough(data)
+    if prepared.input_seconds and not prepared.output_seconds:
+        return ""
+    audio_file = io.BytesIO(prepared.data)
+    audio_file.name = prepared.filename
+    text = openai_service.speech_to_text(audio_file)
+    if prepared.input_seconds:
+        metrics.audio_seconds.inc(("stt",), prepared.input_seconds)
+    return text
+
+
+class StreamingTranscriber:
+    """Transcribes one answer while it is being recorded"""
+
+    def __init__(
+        self,
+        audio_format: Optional[str] = None,
+        sample_rate: Optional[int] = None,
+        on_partial: Optional[Callable[[str], Awaitable[None]]] = None,
+        max_concurrency: Optional[int] = None,
+        priority: Priority = Priority.INTERVIEW,
+    ):
+        self.on_partial = on_partial
+        self.priority = priority
+        self.received = 0
+        self.segments = 0
+        self.audio_seconds = 0.0
+        self.streaming: Optional[bool] = None     # None until the format is known
+        self._header = bytearray()
+        self._buffered = bytearray()
+        self._remainder = b""
+        self._channels = 1
+        self._detector: Optional[SegmentDetector] = None
+        self._texts: List[Optional[str]] = []
+        self._tasks: List[asyncio.Task] = []
+        self._limit = asyncio.Semaphore(max_concurrency or settings.STT_STREAM_CONCURRENCY)
+        self._published = 0
+
+        if audio_format == "pcm16":
+            if not sample_rate:
+                raise ValueError("pcm16 audio needs a sample_rate")
+            self._start_pcm(int(sample_rate), 1)
+        elif audio_format not in (None, "auto"):
+            raise ValueError(f"Unsupported stream format '{audio_format}'. Send pcm16 or encoded audio")
+
+    @property
+    def audio_format(self) -> Optional[str]:
+        if self.streaming:
+            return "pcm16"
+        return sniff_audio_format(bytes(self._buffered[:16])) if self.streaming is False else None
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(text for text in self._texts if text)
+
+    def _start_pcm(self, sample_rate: int, channels: int):
+        self.streaming = True
+        self._channels = max(channels, 1)
+        self._detector = SegmentDetector(sample_rate)
+
+    def _sniff(self) -> Optional[bytes]:
+        """Settle the format from the first bytes; returns PCM bytes that follow a WAV header"""
+        if len(self._header) < 12:
+            return None
+        if sniff_audio_format(bytes(self._header), default="") == "wav":
+            try:
+                header = parse_wav_header(bytes(self._header))
+                complete = header is not None or len(self._header) >= MAX_HEADER_BYTES
+            except ValueError:
+                header, complete = None, True  # unusual layout; decoded in one piece at the end
+            if not complete:
+                return None
+            if header is not None and header[2] == 16:
+                sample_rate, channels, _, offset = header
+                self._start_pcm(sample_rate, channels)
+                return bytes(self._header[offset:])
+        # Compressed or unrecognised: transcribe once at the end
+        self.streaming = False
+        self._buffered = self._header
+        return None
+
+    def _decode(self, chunk: bytes) -> np.ndarray:
+        data = self._remainder + chunk
+        usable = len(data) - len(data) % (2 * self._channels)
+        self._remainder = data[usable:]
+        pcm = np.frombuffer(data[:usable], dtype="<i2")
+        if self._channels > 1:
+            pcm = pcm.reshape(-1, self._channels).mean(axis=1).astype(np.int16)
+        return pcm
+
+    async def feed(self, chunk: bytes):
+        """Add a chunk of audio; transcription of completed segments starts in the background"""
+        self.received += len(chunk)
+        if self.streaming is None:
+            self._header.extend(chunk)
+            pcm_bytes = self._sniff()
+            if not self.streaming:
+                return
+            chunk = pcm_bytes or b""
+        elif self.streaming is False:
+            self._buffered.extend(chunk)
+            return
+
+        for segment in self._detector.push(self._decode(chunk)):
+            await self._submit(segment)
+
+    async def _submit(self, pcm: np.ndarray):
+        pending = [task for task in self._tasks if not task.done()]
+        if len(pending) >= MAX_PENDING_SEGMENTS:
+            # The client is sending faster than segments can be transcribed
+            await asyncio.wait({pending[0]})
+
+        index = len(self._texts)
+        self._texts.append(None)
+        self.segments += 1
+        self.audio_seconds += len(pcm) / self._detector.sample_rate
+        prompt = self.transcript[-PROMPT_CHARS:]
+        self._tasks.append(asyncio.create_task(self._transcribe(index, pcm, prompt)))
+
+    async def _transcribe(self, index: int, pcm: np.ndarray, prompt: str):
+        async with self._limit, admission.admit(self.priority):
+            text = await run_in_threadpool(transcribe_pcm, pcm, self._detector.sample_rate, prompt)
+        self._texts[index] = text.strip()
+
+        # Publish the in-order prefix of finished segments
+        ready = 0
+        while ready < len(self._texts) and self._texts[ready] is not None:
+            ready += 1
+        if ready > self._published:
+            self._published = ready
+            if self.on_partial is not None:
+                await self.on_partial(" ".join(text for text in self._texts[:ready] if text))
+
+    async def finish(self) -> str:
+        """Transcribe whatever is left and return the full transcript"""
+        metrics.upload_size.observe(self.received, ("audio",))
+        with metrics.timed(metrics.stt_finalize_duration):
+            if self.streaming:
+                tail = self._detector.flush()
+                if tail is not None and len(tail):
+                    await self._submit(tail)
+                await asyncio.gather(*self._tasks)
+                return self.transcript
+
+            data = bytes(self._buffered or self._header)
+            if not data:
+                return ""
+            self.segments = 1
+            async with admission.admit(self.priority):
+                return (await run_in_threadpool(transcribe_recording, data)).strip()
+
+    def cancel(self):
+        for task in self._tasks:
+            if task.done() and not task.cancelled():
+                task.exception()  # a failed segment nobody will wait for
+            task.cancel()
+
+
+async def serve_stream(websocket: WebSocket):
+    """Run one streaming transcription over a WebSocket"""
+    await websocket.accept()
+
+    async def send_partial(text: str):
+        await websocket.send_json({"type": "partial", "text": text})
+
+    transcriber: Optional[StreamingTranscriber] = None
+    priority = Priority.NEW
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                if transcriber is None:
+                    transcriber = StreamingTranscriber(on_partial=send_partial, priority=priority)
+                if transcriber.received + len(message["bytes"]) > settings.MAX_UPLOAD_SIZE:
+                    await websocket.close(code=CLOSE_TOO_LARGE, reason="Audio stream too large")
+                    break
+                await transcriber.feed(message["bytes"])
+                continue
+
+            try:
+                command = json.loads(message.get("text") or "")
+                kind = command["type"]
+            except (ValueError, KeyError, TypeError):
+                await websocket.close(code=CLOSE_PROTOCOL_ERROR, reason="Invalid message")
+                break
+
+            if kind == "start" and transcriber is None:
+                if session_manager.get_session(str(command.get("session_id") or "")) is not None:
+                    priority = Priority.INTERVIEW
+                try:
+                    transcriber = StreamingTranscriber(
+                        command.get("format"), command.get("sample_rate"), on_partial=send_partial, priority=priority
+                    )
+                except ValueError as e:
+                    await websocket.close(code=CLOSE_PROTOCOL_ERROR, reason=str(e))
+                    break
+            elif kind == "stop":
+                stopped = time.perf_counter()
+                text = await transcriber.finish() if transcriber is not None else ""
+                latency = time.perf_counter() - stopped
+                await websocket.send_json({
+                    "type": "final",
+                    "text": text,
+                    "format": transcriber.audio_format if transcriber else None,
+                    "segments": transcriber.segments if transcriber else 0,
+                    "audio_seconds": round(transcriber.audio_seconds, 2) if transcriber else 0.0,
+                    "latency_ms": round(latency * 1000, 1),
+                })
+                await websocket.close()
+                transcriber = None
+                break
+            else:
+                await websocket.close(code=CLOSE_PROTOCOL_ERROR, reason=f"Unexpected message type '{kind}'")
+                break
+    except WebSocketDisconnect:
+        pass
+    except Rejected as e:
+        try:
+            await websocket.send_json({"type": "error", "detail": e.detail, "retry_after": e.retry_after})
+            await websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason=e.detail[:120])
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+    except Exception as e:
+        print(f"Error in streaming speech-to-text: {e}")
+        try:
+            await websocket.close(code=CLOSE_INTERNAL_ERROR, reason=str(e)[:120])
+        except RuntimeError:
+            pass
+    finally:
+        if transcriber is not None:
+            transcriber.cancel()
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.main
+from backend.admission import AdmissionController, Priority, Rejected
+from backend.config import settings
+
+
+def controller(**kwargs):
+    options = dict(max_in_flight=2, max_queue=2, max_queue_wait=1.0, reserved_slots=1, start_max_delay=0.5)
+    return AdmissionController(**{**options, **kwargs})
+
+
+def test_waiting_requests_get_freed_slots_in_order():
+    """Test that a released slot passes to the oldest queued request"""
+    admission = controller(max_in_flight=1, reserved_slots=0)
+    order = []
+
+    async def request(name, hold):
+        async with admission.admit(Priority.INTERVIEW):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    async def run():
+        await asyncio.gather(request("a", 0.05), request("b", 0), request("c", 0))
+
+    asyncio.run(run())
+    assert order == ["a", "b", "c"]
+    assert admission.in_flight == 0 and admission.queued == 0
+    assert admission.counts["interview_admitted"] == 3
+
+
+def test_new_interviews_are_shed_before_running_ones():
+    """Test that starts are refused while running interviews still get the reserved slot"""
+    admission = controller()
+
+    async def run():
+        await admission.acquire(Priority.INTERVIEW)
+        with pytest.raises(Rejected) as error:
+            await admission.acquire(Priority.NEW)
+        assert error.value.status_code == 429 and error.value.retry_after >= 1
+        await admission.acquire(Priority.INTERVIEW)
+
+    asyncio.run(run())
+    assert admission.in_flight == 2
+
+
+def test_queue_timeout_and_queue_full():
+    """Test 503 when no slot frees up in time or the queue is full"""
+    admission = controller(max_in_flight=1, reserved_slots=0, max_queue=1, max_queue_wait=0.05)
+
+    async def run():
+        await admission.acquire(Priority.INTERVIEW)
+        waiting = asyncio.ensure_future(admission.acquire(Priority.INTERVIEW))
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected) as full:
+            await admission.acquire(Priority.INTERVIEW)
+        with pytest.raises(Rejected) as timeout:
+            await waiting
+        return full.value, timeout.value
+
+    full, timeout = asyncio.run(run())
+    assert full.status_code == timeout.status_code == 503
+    assert admission.queued == 0 and admission.in_flight == 1
+
+
+def test_queueing_delay_fades_when_idle():
+    """Test that starts are refused after queueing builds up, and admitted once it fades"""
+    admission = controller()
+    admission._queue_delay = 2.0
+    admission._delay_updated = time.monotonic()
+    with pytest.raises(Rejected):
+        asyncio.run(admission.acquire(Priority.NEW))
+
+    admission._delay_updated -= 60
+    asyncio.run(admission.acquire(Priority.NEW))
+    assert admission.in_flight == 1
+
+
+def test_rejected_start_returns_retry_after(monkeypatch):
+    """Test the 429 response and stats endpoint while the start slots are taken"""
+    admission = controller(max_in_flight=1, reserved_slots=0)
+    admission.in_flight = 1
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+    monkeypatch.setattr(backend.main, "admission", admission)
+    with TestClient(backend.main.app) as client:
+        response = client.post("/api/v1/interview/start", json={
+            "candidate_name": "Test User", "job_title": "Developer", "interview_type": "technical",
+            "resume_text": "resume", "jd_text": "jd",
+        })
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert client.get("/api/v1/admission/stats").json()["new_shed"] == 1
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from backend.analytics import (
+    CohortIndex,
+    histogram_quantiles,
+    percentile_rank,
+    summarize_aggregates,
+)
+
+
+def test_percentile_rank_counts_ties_as_half():
+    """Test mid-rank percentile calculation"""
+    assert percentile_rank(below=2, equal=1, total=5) == 50.0
+    assert percentile_rank(below=0, equal=0, total=0) == 0.0
+
+
+def test_cohort_index_rank_and_summary():
+    """Test ranking and summaries from the in-memory index"""
+    index = CohortIndex()
+    index.load(
+        [("Developer", "technical", s) for s in [4.0, 6.0, 8.0, 9.0]],
+        [("Developer", "technical", 1, 6.0), ("Developer", "technical", 1, 8.0)],
+    )
+    index.add("Developer", "technical", 7.0, [(2, 5.0)])
+
+    rank = index.rank("Developer", "technical", 8.0)
+    assert rank["cohort_size"] == 5
+    assert rank["percentile"] == pytest.approx(70.0)
+
+    [summary] = index.summaries()
+    assert summary["interview_count"] == 5
+    assert summary["mean_score"] == pytest.approx(6.8)
+    assert sum(summary["histogram"]) == 5
+    assert summary["question_averages"] == [
+        {"question_number": 1, "answer_count": 2, "average_score": 7.0},
+        {"question_number": 2, "answer_count": 1, "average_score": 5.0},
+    ]
+
+
+def test_cohort_index_remove():
+    """Test that deleted interviews leave the index"""
+    index = CohortIndex()
+    index.add("Developer", "hr", 5.0, [(1, 5.0)])
+    index.add("Developer", "hr", 9.0, [(1, 9.0)])
+    index.remove("Developer", "hr", 5.0, [(1, 5.0)])
+
+    [summary] = index.summaries()
+    assert summary["interview_count"] == 1
+    assert summary["question_averages"][0]["average_score"] == 9.0
+
+
+def test_summarize_aggregates():
+    """Test summaries built from trigger-maintained aggregate rows"""
+    histogram = [0, 0, 0, 0, 0, 1, 0, 1, 0, 0]
+    summary = summarize_aggregates(
+        {
+            "job_title": "Developer",
+            "interview_type": "technical",
+            "interview_count": 2,
+            "score_sum": 12.0,
+            "score_sq_sum": 74.0,
+            "min_score": 5.0,
+            "max_score": 7.0,
+            "histogram": histogram,
+        },
+        [{"question_number": 1, "answer_count": 2, "score_sum": 12.0}],
+    )
+    assert summary["mean_score"] == 6.0
+    assert summary["std_score"] == pytest.approx(1.0)
+    assert summary["question_averages"][0]["average_score"] == 6.0
+    assert 5.0 <= histogram_quantiles(histogram)["p50"] <= 7.0
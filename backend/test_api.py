@@ -39,3 +39,94 @@ def test_upload_txt_invalid_file():
     response = client.post("/api/v1/upload/txt", files=files)
     # Should return 400 for invalid file type
     assert response.status_code == 400
+
+
+def test_interview_details_etag(monkeypatch):
+    """Test ETag / If-None-Match revalidation on interview details"""
+    from backend.main import db_service
+
+    monkeypatch.setattr(db_service, "get_interview_by_id", lambda interview_id: {"id": interview_id, "final_score": 8.0})
+    monkeypatch.setattr(db_service, "get_questions", lambda interview_id: [{"question_number": 1, "score": 8.0}])
+
+    response = client.get("/api/v1/interviews/abc")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    revalidated = client.get("/api/v1/interviews/abc", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+    stale = client.get("/api/v1/interviews/abc", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+
+
+def test_delete_missing_interview(monkeypatch):
+    """Test that deleting an interview that does not exist returns 404"""
+    from backend.main import db_service
+
+    monkeypatch.setattr(db_service, "delete_interview", lambda interview_id: False)
+    assert client.delete("/api/v1/interviews/missing").status_code == 404
+
+    monkeypatch.setattr(db_service, "delete_interview", lambda interview_id: None)
+    assert client.delete("/api/v1/interviews/missing").status_code == 500
+
+
+def test_cache_stats():
+    """Test cache statistics endpoint"""
+    response = client.get("/api/v1/cache/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert "hit_ratio" in data
+    assert "avg_load_ms" in data
+
+
+def test_client_stats():
+    """Test OpenAI connection pool statistics endpoint"""
+    response = client.get("/api/v1/clients/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert "reuse_ratio" in data
+    assert "http2_enabled" in data
+
+
+def test_metrics_endpoint():
+    """Test Prometheus metrics labelled by route template"""
+    client.get("/api/v1/interviews/some-id")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/interviews/{interview_id}"}' in body
+    assert "interview_active_sessions" in body
+    assert "http_requests_in_flight" in body
+
+
+def test_server_timing_header():
+    """Test that responses carry per-stage Server-Timing"""
+    response = client.get("/api/v1/interviews")
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert "total;dur=" in timing
+
+
+def test_score_analytics_filters_cohorts(monkeypatch):
+    """Test analytics endpoint filtering by job title"""
+    from backend.main import db_service
+    from backend.analytics import CohortIndex
+
+    index = CohortIndex()
+    index.add("Developer", "technical", 8.0, [(1, 8.0)])
+    index.add("Designer", "hr", 6.0, [(1, 6.0)])
+    monkeypatch.setattr(db_service, "get_score_analytics", index.summaries)
+
+    response = client.get("/api/v1/analytics/scores", params={"job_title": "Designer"})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["histogram_edges"]) == 11
+    assert [c["job_title"] for c in data["cohorts"]] == ["Designer"]
+
+
+def test_export_rejects_unknown_format():
+    """Test export format validation"""
+    response = client.get("/api/v1/export/interviews", params={"format": "xml"})
+    assert response.status_code == 400
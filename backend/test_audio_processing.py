@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from backend.audio_processing import (
+    decode_wav,
+    encode_wav,
+    parse_wav_header,
+    prepare_upload,
+    sniff_audio_format,
+    speech_mask,
+    trim_silence,
+)
+
+RATE = 16000
+
+
+def tone(seconds, amplitude=8000):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+
+
+def silence(seconds):
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 3, int(seconds * RATE)).astype(np.int16)
+
+
+def test_trim_silence_drops_edges_and_long_pauses():
+    """Test leading/trailing silence removal and pause shortening"""
+    pcm = np.concatenate([silence(2), tone(1), silence(3), tone(1), silence(2)])
+    trimmed = trim_silence(pcm, RATE)
+
+    seconds = len(trimmed) / RATE
+    # Two seconds of speech, a pause capped at 0.7s and a little padding
+    assert 2.5 < seconds < 3.5
+
+
+def test_short_pauses_are_kept():
+    """Test that natural pauses survive trimming"""
+    pcm = np.concatenate([tone(1), silence(0.4), tone(1)])
+    assert len(trim_silence(pcm, RATE)) == len(pcm)
+
+
+def test_continuous_speech_at_varying_levels_is_kept():
+    """Test that quieter speech is not taken for the noise floor when the clip has no silence"""
+    pcm = np.concatenate([tone(1, 1000), tone(0.5, 8000), tone(1.5, 1000), tone(1, 3000), tone(1, 1000)])
+    assert len(trim_silence(pcm, RATE)) == len(pcm)
+
+
+def test_trim_silence_uses_a_given_threshold():
+    """Test that a threshold measured elsewhere replaces the clip's own estimate"""
+    quiet_speech = tone(2, 1000)
+    assert len(trim_silence(quiet_speech, RATE, threshold=-60)) == len(quiet_speech)
+    assert len(trim_silence(quiet_speech, RATE, threshold=-20)) == 0
+
+
+def test_all_silence_produces_no_audio():
+    """Test that silent recordings are dropped entirely"""
+    assert not speech_mask(silence(2), RATE).any()
+    assert len(trim_silence(silence(2), RATE)) == 0
+
+
+def test_wav_round_trip():
+    """Test PCM WAV encode/decode"""
+    pcm = tone(0.5)
+    decoded, rate = decode_wav(encode_wav(pcm, RATE))
+    assert rate == RATE
+    assert np.array_equal(decoded, pcm)
+    assert decode_wav(b"not a wav file") is None
+
+
+def test_prepare_upload_compresses_wav():
+    """Test that WAV uploads shrink and other formats pass through"""
+    data = encode_wav(np.concatenate([silence(3), tone(2), silence(3)]), RATE)
+    prepared = prepare_upload(data)
+    assert prepared.output_bytes < prepared.input_bytes / 2
+    assert prepared.output_seconds < prepared.input_seconds
+
+    webm = b"\x1a\x45\xdf\xa3" + b"\x00" * 100
+    passthrough = prepare_upload(webm)
+    assert passthrough.data == webm
+    assert passthrough.filename == "audio.webm"
+
+
+@pytest.mark.parametrize("header, extension", [
+    (b"RIFF\x00\x00\x00\x00WAVEfmt ", "wav"),
+    (b"OggS\x00\x02", "ogg"),
+    (b"fLaC\x00\x00", "flac"),
+    (b"ID3\x04\x00", "mp3"),
+    (b"\xff\xfb\x90\x64", "mp3"),
+    (b"\x00\x00\x00\x20ftypM4A ", "m4a"),
+])
+def test_sniff_audio_format(header, extension):
+    """Test format detection from leading bytes"""
+    assert sniff_audio_format(header) == extension
+
+
+def test_parse_wav_header_with_placeholder_sizes():
+    """Test that streamed WAV headers parse before the data is complete"""
+    header = bytearray(encode_wav(tone(0.1), RATE)[:44])
+    header[4:8] = header[40:44] = b"\xff\xff\xff\xff"
+    assert parse_wav_header(bytes(header)) == (RATE, 1, 16, 44)
+    assert parse_wav_header(bytes(header[:30])) is None
@@ -0,0 +1,80 @@
+import pytest
+from backend.cache import TTLCache
+
+
+def test_get_or_load_caches_value():
+    """Test that a second lookup is served from the cache"""
+    cache = TTLCache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ["row"]
+
+    assert cache.get_or_load("key", loader) == ["row"]
+    assert cache.get_or_load("key", loader) == ["row"]
+    assert len(calls) == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_entry_expires_after_ttl():
+    """Test per-key TTL expiry"""
+    cache = TTLCache()
+    cache.set("short", 1, ttl=0)
+    cache.set("long", 2, ttl=60)
+
+    assert cache.get("short") == (False, None)
+    assert cache.get("long") == (True, 2)
+
+
+def test_none_is_not_cached():
+    """Test that missing rows are not cached"""
+    cache = TTLCache()
+    cache.get_or_load("missing", lambda: None)
+    assert cache.get("missing") == (False, None)
+
+
+def test_loader_errors_are_not_cached():
+    """Test that failed loads propagate and leave the cache empty"""
+    cache = TTLCache()
+
+    def failing_loader():
+        raise RuntimeError("database unavailable")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("key", failing_loader)
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_and_lru_eviction():
+    """Test explicit invalidation and LRU bound"""
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+
+    cache.invalidate("a")
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_load_overlapping_an_invalidation_is_not_cached():
+    """Test that a value read before a concurrent write is returned but not stored"""
+    cache = TTLCache()
+
+    def stale_loader():
+        cache.invalidate("questions")  # a save lands while the load is running
+        return []
+
+    assert cache.get_or_load("questions", stale_loader) == []
+    assert cache.get("questions") == (False, None)
+    assert cache.get_or_load("questions", lambda: ["q1"]) == ["q1"]
+    assert cache.get("questions") == (True, ["q1"])
@@ -0,0 +1,74 @@
+import httpx
+import pytest
+from backend.cassette import Cassette, CassetteMissError, load_entries, summarize
+
+
+def upstream(calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"echo": request.url.path, "n": len(calls)})
+    return httpx.MockTransport(handler)
+
+
+def test_record_then_replay(tmp_path):
+    """Test that recorded responses are served back without touching the network"""
+    path = str(tmp_path / "cassette.jsonl.gz")
+    calls = []
+
+    recorder = Cassette(path, "record")
+    with httpx.Client(transport=recorder.wrap(upstream(calls))) as client:
+        first = client.post("https://api.example.com/v1/chat", json={"q": 1}).json()
+        second = client.post("https://api.example.com/v1/chat", json={"q": 2}).json()
+    assert recorder.recorded == 2
+    assert len(load_entries(path)) == 2
+
+    player = Cassette(path, "replay", latency_scale=0)
+    with httpx.Client(transport=player.wrap(upstream(calls))) as client:
+        # Exact body matches are served regardless of order
+        assert client.post("https://api.example.com/v1/chat", json={"q": 2}).json() == second
+        assert client.post("https://api.example.com/v1/chat", json={"q": 1}).json() == first
+    assert len(calls) == 2
+    assert player.replayed == 2
+
+
+def test_replay_ignores_multipart_boundary(tmp_path):
+    """Test that uploads match even though each run uses a new boundary"""
+    path = str(tmp_path / "cassette.jsonl.gz")
+    files = {"file": ("audio.wav", b"RIFF....", "audio/wav")}
+
+    with httpx.Client(transport=Cassette(path, "record").wrap(upstream([]))) as client:
+        recorded = client.post("https://api.example.com/v1/audio", files=files).json()
+
+    with httpx.Client(transport=Cassette(path, "replay", latency_scale=0).wrap(upstream([]))) as client:
+        assert client.post("https://api.example.com/v1/audio", files=files).json() == recorded
+
+
+def test_replay_falls_back_to_url_then_misses(tmp_path):
+    """Test method+URL fallback and the error once the cassette is exhausted"""
+    path = str(tmp_path / "cassette.jsonl.gz")
+    with httpx.Client(transport=Cassette(path, "record").wrap(upstream([]))) as client:
+        client.post("https://api.example.com/v1/chat", json={"q": 1})
+
+    with httpx.Client(transport=Cassette(path, "replay", latency_scale=0).wrap(upstream([]))) as client:
+        assert client.post("https://api.example.com/v1/chat", json={"q": "different"}).status_code == 200
+        with pytest.raises(CassetteMissError):
+            client.post("https://api.example.com/v1/chat", json={"q": 1})
+
+    summary = summarize(load_entries(path))
+    assert summary["POST https://api.example.com/v1/chat"]["requests"] == 1
+
+
+def test_replay_never_ignores_the_query(tmp_path, capsys):
+    """Test that lookups differing only in their filter do not replay each other's rows"""
+    path = str(tmp_path / "cassette.jsonl.gz")
+    url = "https://db.example.com/rest/v1/interviews"
+    with httpx.Client(transport=Cassette(path, "record").wrap(upstream([]))) as client:
+        recorded = client.get(url, params={"id": "eq.1"}).json()
+
+    player = Cassette(path, "replay", latency_scale=0)
+    with httpx.Client(transport=player.wrap(upstream([]))) as client:
+        with pytest.raises(CassetteMissError):
+            client.get(url, params={"id": "eq.2"})
+        assert client.get(url, params={"id": "eq.1"}).json() == recorded
+    assert player.missed == 1 and player.replayed == 1
+    assert "id=eq.2" in capsys.readouterr().err
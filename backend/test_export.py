@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+import pytest
+from backend.export import ExportFormatError, EXPORT_COLUMNS, stream_export
+from backend.local_database import SQLiteDatabaseService
+
+
+@pytest.fixture
+def db():
+    db = SQLiteDatabaseService(":memory:")
+    for i, job_title in enumerate(["Developer", "Designer", "Developer"]):
+        db.save_interview({
+            "candidate_name": f"Candidate {i}",
+            "job_title": job_title,
+            "interview_type": "technical",
+            "final_score": 7.0,
+            "start_time": "2024-01-01T10:00:00",
+            "qa_pairs": [
+                {"number": n, "question": f"Q{n}", "answer": f"A{n}", "score": 7.0, "feedback": "Good"}
+                for n in (1, 2)
+            ],
+        })
+    return db
+
+
+def test_iter_interview_pages_covers_archive(db):
+    """Test keyset pagination returns every interview exactly once"""
+    pages = list(db.iter_interview_pages(page_size=2))
+    assert [len(page) for page in pages] == [2, 1]
+    ids = [interview["id"] for page in pages for interview, _ in page]
+    assert len(set(ids)) == 3
+
+
+def test_ndjson_export_with_job_title_filter(db):
+    """Test NDJSON rows are joined with questions and filtered"""
+    body = b"".join(stream_export(db, "ndjson", job_title="Developer", page_size=1))
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+
+    assert len(rows) == 4
+    assert {row["job_title"] for row in rows} == {"Developer"}
+    assert set(rows[0]) == set(EXPORT_COLUMNS)
+
+
+def test_csv_export_has_header(db):
+    """Test CSV export"""
+    body = b"".join(stream_export(db, "csv", page_size=2)).decode()
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert len(rows) == 6
+    assert rows[0]["question_number"] == "1"
+
+
+def test_parquet_export(db):
+    """Test Parquet export when pyarrow is available"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    body = b"".join(stream_export(db, "parquet", page_size=2))
+    table = pq.read_table(io.BytesIO(body))
+    assert table.num_rows == 6
+    assert table.column_names == EXPORT_COLUMNS
+
+
+def test_unknown_format():
+    """Test that unsupported formats are rejected"""
+    with pytest.raises(ExportFormatError):
+        stream_export(None, "xml")
@@ -0,0 +1,67 @@
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from openai import OpenAI, RateLimitError
+from backend.fake_openai import FakeOpenAIConfig, create_app
+
+
+def fake_client(**overrides) -> OpenAI:
+    """OpenAI SDK client wired to an in-process fake server"""
+    config = FakeOpenAIConfig(
+        chat_latency_ms=0, speech_latency_ms=0, transcription_latency_ms=0, stream_chunk_ms=0, seed=1
+    )
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return OpenAI(
+        api_key="sk-fake",
+        base_url="http://testserver/v1",
+        max_retries=0,
+        http_client=TestClient(create_app(config)),
+    )
+
+
+def test_chat_completion_question_and_evaluation():
+    """Test questions and JSON evaluations from the fake chat endpoint"""
+    client = fake_client()
+    question = client.chat.completions.create(
+        model="gpt-4", messages=[{"role": "user", "content": "Ask a question"}]
+    )
+    assert question.choices[0].message.content.endswith("?")
+    assert question.usage.completion_tokens > 0
+
+    evaluation = client.chat.completions.create(
+        model="gpt-4", messages=[{"role": "user", "content": "Return ONLY valid JSON"}]
+    )
+    result = json.loads(evaluation.choices[0].message.content)
+    assert 0 <= result["score"] <= 10
+
+
+def test_chat_completion_streaming():
+    """Test server-sent event streaming"""
+    client = fake_client()
+    stream = client.chat.completions.create(
+        model="gpt-4", messages=[{"role": "user", "content": "Ask a question"}], stream=True
+    )
+    text = "".join(chunk.choices[0].delta.content or "" for chunk in stream)
+    assert text.endswith("?")
+
+
+def test_audio_endpoints():
+    """Test speech synthesis and transcription"""
+    client = fake_client()
+    speech = client.audio.speech.create(model="tts-1", voice="alloy", input="Hello " * 20)
+    assert speech.content[:4] == b"RIFF"
+
+    upload = io.BytesIO(speech.content)
+    upload.name = "audio.wav"
+    transcript = client.audio.transcriptions.create(model="whisper-1", file=upload)
+    assert transcript.text
+
+
+def test_rate_limit_injection():
+    """Test configurable 429 responses"""
+    client = fake_client(rate_limit_rate=1.0)
+    with pytest.raises(RateLimitError):
+        client.chat.completions.create(model="gpt-4", messages=[{"role": "user", "content": "hi"}])
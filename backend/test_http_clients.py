@@ -0,0 +1,63 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from backend import http_clients
+from backend.http_clients import ConnectionStats, get_openai_client
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_is_shared_per_key_and_base_url():
+    """Test that the registry returns one client per key and base URL"""
+    first = get_openai_client("sk-test", "http://localhost:1/v1")
+    assert get_openai_client("sk-test", "http://localhost:1/v1") is first
+    assert get_openai_client("sk-other", "http://localhost:1/v1") is not first
+
+
+def test_changing_the_transport_closes_existing_clients():
+    """Test that clients replaced by a new transport wrapper release their connections"""
+    first = get_openai_client("sk-test", "http://localhost:1/v1")
+    http_clients.set_transport_wrapper(lambda transport: transport)
+    try:
+        assert first.is_closed()
+        assert get_openai_client("sk-test", "http://localhost:1/v1") is not first
+    finally:
+        http_clients.set_transport_wrapper(None)
+
+
+def test_connections_are_reused(server_url, monkeypatch):
+    """Test that pooled requests reuse one keep-alive connection"""
+    stats = ConnectionStats()
+    monkeypatch.setattr(http_clients, "stats", stats)
+
+    with http_clients.create_http_client() as client:
+        for _ in range(5):
+            assert client.get(server_url).text == "ok"
+
+    summary = stats.summary()
+    assert summary["requests"] == 5
+    assert summary["connections_opened"] == 1
+    assert summary["connections_reused"] == 4
+    assert summary["reuse_ratio"] == 0.8
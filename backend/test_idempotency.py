@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from backend.config import settings
+from backend.database import db_service
+from backend.idempotency import REPLAYED_HEADER, IdempotencyStore
+from backend.main import app
+from backend.openai_service import openai_service
+from backend.session_manager import session_manager
+
+
+def test_concurrent_duplicates_share_one_run():
+    """Test that a retry arriving mid-flight waits for the first attempt"""
+    store = IdempotencyStore(max_entries=10, ttl=60)
+    calls = []
+
+    def handler():
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return {"score": 7}
+
+    async def run():
+        return await asyncio.gather(*(store.run(("answer", "k"), "body", handler) for _ in range(3)))
+
+    assert asyncio.run(run()) == [{"score": 7}] * 3
+    assert len(calls) == 1
+    assert not store.pending
+
+
+def test_client_errors_are_stored_and_server_errors_retried():
+    """Test that 4xx results replay while 5xx results free the key"""
+    store = IdempotencyStore(max_entries=10, ttl=60)
+    calls = []
+
+    def handler(status):
+        def run():
+            calls.append(status)
+            raise HTTPException(status_code=status, detail="failed")
+        return run
+
+    for status, expected_calls in ((404, 1), (500, 2)):
+        calls.clear()
+        for _ in range(2):
+            with pytest.raises(HTTPException) as error:
+                asyncio.run(store.run(("save", str(status)), "body", handler(status)))
+            assert error.value.status_code == status
+        assert len(calls) == expected_calls
+
+
+def test_key_reused_for_different_request():
+    """Test that a key cannot be replayed for a different body"""
+    store = IdempotencyStore(max_entries=10, ttl=60)
+    asyncio.run(store.run(("start", "k"), "first", lambda: 1))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(store.run(("start", "k"), "second", lambda: 2))
+    assert error.value.status_code == 422
+
+
+@pytest.fixture
+def evaluations(monkeypatch):
+    """Answers passed to a fake evaluate_answer"""
+    answers = []
+
+    def evaluate_answer(**kwargs):
+        answers.append(kwargs["answer"])
+        return 8.0, "Good"
+
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+    monkeypatch.setattr(openai_service, "evaluate_answer", evaluate_answer)
+    return answers
+
+
+@pytest.fixture
+def session_id():
+    session_id = session_manager.create_session("Test User", "Developer", "technical", "resume", "jd")
+    yield session_id
+    session_manager.delete_session(session_id)
+
+
+def answer(session_id, text="My answer"):
+    return {"session_id": session_id, "question_number": 1, "question_text": "Question 1?", "answer_text": text}
+
+
+def test_retried_answer_is_evaluated_once(evaluations, session_id):
+    """Test keyed and unkeyed answer retries against a single evaluation"""
+    with TestClient(app) as client:
+        first = client.post("/api/v1/interview/answer", json=answer(session_id), headers={"Idempotency-Key": "a1"})
+        retry = client.post("/api/v1/interview/answer", json=answer(session_id), headers={"Idempotency-Key": "a1"})
+        assert first.json() == retry.json()
+        assert REPLAYED_HEADER not in first.headers and retry.headers[REPLAYED_HEADER] == "true"
+
+        reused = client.post("/api/v1/interview/answer", json=answer(session_id, "Other"), headers={"Idempotency-Key": "a1"})
+        assert reused.status_code == 422
+
+        # Unkeyed clients are covered for identical resubmissions
+        client.post("/api/v1/interview/answer", json=answer(session_id, "Unkeyed"))
+        client.post("/api/v1/interview/answer", json=answer(session_id, "Unkeyed"))
+
+    assert evaluations == ["My answer", "Unkeyed"]
+    assert [qa.answer for qa in session_manager.get_qa_pairs(session_id)] == ["My answer", "Unkeyed"]
+
+
+def test_retried_save_inserts_once(evaluations, session_id, monkeypatch):
+    """Test that a save retried after the session ended returns the same interview"""
+    saved = []
+    monkeypatch.setattr(db_service, "save_interview", lambda data: saved.append(data) or "interview-1")
+    with TestClient(app) as client:
+        client.post("/api/v1/interview/answer", json=answer(session_id))
+        first = client.post(f"/api/v1/interview/save/{session_id}")
+        retry = client.post(f"/api/v1/interview/save/{session_id}")
+
+    assert first.json() == retry.json() == {"interview_id": "interview-1", "success": True}
+    assert len(saved) == 1
+
+
+def test_failed_unkeyed_save_is_not_replayed(evaluations, session_id, monkeypatch):
+    """Test that an early save rejected for lack of answers does not block the real save"""
+    monkeypatch.setattr(db_service, "save_interview", lambda data: "interview-1")
+    with TestClient(app) as client:
+        assert client.post(f"/api/v1/interview/save/{session_id}").status_code == 400
+        client.post("/api/v1/interview/answer", json=answer(session_id))
+        assert client.post(f"/api/v1/interview/save/{session_id}").json()["interview_id"] == "interview-1"
+
+
+def test_replayed_client_error_is_marked(evaluations):
+    """Test that a replayed 4xx carries the replay header"""
+    with TestClient(app) as client:
+        body = answer("missing-session")
+        first = client.post("/api/v1/interview/answer", json=body, headers={"Idempotency-Key": "e1"})
+        retry = client.post("/api/v1/interview/answer", json=body, headers={"Idempotency-Key": "e1"})
+    assert first.status_code == retry.status_code == 404
+    assert REPLAYED_HEADER not in first.headers and retry.headers[REPLAYED_HEADER] == "true"
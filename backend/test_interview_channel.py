@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.admission import admission
+from backend.config import settings
+from backend.interview_channel import SEQ_HEADER, ChannelState, interview_channels
+from backend.main import app
+from backend.openai_service import openai_service
+from backend.session_manager import session_manager
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+    monkeypatch.setattr(openai_service, "generate_question", lambda **kwargs: f"Question {kwargs['question_num']}?")
+    monkeypatch.setattr(openai_service, "evaluate_answer", lambda **kwargs: (7.0, "Solid answer"))
+    monkeypatch.setattr(openai_service, "stream_speech", lambda text, chunk_size: (chunk for chunk in (b"ID3", b"audio")))
+    monkeypatch.setattr(openai_service, "speech_to_text", lambda audio_file, prompt=None: "Transcribed answer")
+
+
+@pytest.fixture
+def session_id():
+    session_id = session_manager.create_session("Test User", "Developer", "technical", "resume", "jd")
+    session_manager.update_session(session_id, current_question="Question 1?", total_questions=2)
+    yield session_id
+    session_manager.delete_session(session_id)
+
+
+def receive(ws):
+    """Next frame as (seq, payload); binary frames are returned as bytes"""
+    message = ws.receive()
+    if message.get("bytes") is not None:
+        (seq,) = SEQ_HEADER.unpack_from(message["bytes"])
+        return seq, message["bytes"][SEQ_HEADER.size:]
+    payload = json.loads(message["text"])
+    return payload.get("seq"), payload
+
+
+def receive_question(ws):
+    frames = [receive(ws) for _ in range(5)]
+    assert [f[1]["type"] if isinstance(f[1], dict) else "audio" for f in frames] == [
+        "question", "audio_start", "audio", "audio", "audio_end"
+    ]
+    return frames
+
+
+def test_interview_over_websocket(fake_openai, session_id):
+    """Test a full interview: questions with audio, then a spoken and a typed answer"""
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/api/v1/interview/ws/{session_id}") as ws:
+            ws.send_json({"type": "hello"})
+            _, ready = receive(ws)
+            assert ready["type"] == "ready" and ready["question_text"] == "Question 1?"
+            frames = receive_question(ws)
+            assert [seq for seq, _ in frames] == [1, 2, 3, 4, 5]
+            assert frames[2][1] == b"ID3"
+
+            ws.send_bytes(b"not a wav file")
+            ws.send_json({"type": "answer_end"})
+            assert receive(ws)[1]["text"] == "Transcribed answer"
+            assert receive(ws)[1]["score"] == 7.0
+            assert receive_question(ws)[0][1]["question_text"] == "Question 2?"
+
+            ws.send_json({"type": "answer_end", "answer_text": "Typed answer"})
+            assert receive(ws)[1]["type"] == "evaluation"
+            complete = receive(ws)[1]
+            assert complete["type"] == "complete" and complete["final_score"] == 7.0
+
+    qa_pairs = session_manager.get_qa_pairs(session_id)
+    assert [qa.answer for qa in qa_pairs] == ["Transcribed answer", "Typed answer"]
+
+
+def test_resume_replays_missed_frames(fake_openai, session_id):
+    """Test that reconnecting with last_seq replays only the frames after it"""
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/api/v1/interview/ws/{session_id}") as ws:
+            ws.send_json({"type": "hello"})
+            receive(ws)
+            receive_question(ws)
+
+        with client.websocket_connect(f"/api/v1/interview/ws/{session_id}") as ws:
+            ws.send_json({"type": "hello", "last_seq": 3})
+            _, ready = receive(ws)
+            assert ready["resumed"] and not ready["gap"]
+            assert [receive(ws)[0] for _ in range(2)] == [4, 5]
+
+
+def test_unknown_session_is_rejected(fake_openai):
+    """Test that the channel closes for an unknown session"""
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/v1/interview/ws/missing") as ws:
+            assert ws.receive()["code"] == 4404
+
+
+def test_replay_reports_gap_after_eviction():
+    """Test that the resume buffer is bounded and reports evicted frames"""
+    state = ChannelState("session", buffer_bytes=64)
+    for _ in range(10):
+        asyncio.run(state.emit(b"x" * 20))
+    assert state.replay(0) is None
+    assert len(state.replay(9)) == 1
+
+
+def test_invalid_last_seq_closes_with_protocol_error(fake_openai, session_id):
+    """Test that a non-numeric last_seq is refused like a malformed hello"""
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/api/v1/interview/ws/{session_id}") as ws:
+            ws.send_json({"type": "hello", "last_seq": "abc"})
+            assert ws.receive()["code"] == 4400
+
+
+def test_state_dropped_when_session_deleted_or_idle(fake_openai, session_id):
+    """Test that channel state goes with its session, and expires without a client"""
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/api/v1/interview/ws/{session_id}") as ws:
+            ws.send_json({"type": "hello"})
+            receive(ws)
+            receive_question(ws)
+        state = interview_channels.states[session_id]
+        assert state.outbox
+
+        session_manager.delete_session(session_id)
+        assert session_id not in interview_channels.states
+
+    idle = ChannelState("idle", buffer_bytes=64)
+    interview_channels.states["idle"] = idle
+    interview_channels.expire_idle(now=idle.idle_since + settings.WS_IDLE_STATE_SECONDS + 1)
+    assert "idle" not in interview_channels.states
+
+
+def test_first_question_waits_for_admission(fake_openai, session_id, monkeypatch):
+    """Test that generating the first question is refused at capacity and asked again on reconnect"""
+    session_manager.update_session(session_id, current_question=None)
+    monkeypatch.setattr(admission, "enabled", True)
+    monkeypatch.setattr(admission, "max_queue", 0)
+    monkeypatch.setattr(admission, "in_flight", admission.max_in_flight)
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/api/v1/interview/ws/{session_id}") as ws:
+            ws.send_json({"type": "hello"})
+            assert receive(ws)[1]["type"] == "ready"
+            error = receive(ws)[1]
+            assert error["type"] == "error" and error["retry_after"] >= 1
+
+        admission.in_flight = 0
+        with client.websocket_connect(f"/api/v1/interview/ws/{session_id}") as ws:
+            ws.send_json({"type": "hello", "last_seq": error["seq"]})
+            assert receive(ws)[1]["type"] == "ready"
+            assert receive_question(ws)[0][1]["question_text"] == "Question 1?"
+
+
+def test_slow_client_does_not_hold_an_admission_slot(fake_openai, monkeypatch):
+    """Test that question audio is read from OpenAI even while the client is not reading"""
+    monkeypatch.setattr(admission, "enabled", True)
+
+    async def run():
+        state = ChannelState("session", buffer_bytes=1 << 20)
+        state.attach(None, asyncio.Queue(maxsize=2))  # takes the question and audio_start, then stalls
+        ask = asyncio.create_task(interview_channels._ask(state, 1, "Question 1?"))
+        await asyncio.sleep(0.1)
+        stalled, in_flight = not ask.done(), admission.in_flight
+        state.detach()
+        ask.cancel()
+        return stalled, in_flight
+
+    assert asyncio.run(run()) == (True, 0)
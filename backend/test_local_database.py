@@ -0,0 +1,131 @@
+import pytest
+from backend.local_database import SQLiteDatabaseService
+
+
+def make_interview(score=8.0, job_title="Developer"):
+    return {
+        "candidate_name": "Test User",
+        "job_title": job_title,
+        "interview_type": "technical",
+        "final_score": score,
+        "start_time": "2024-01-01T10:00:00",
+        "qa_pairs": [
+            {"number": 1, "question": "Q1", "answer": "A1", "score": score, "feedback": "Good"},
+        ],
+    }
+
+
+@pytest.fixture
+def db():
+    return SQLiteDatabaseService(":memory:")
+
+
+def test_save_and_fetch_interview(db):
+    """Test saving and reading back an interview"""
+    interview_id = db.save_interview(make_interview())
+
+    assert db.get_interview_by_id(interview_id)["candidate_name"] == "Test User"
+    assert [q["answer"] for q in db.get_questions(interview_id)] == ["A1"]
+    assert len(db.get_all_interviews()) == 1
+
+
+def test_save_invalidates_cached_list(db):
+    """Test that a save is visible through the read-through cache"""
+    assert db.get_all_interviews() == []
+    db.save_interview(make_interview())
+    assert len(db.get_all_interviews()) == 1
+
+
+def test_save_drops_questions_cached_mid_save(db, monkeypatch):
+    """Test that questions read between the two inserts do not stay cached as empty"""
+    insert = db._insert_interview
+
+    def insert_with_concurrent_read(data):
+        interview_id = insert(data)
+        db.cache.set(("questions", interview_id), [])  # what a read before the questions insert cached
+        return interview_id
+
+    monkeypatch.setattr(db, "_insert_interview", insert_with_concurrent_read)
+    interview_id = db.save_interview(make_interview())
+    assert len(db.get_questions(interview_id)) == len(make_interview()["qa_pairs"])
+
+
+def test_delete_interview(db):
+    """Test deleting an interview and its questions"""
+    interview_id = db.save_interview(make_interview())
+    db.get_interview_by_id(interview_id)
+
+    assert db.delete_interview(interview_id) is True
+    assert db.get_interview_by_id(interview_id) is None
+    assert db.get_questions(interview_id) == []
+
+
+def test_delete_missing_interview(db):
+    """Test that deleting an unknown or already-deleted interview reports no row removed"""
+    interview_id = db.save_interview(make_interview())
+
+    assert db.delete_interview(interview_id) is True
+    assert db.delete_interview(interview_id) is False
+    assert db.delete_interview("missing") is False
+
+
+def test_analytics_follow_saves(db):
+    """Test that analytics and ranks update incrementally on save"""
+    db.save_interview(make_interview(score=6.0))
+    assert db.get_score_analytics()[0]["interview_count"] == 1
+
+    db.save_interview(make_interview(score=9.0))
+    [cohort] = db.get_score_analytics()
+    assert cohort["interview_count"] == 2
+
+    rank = db.get_percentile_rank("Developer", "technical", 9.0)
+    assert rank == {"cohort_size": 2, "percentile": 75.0}
+
+
+def test_search_ranks_and_highlights(db):
+    """Test FTS5 search returns ranked, highlighted snippets"""
+    interview = make_interview()
+    interview["qa_pairs"] = [
+        {"number": 1, "question": "Describe your deployments", "answer": "We ran Kubernetes clusters with Helm", "score": 8.0, "feedback": "Good"},
+        {"number": 2, "question": "Any Kubernetes experience?", "answer": "Some Docker", "score": 6.0, "feedback": "Mention Kubernetes depth"},
+        {"number": 3, "question": "Teamwork", "answer": "I pair program", "score": 7.0, "feedback": "Fine"},
+    ]
+    db.save_interview(interview)
+
+    results = db.search_questions("kubernetes")
+    assert [r["question_number"] for r in results][0] == 1
+    assert len(results) == 2
+    assert "<mark>Kubernetes</mark>" in results[0]["answer_snippet"]
+
+    assert db.search_questions('"pair program"')[0]["question_number"] == 3
+    assert len(db.search_questions("helm OR docker")) == 2
+
+
+def test_search_snippets_are_escaped(db):
+    """Test that stored markup comes back as text around the highlights"""
+    interview = make_interview()
+    interview["qa_pairs"] = [
+        {"number": 1, "question": "Q1", "answer": "<script>alert(1)</script> Kubernetes & Helm", "score": 5.0, "feedback": "F"},
+    ]
+    db.save_interview(interview)
+
+    [result] = db.search_questions("kubernetes")
+    assert result["answer_snippet"] == "&lt;script&gt;alert(1)&lt;/script&gt; <mark>Kubernetes</mark> &amp; Helm"
+
+
+def test_search_index_follows_deletes(db):
+    """Test that deleted answers drop out of the search index"""
+    interview_id = db.save_interview(make_interview())
+    assert db.search_questions("A1")
+
+    db.delete_interview(interview_id)
+    assert db.search_questions("A1") == []
+
+
+def test_search_query_is_sanitised():
+    """Test that FTS5 syntax in user input cannot break the query"""
+    from backend.local_database import to_fts5_query
+
+    assert to_fts5_query('kubernetes "load balancer"') == '"kubernetes" "load balancer"'
+    assert to_fts5_query('a* OR (b) OR') == '"a" OR "b"'
+    assert to_fts5_query('NEAR(') == '"NEAR"'
@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+from backend.metrics import Counter, Gauge, Histogram, MetricsRegistry, timed
+
+
+def test_counter_sums_thread_shards():
+    """Test that per-thread counter shards are summed on read"""
+    counter = Counter("jobs_total", "Jobs", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value(("a",)) == 4000
+    assert 'jobs_total{kind="a"} 4000' in list(counter.render())
+
+
+def test_exited_threads_fold_into_retired_totals():
+    """Test that short-lived threads do not leave a shard each behind"""
+    counter = Counter("jobs_total", "Jobs")
+    histogram = Histogram("latency_seconds", "Latency", buckets=(1.0,))
+
+    def work():
+        counter.inc()
+        histogram.observe(0.5)
+
+    for _ in range(200):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+    assert len(counter._shards) <= 1 and len(histogram._shards) <= 1
+    assert counter.value() == 200
+    assert histogram.count() == 200
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test Prometheus histogram exposition"""
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, ("/x",))
+
+    lines = list(histogram.render())
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/x",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/x"} 4' in lines
+    assert 'latency_seconds_sum{route="/x"} 6.05' in lines
+
+
+def test_gauge_function_and_label_escaping():
+    """Test callback gauges and escaping of label values"""
+    registry = MetricsRegistry()
+    registry.gauge("stat", "Stats", ("name",), function=lambda: {('say "hi"',): 2})
+    assert 'stat{name="say \\"hi\\""} 2' in registry.render()
+
+
+def test_timed_counts_errors():
+    """Test that timed observes latency and counts failures"""
+    histogram = Histogram("call_seconds", "Calls", ("task",))
+    errors = Counter("call_errors_total", "Errors", ("task",))
+
+    with timed(histogram, ("ok",), errors):
+        pass
+    with pytest.raises(RuntimeError):
+        with timed(histogram, ("bad",), errors):
+            raise RuntimeError("boom")
+
+    assert histogram.count(("ok",)) == 1
+    assert histogram.count(("bad",)) == 1
+    assert errors.value(("ok",)) == 0
+    assert errors.value(("bad",)) == 1
@@ -0,0 +1,39 @@
+import pytest
+from backend.openai_service import build_evaluation_prompt, build_question_prompt, extract_json
+
+
+def test_question_prompt_includes_history():
+    """Test that previous answers are numbered into the question prompt"""
+    prompt = build_question_prompt(
+        "Resume text",
+        "JD text",
+        "technical",
+        3,
+        [{"question": "Q one", "answer": "A one"}, {"question": "Q two", "answer": "A two"}],
+    )
+    assert "Previous Questions and Answers:" in prompt
+    assert "\nQ2: Q two\nA2: A two\n" in prompt
+    assert "This is question 3 out of 10" in prompt
+
+
+def test_question_prompt_without_history():
+    """Test the first question prompt has no history section"""
+    prompt = build_question_prompt("Resume", "JD", "hr", 1, [])
+    assert "Previous Questions" not in prompt
+
+
+def test_evaluation_prompt_requests_json():
+    """Test the evaluation prompt carries question, answer and format"""
+    prompt = build_evaluation_prompt("Why?", "Because.", "JD", "hr")
+    assert "Question: Why?\nAnswer: Because." in prompt
+    assert '{"score": 8, "feedback": "Your feedback here"}' in prompt
+
+
+@pytest.mark.parametrize("reply", [
+    '{"score": 8, "feedback": "Good"}',
+    '```json\n{"score": 8, "feedback": "Good"}\n```',
+    'Here you go:\n```\n{"score": 8, "feedback": "Good"}\n```',
+])
+def test_extract_json(reply):
+    """Test JSON extraction with and without code fences"""
+    assert extract_json(reply) == {"score": 8, "feedback": "Good"}
@@ -0,0 +1,97 @@
+import subprocess
+import sys
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.main
+from backend.local_database import SQLiteDatabaseService
+from backend.startup import Startup, WarmupStep
+
+
+def fail():
+    raise RuntimeError("connection refused")
+
+
+def test_ready_after_required_steps_succeed():
+    """Test phase timings and component status after warm-up"""
+    startup = Startup()
+    startup.warm_up([WarmupStep("database", lambda: None), WarmupStep("openai", fail, required=False)])
+    assert startup.wait(5)
+    status = startup.status()
+    assert status["ready"]
+    assert status["components"]["database"]["status"] == "ready"
+    assert status["components"]["openai"]["status"] == "failed"
+    assert "ready" in status["phases"]
+
+
+def test_not_ready_until_warm_up_or_after_required_failure():
+    """Test that readiness waits for warm-up and fails with a required step"""
+    startup = Startup()
+    assert not startup.ready
+    startup.warm_up([WarmupStep("database", fail)], background=False)
+    assert not startup.ready
+    assert startup.status()["components"]["database"]["error"] == "connection refused"
+
+
+def test_ready_recovers_after_transient_failure():
+    """Test that a failed required step is retried in the background until it succeeds"""
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            fail()
+
+    startup = Startup(retry_delay=0.01)
+    startup.warm_up([WarmupStep("database", flaky)])
+    assert startup.wait(5)
+    deadline = time.monotonic() + 5
+    while not startup.ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+    status = startup.status()
+    assert status["ready"] and "ready" in status["phases"]
+    assert status["components"]["database"]["status"] == "ready"
+    assert status["components"]["database"]["attempts"] == 3
+    assert "error" not in status["components"]["database"]
+
+
+def test_database_client_retries_failed_initialization(tmp_path):
+    """Test that a client that failed to open is created on a later connect"""
+    db = SQLiteDatabaseService(str(tmp_path / "missing" / "interviews.db"))
+    with pytest.raises(RuntimeError):
+        db.connect()
+    assert db.client is None  # request paths wait for the retry interval
+
+    (tmp_path / "missing").mkdir()
+    db.connect()
+    assert db.connected
+
+
+def test_database_client_is_created_lazily():
+    """Test that constructing the service opens nothing until first use"""
+    db = SQLiteDatabaseService(":memory:")
+    assert not db.connected
+    db.connect()
+    assert db.connected
+
+
+def test_ready_endpoint(monkeypatch):
+    """Test /ready returns 503 while warming up and 200 afterwards"""
+    startup = Startup()
+    monkeypatch.setattr(backend.main, "startup", startup)
+    client = TestClient(backend.main.app)
+    assert client.get("/ready").status_code == 503
+
+    startup.warm_up([WarmupStep("database", lambda: None)], background=False)
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["components"]["database"]["status"] == "ready"
+
+
+def test_backend_import_defers_heavy_packages():
+    """Test that importing the app loads no client SDKs or PDF parser"""
+    code = "import sys, backend.main; print(sorted({'openai', 'supabase', 'PyPDF2'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,189 @@
+import asyncio
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.admission import admission
+from backend.audio_processing import encode_wav
+from backend.config import settings
+from backend.main import app
+from backend.openai_service import openai_service
+from backend.session_manager import session_manager
+from backend.streaming_stt import SegmentDetector, StreamingTranscriber
+
+RATE = 16000
+
+
+def tone(seconds, amplitude=8000):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+
+
+def silence(seconds):
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 3, int(seconds * RATE)).astype(np.int16)
+
+
+def answer():
+    """Three bursts of speech separated by one-second pauses, ending mid-speech"""
+    return np.concatenate([silence(1), tone(1), silence(1), tone(1.5), silence(1), tone(0.5)])
+
+
+def chunks(data: bytes, size=3200):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    """Fake speech_to_text recording the name and duration of each upload"""
+    calls = []
+
+    def speech_to_text(audio_file, prompt=None):
+        calls.append((audio_file.name, len(audio_file.getvalue()), prompt))
+        return f"part{len(calls)}"
+
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+    monkeypatch.setattr(settings, "STT_STREAM_CONCURRENCY", 1)  # transcribe segments in order
+    monkeypatch.setattr(openai_service, "speech_to_text", speech_to_text)
+    return calls
+
+
+def test_detector_cuts_segments_at_pauses():
+    """Test that pauses close segments and the open tail is flushed"""
+    detector = SegmentDetector(RATE)
+    segments = []
+    for chunk in np.array_split(answer(), 40):
+        segments.extend(detector.push(chunk))
+    assert [round(len(s) / RATE, 1) for s in segments] == [1.3, 1.8]
+    assert 0.5 <= len(detector.flush()) / RATE < 0.7
+    assert detector.flush() is None
+
+
+def test_detector_cuts_long_speech():
+    """Test that uninterrupted speech is split at the maximum segment length"""
+    detector = SegmentDetector(RATE, max_segment_seconds=2)
+    speech = np.concatenate([silence(1)] + [np.concatenate([tone(0.8), silence(0.2)])] * 5)
+    segments = []
+    for chunk in np.array_split(speech, 30):
+        segments.extend(detector.push(chunk))
+    # Each cut is at most the limit plus the padding before the speech started
+    assert len(segments) == 2
+    assert all(2.0 <= len(s) / RATE <= 2.15 for s in segments)
+
+
+def test_detector_keeps_continuous_speech_at_varying_levels():
+    """Test that quieter stretches of sustained speech neither end the segment nor get dropped"""
+    detector = SegmentDetector(RATE)
+    speech = np.concatenate([tone(2), tone(2, 1000), tone(2), tone(2, 1000)])
+    segments = []
+    for chunk in np.array_split(np.concatenate([speech, silence(1)]), 45):
+        segments.extend(detector.push(chunk))
+    assert len(segments) == 1
+    assert len(speech) / RATE <= len(segments[0]) / RATE <= len(speech) / RATE + 0.2
+
+
+def test_only_the_tail_is_transcribed_after_stop(uploads):
+    """Test that segments are transcribed during the stream and joined in order"""
+    partials = []
+
+    async def run():
+        async def on_partial(text):
+            partials.append(text)
+
+        transcriber = StreamingTranscriber("pcm16", RATE, on_partial=on_partial)
+        for chunk in chunks(answer().tobytes()):
+            await transcriber.feed(chunk)
+            await asyncio.sleep(0.005)  # let finished segments publish, as between live chunks
+        await asyncio.sleep(0.1)
+        before_stop = len(uploads)
+        return before_stop, await transcriber.finish()
+
+    before_stop, text = asyncio.run(run())
+    assert before_stop == 2
+    assert text == "part1 part2 part3"
+    assert partials[:2] == ["part1", "part1 part2"]
+    assert uploads[1][2] == "part1"  # earlier text is passed as the prompt
+
+
+def test_wav_stream_is_segmented(uploads):
+    """Test that a WAV stream is recognised from its header and segmented"""
+    async def run():
+        transcriber = StreamingTranscriber()
+        for chunk in chunks(encode_wav(answer(), RATE)):
+            await transcriber.feed(chunk)
+        return transcriber, await transcriber.finish()
+
+    transcriber, text = asyncio.run(run())
+    assert transcriber.audio_format == "pcm16"
+    assert transcriber.segments == 3 and text == "part1 part2 part3"
+
+
+def test_compressed_stream_is_buffered(uploads):
+    """Test that undecodable formats are sent once, named after their format"""
+    webm = b"\x1a\x45\xdf\xa3" + b"\x00" * 10000
+
+    async def run():
+        transcriber = StreamingTranscriber()
+        for chunk in chunks(webm, 1000):
+            await transcriber.feed(chunk)
+        return await transcriber.finish()
+
+    assert asyncio.run(run()) == "part1"
+    assert uploads == [("audio.webm", len(webm), None)]
+
+
+def test_unsupported_declared_format():
+    """Test that declared formats other than pcm16 are rejected"""
+    with pytest.raises(ValueError):
+        StreamingTranscriber("mulaw", 8000)
+
+
+def test_stream_endpoint(uploads):
+    """Test partial and final transcripts over the WebSocket endpoint"""
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/v1/audio/stt/stream") as ws:
+            ws.send_json({"type": "start", "format": "pcm16", "sample_rate": RATE})
+            for chunk in chunks(answer().tobytes()):
+                ws.send_bytes(chunk)
+            ws.send_json({"type": "stop"})
+
+            messages = []
+            while not messages or messages[-1]["type"] != "final":
+                messages.append(ws.receive_json())
+
+    final = messages[-1]
+    assert final["text"] == "part1 part2 part3"
+    assert final["segments"] == 3 and final["format"] == "pcm16"
+    assert {m["type"] for m in messages[:-1]} <= {"partial"}
+
+
+def stream(ws, start):
+    ws.send_json(start)
+    for chunk in chunks(answer().tobytes()):
+        ws.send_bytes(chunk)
+    ws.send_json({"type": "stop"})
+    return ws.receive_json()
+
+
+def test_stream_endpoint_goes_through_admission(uploads, monkeypatch):
+    """Test that a stream without a session is shed at capacity while an interview's stream gets a slot"""
+    monkeypatch.setattr(admission, "enabled", True)
+    monkeypatch.setattr(admission, "in_flight", admission.max_in_flight - admission.reserved_slots)
+    start = {"type": "start", "format": "pcm16", "sample_rate": RATE}
+    session_id = session_manager.create_session("Test User", "Developer", "technical", "resume", "jd")
+    try:
+        with TestClient(app) as client:
+            with client.websocket_connect("/api/v1/audio/stt/stream") as ws:
+                error = stream(ws, start)
+                assert error["type"] == "error" and error["retry_after"] >= 1
+                assert ws.receive()["code"] == 1013
+            assert uploads == []
+
+            with client.websocket_connect("/api/v1/audio/stt/stream") as ws:
+                message = stream(ws, {**start, "session_id": session_id})
+                while message["type"] != "final":
+                    message = ws.receive_json()
+                assert message["text"] == "part1 part2 part3"
+    finally:
+        session_manager.delete_session(session_id)
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from backend import tracing
+from backend.tracing import FileExporter, span, to_otlp
+
+
+def test_span_is_noop_outside_request():
+    """Test that spans without an active trace record nothing"""
+    with span("db.query") as record:
+        assert record is None
+
+
+def test_spans_nest_and_report_server_timing():
+    """Test parent links and the Server-Timing summary"""
+    trace, tokens = tracing.start_trace()
+    with span("openai.evaluation") as outer:
+        with span("db.fetch") as inner:
+            pass
+    with span("db.fetch"):
+        pass
+    tracing.finish_trace(trace, tokens, "POST /answer")
+
+    assert inner.parent_id == outer.span_id
+    assert outer.parent_id == trace.root.span_id
+    assert tracing.current_trace() is None
+
+    names = [entry.split(";")[0] for entry in trace.server_timing().split(", ")]
+    assert names == ["db.fetch", "openai.evaluation", "other", "total"]
+
+
+def test_traceparent_is_continued(tmp_path):
+    """Test W3C traceparent propagation and OTLP export of sampled traces"""
+    path = tmp_path / "traces.jsonl"
+    tracing.configure(0.0, FileExporter(str(path)))
+    try:
+        trace, tokens = tracing.start_trace(f"00-{'a' * 32}-{'b' * 16}-01")
+        with span("upload.pdf"):
+            pass
+        tracing.finish_trace(trace, tokens, "POST /upload")
+    finally:
+        tracing.shutdown()
+
+    assert trace.trace_id == "a" * 32
+    assert trace.root.parent_id == "b" * 16
+
+    payload = json.loads(path.read_text().splitlines()[0])
+    spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans] == ["POST /upload", "upload.pdf"]
+    assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+
+
+def test_unsampled_traces_are_not_exported():
+    """Test that sample rate zero exports nothing"""
+    tracing.configure(0.0, None)
+    trace, tokens = tracing.start_trace()
+    tracing.finish_trace(trace, tokens, "GET /health")
+    assert not trace.sampled
+    assert to_otlp([trace])["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"] == "GET /health"
@@ -0,0 +1,273 @@
+"""Lightweight request tracing.
+
+Every request gets a Trace held in a context variable; ``span()`` blocks
+anywhere below the route (services, storage, upload parsing) record their
+duration into it. The per-stage totals are returned in a ``Server-Timing``
+header on every response, and a sampled fraction of traces is exported as
+OTLP/JSON to a file or an OpenTelemetry collector from a background thread.
+
+Outside a request ``span()`` is a no-op.
+"""
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Dict, List, Optional
+
+import httpx
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class Trace:
+    def __init__(self, trace_id: str, sampled: bool, parent_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.root = Span("request", _new_id(8), parent_id, time.time_ns())
+        self.spans: List[Span] = []
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: per-stage totals, untraced remainder and total"""
+        totals: Dict[str, float] = {}
+        children = 0.0
+        for record in self.spans:
+            totals[record.name] = totals.get(record.name, 0.0) + record.duration_ms
+            if record.parent_id == self.root.span_id:
+                children += record.duration_ms
+        total = self.root.duration_ms
+        # Routing, validation and response serialization
+        totals["other"] = max(total - children, 0.0)
+        totals["total"] = total
+        return ", ".join(f"{name};dur={duration:.1f}" for name, duration in totals.items())
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_parent: ContextVar[Optional[str]] = ContextVar("trace_parent", default=None)
+
+_sample_rate = 0.0
+_service_name = "ai-interview-backend"
+_processor: Optional["BackgroundExporter"] = None
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+def current_trace() -> Optional[Trace]:
+    return _trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a stage of the current request"""
+    trace = _trace.get()
+    if trace is None:
+        yield None
+        return
+
+    record = Span(name, _new_id(8), _parent.get(), time.time_ns(), attributes=attributes)
+    token = _parent.set(record.span_id)
+    try:
+        yield record
+    except Exception as e:
+        record.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        record.end_ns = time.time_ns()
+        _parent.reset(token)
+        trace.spans.append(record)
+
+
+def traced(name: str):
+    """Decorator form of span()"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _parse_traceparent(header: Optional[str]):
+    # W3C trace context: version-traceid-parentid-flags
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+def start_trace(traceparent: Optional[str] = None) -> tuple:
+    """Begin a request trace; returns (trace, reset tokens)"""
+    parsed = _parse_traceparent(traceparent)
+    if parsed:
+        trace = Trace(parsed[0], parsed[2] and _processor is not None, parsed[1])
+    else:
+        sampled = _processor is not None and random.random() < _sample_rate
+        trace = Trace(_new_id(16), sampled)
+    return trace, (_trace.set(trace), _parent.set(trace.root.span_id))
+
+
+def finish_trace(trace: Trace, tokens: tuple, name: str, **attributes):
+    """Close the root span and export the trace if it was sampled"""
+    trace.root.end_ns = time.time_ns()
+    trace.root.name = name
+    trace.root.attributes.update(attributes)
+    _trace.reset(tokens[0])
+    _parent.reset(tokens[1])
+    if trace.sampled and _processor is not None:
+        _processor.submit(trace)
+
+
+# Export
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _otlp_span(trace: Trace, record: Span, kind: int) -> dict:
+    encoded = {
+        "traceId": trace.trace_id,
+        "spanId": record.span_id,
+        "name": record.name,
+        "kind": kind,
+        "startTimeUnixNano": str(record.start_ns),
+        "endTimeUnixNano": str(record.end_ns),
+        "attributes": [_attribute(k, v) for k, v in record.attributes.items()],
+        "status": {"code": 2 if "error" in record.attributes else 1},
+    }
+    if record.parent_id:
+        encoded["parentSpanId"] = record.parent_id
+    return encoded
+
+
+def to_otlp(traces: List[Trace]) -> dict:
+    """OTLP/JSON ExportTraceServiceRequest for a batch of traces"""
+    spans = []
+    for trace in traces:
+        spans.append(_otlp_span(trace, trace.root, SPAN_KIND_SERVER))
+        spans.extend(_otlp_span(trace, record, SPAN_KIND_INTERNAL) for record in trace.spans)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", _service_name)]},
+            "scopeSpans": [{"scope": {"name": "backend.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+class FileExporter:
+    """Appends one OTLP/JSON request per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, payload: dict):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+
+
+class OtlpHttpExporter:
+    """Posts OTLP/JSON to a collector, e.g. http://localhost:4318/v1/traces"""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.client = httpx.Client(timeout=5.0)
+
+    def export(self, payload: dict):
+        self.client.post(self.endpoint, json=payload).raise_for_status()
+
+
+class BackgroundExporter:
+    """Batches sampled traces on a daemon thread; drops traces when the queue is full"""
+
+    def __init__(self, exporter, max_queue: int = 2048, batch_size: int = 64, interval: float = 2.0):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Trace]]" = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, trace: Trace):
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        batch: List[Trace] = []
+        stopping = False
+        while not stopping:
+            try:
+                trace = self._queue.get(timeout=self.interval)
+                if trace is None:
+                    stopping = True
+                else:
+                    batch.append(trace)
+            except queue.Empty:
+                pass
+            if batch and (stopping or len(batch) >= self.batch_size or self._queue.empty()):
+                try:
+                    self.exporter.export(to_otlp(batch))
+                except Exception as e:
+                    print(f"Error exporting traces: {e}")
+                batch = []
+
+
+def configure(sample_rate: float, exporter=None, service_name: Optional[str] = None):
+    """Set the export sample rate and exporter (None disables export)"""
+    global _sample_rate, _service_name, _processor
+    if _processor is not None:
+        _processor.shutdown()
+    _sample_rate = sample_rate
+    if service_name:
+        _service_name = service_name
+    _processor = BackgroundExporter(exporter) if exporter is not None else None
+
+
+def create_exporter(kind: str, path: str, endpoint: str):
+    """Exporter for a TRACE_EXPORTER setting: "file", "otlp" or "" (none)"""
+    if kind == "file":
+        return FileExporter(path)
+    if kind == "otlp":
+        return OtlpHttpExporter(endpoint)
+    return None
+
+
+def shutdown():
+    configure(0.0, None)
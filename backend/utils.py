@@ -1,19 +1,24 @@
+import hashlib
 import io
-import PyPDF2
+import json
 from typing import Optional
 
+from backend.tracing import traced
+
+@traced("upload.pdf")
 def extract_text_from_pdf(pdf_content: bytes) -> str:
     """Extract text from PDF file bytes"""
     try:
+        # Deferred: only PDF uploads pay for importing PyPDF2
+        import PyPDF2
+        
         pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() or ""
-        return text
+        return "".join(page.extract_text() or "" for page in pdf_reader.pages)
     except Exception as e:
         print(f"Error extracting PDF text: {e}")
         return ""
 
+@traced("upload.txt")
 def extract_text_from_txt(txt_content: bytes) -> str:
     """Extract text from TXT file bytes"""
     try:
@@ -25,3 +30,18 @@ def extract_text_from_txt(txt_content: bytes) -> str:
 def validate_file_extension(filename: str, allowed_extensions: list) -> bool:
     """Validate file extension"""
     return any(filename.lower().endswith(ext) for ext in allowed_extensions)
+
+def compute_etag(payload) -> str:
+    """Strong ETag derived from the JSON representation of a payload"""
+    body = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return '"' + hashlib.sha1(body.encode('utf-8')).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    if '*' in candidates:
+        return True
+    bare = etag.removeprefix('W/')
+    return any(tag.removeprefix('W/') == bare for tag in candidates)
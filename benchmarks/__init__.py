@@ -0,0 +1,7 @@
+# Benchmarks run offline against local stand-ins; the settings only need
+# placeholder credentials so backend modules can be imported.
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
@@ -0,0 +1,80 @@
+"""Per-chunk cost of Streamlit audio capture bookkeeping.
+
+Compares the old list-of-frames approach (append, then three np.concatenate
+calls per rerun for waveform, partial transcription and int16 conversion)
+with CaptureBuffer at minute 1 and minute 5 of a recording, plus the cost of
+folding new audio into the fixed-width waveform envelope:
+
+    python -m benchmarks.bench_audio_buffer
+"""
+import json
+import time
+
+import numpy as np
+
+from app.audio_buffer import CaptureBuffer
+from app.waveform import WaveformEnvelope
+
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 1
+RECORD_SECONDS = 300
+CHECKPOINTS = (60, 300)
+
+
+def frames_tick(frames: list, chunk: np.ndarray):
+    frames.append(chunk)
+    waveform = np.concatenate(frames, axis=0)
+    partial = (np.concatenate(frames, axis=0) * 32767).astype(np.int16)
+    final = (np.concatenate(frames, axis=0) * 32767).astype(np.int16)
+    return waveform, partial, final
+
+
+def buffer_tick(buffer: CaptureBuffer, chunk: np.ndarray):
+    buffer.append(chunk)
+    return buffer.samples(), buffer.pcm(), buffer.pcm()
+
+
+def envelope_tick(state: tuple, chunk: np.ndarray):
+    buffer, envelope = state
+    buffer.append(chunk)
+    envelope.update(buffer.samples())
+    return envelope.chart_data()
+
+
+def measure(tick, state, chunks) -> dict:
+    costs = {}
+    for second, chunk in enumerate(chunks, start=1):
+        started = time.perf_counter()
+        tick(state, chunk)
+        elapsed = time.perf_counter() - started
+        if second in CHECKPOINTS:
+            costs[f"minute_{second // 60}_ms"] = round(elapsed * 1000, 3)
+    return costs
+
+
+def main():
+    rng = np.random.default_rng(0)
+    chunks = [
+        rng.uniform(-0.5, 0.5, size=(SAMPLE_RATE * CHUNK_SECONDS, 1)).astype(np.float32)
+        for _ in range(RECORD_SECONDS // CHUNK_SECONDS)
+    ]
+
+    results = {
+        "list_concatenate": measure(frames_tick, [], chunks),
+        "capture_buffer": measure(
+            buffer_tick, CaptureBuffer(SAMPLE_RATE, RECORD_SECONDS + CHUNK_SECONDS), chunks
+        ),
+        "waveform_envelope": measure(
+            envelope_tick,
+            (
+                CaptureBuffer(SAMPLE_RATE, RECORD_SECONDS + CHUNK_SECONDS),
+                WaveformEnvelope(SAMPLE_RATE, RECORD_SECONDS),
+            ),
+            chunks,
+        ),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
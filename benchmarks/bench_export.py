@@ -0,0 +1,87 @@
+"""Export throughput benchmark.
+
+Seeds a temporary SQLite archive and streams it through every export format,
+reporting rows/s, output size and peak Python heap per format:
+
+    python -m benchmarks.bench_export --rows 100000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from backend.export import EXPORT_FORMATS, stream_export
+from backend.local_database import SQLiteDatabaseService
+
+QUESTIONS_PER_INTERVIEW = 10
+JOB_TITLES = ["Backend Engineer", "Frontend Engineer", "Data Scientist", "Product Manager"]
+
+
+def seed(db: SQLiteDatabaseService, rows: int):
+    answer = "I designed and operated a Kubernetes-based deployment pipeline. " * 4
+    for i in range(rows // QUESTIONS_PER_INTERVIEW):
+        db._insert_interview({
+            "candidate_name": f"Candidate {i}",
+            "job_title": JOB_TITLES[i % len(JOB_TITLES)],
+            "interview_type": "technical" if i % 2 else "hr",
+            "final_score": (i * 7) % 100 / 10,
+            "start_time": "2024-01-01T10:00:00",
+            "qa_pairs": [
+                {
+                    "number": n,
+                    "question": f"Question {n} about system design?",
+                    "answer": answer,
+                    "score": (i + n) % 11,
+                    "feedback": "Clear and relevant answer.",
+                }
+                for n in range(1, QUESTIONS_PER_INTERVIEW + 1)
+            ],
+        })
+
+
+def run(db, export_format: str, page_size: int, trace_memory: bool) -> dict:
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    size = 0
+    for chunk in stream_export(db, export_format, page_size=page_size):
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"seconds": elapsed, "bytes": size, "peak_heap_mb": peak / 2**20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--formats", nargs="*", default=list(EXPORT_FORMATS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SQLiteDatabaseService(os.path.join(tmp, "bench.db"))
+        seed(db, args.rows)
+
+        results = {}
+        for export_format in args.formats:
+            timing = run(db, export_format, args.page_size, trace_memory=False)
+            memory = run(db, export_format, args.page_size, trace_memory=True)
+            results[export_format] = {
+                "rows": args.rows,
+                "seconds": round(timing["seconds"], 3),
+                "rows_per_second": round(args.rows / timing["seconds"]),
+                "output_mb": round(timing["bytes"] / 2**20, 2),
+                "peak_heap_mb": round(memory["peak_heap_mb"], 2),
+            }
+        db.client.close()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Time from the end of an answer to its full transcript: streamed vs one upload.
+
+Synthetic answers are fed to ``StreamingTranscriber`` in 100 ms chunks at
+``--speed`` times real time. After the last chunk, the streamed path only has
+the trailing segment left to transcribe. The batch path uploads the whole
+preprocessed recording at that point. By default the STT API is simulated as
+``--base-ms`` plus ``--per-second-ms`` per second of audio; ``--live`` calls
+the configured API instead.
+
+    python -m benchmarks.bench_streaming_stt --answers 3 --seconds 60 --speed 10
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from backend.audio_processing import audio_duration, encode_wav
+from backend.openai_service import openai_service
+from backend.streaming_stt import StreamingTranscriber, transcribe_recording
+from benchmarks.bench_stt_preprocessing import SAMPLE_RATE, synthetic_answer
+
+CHUNK_SECONDS = 0.1
+
+
+def simulated_stt(base_ms: float, per_second_ms: float):
+    def speech_to_text(audio_file, prompt=None):
+        seconds = audio_duration(audio_file.getvalue()) or 0.0
+        time.sleep((base_ms + per_second_ms * seconds) / 1000)
+        return "text"
+    return speech_to_text
+
+
+async def streamed(pcm: np.ndarray, speed: float) -> dict:
+    transcriber = StreamingTranscriber("pcm16", SAMPLE_RATE)
+    step = int(CHUNK_SECONDS * SAMPLE_RATE)
+    for start in range(0, len(pcm), step):
+        await transcriber.feed(pcm[start:start + step].tobytes())
+        await asyncio.sleep(CHUNK_SECONDS / speed)
+    stopped = time.perf_counter()
+    await transcriber.finish()
+    return {"segments": transcriber.segments, "final_s": time.perf_counter() - stopped}
+
+
+def batch(pcm: np.ndarray) -> float:
+    data = encode_wav(pcm, SAMPLE_RATE)
+    stopped = time.perf_counter()
+    transcribe_recording(data)
+    return time.perf_counter() - stopped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=3)
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--speed", type=float, default=10.0, help="Feed rate as a multiple of real time")
+    parser.add_argument("--base-ms", type=float, default=300.0)
+    parser.add_argument("--per-second-ms", type=float, default=25.0)
+    parser.add_argument("--live", action="store_true", help="Call the configured STT API")
+    args = parser.parse_args()
+
+    if not args.live:
+        openai_service.speech_to_text = simulated_stt(args.base_ms, args.per_second_ms)
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for _ in range(args.answers):
+        pcm = synthetic_answer(args.seconds, rng)
+        stream = asyncio.run(streamed(pcm, args.speed))
+        rows.append({
+            "seconds": args.seconds,
+            "segments": stream["segments"],
+            "streamed_final_ms": round(stream["final_s"] * 1000, 1),
+            "batch_final_ms": round(batch(pcm) * 1000, 1),
+        })
+
+    for row in rows:
+        print(json.dumps(row))
+    print(json.dumps({
+        "streamed_final_ms_mean": round(float(np.mean([r["streamed_final_ms"] for r in rows])), 1),
+        "batch_final_ms_mean": round(float(np.mean([r["batch_final_ms"] for r in rows])), 1),
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Upload size (and optionally STT latency) per answer before and after preprocessing.
+
+Synthesizes answers with speech-like bursts, long thinking pauses and leading
+and trailing silence, then compares the raw 16 kHz WAV with the VAD-trimmed
+FLAC upload:
+
+    python -m benchmarks.bench_stt_preprocessing
+    python -m benchmarks.bench_stt_preprocessing --transcribe   # also time the STT API
+"""
+import argparse
+import io
+import json
+import time
+
+import numpy as np
+
+from backend.audio_processing import encode_wav, prepare_for_stt
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_answer(seconds: int, rng: np.random.Generator) -> np.ndarray:
+    """Noise floor with 1-4 s speech-like bursts separated by 0.3-4 s pauses"""
+    pcm = rng.normal(0, 20, seconds * SAMPLE_RATE)
+    position = int(rng.uniform(2, 6) * SAMPLE_RATE)
+    end = len(pcm) - 3 * SAMPLE_RATE
+    while position < end:
+        burst = int(rng.uniform(1, 4) * SAMPLE_RATE)
+        t = np.arange(burst) / SAMPLE_RATE
+        envelope = np.abs(np.sin(2 * np.pi * 3 * t))
+        voice = np.sin(2 * np.pi * rng.uniform(110, 220) * t) + 0.3 * rng.normal(0, 1, burst)
+        span = len(pcm[position:position + burst])
+        pcm[position:position + burst] += 6000 * (envelope * voice)[:span]
+        position += burst + int(rng.uniform(0.3, 4) * SAMPLE_RATE)
+    return np.clip(pcm, -32768, 32767).astype(np.int16)
+
+
+def transcribe(client, data: bytes, filename: str) -> float:
+    upload = io.BytesIO(data)
+    upload.name = filename
+    started = time.perf_counter()
+    client.audio.transcriptions.create(model="whisper-1", file=upload)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=5)
+    parser.add_argument("--seconds", type=int, default=120)
+    parser.add_argument("--transcribe", action="store_true", help="Call the configured STT API")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    client = None
+    if args.transcribe:
+        from openai import OpenAI
+        client = OpenAI()
+
+    rows = []
+    for _ in range(args.answers):
+        pcm = synthetic_answer(args.seconds, rng)
+        raw = encode_wav(pcm, SAMPLE_RATE)
+
+        started = time.perf_counter()
+        prepared = prepare_for_stt(pcm, SAMPLE_RATE)
+        preprocess = time.perf_counter() - started
+
+        row = {
+            "raw_bytes": len(raw),
+            "uploaded_bytes": prepared.output_bytes,
+            "raw_seconds": round(prepared.input_seconds, 1),
+            "uploaded_seconds": round(prepared.output_seconds, 1),
+            "preprocess_ms": round(preprocess * 1000, 1),
+        }
+        if client is not None:
+            row["raw_stt_seconds"] = round(transcribe(client, raw, "audio.wav"), 2)
+            row["uploaded_stt_seconds"] = round(transcribe(client, prepared.data, prepared.filename), 2)
+        rows.append(row)
+
+    summary = {
+        key: round(sum(row[key] for row in rows) / len(rows), 2)
+        for key in rows[0]
+    }
+    summary["upload_reduction"] = round(1 - summary["uploaded_bytes"] / summary["raw_bytes"], 3)
+    print(json.dumps({"per_answer_mean": summary, "answers": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
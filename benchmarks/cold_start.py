@@ -0,0 +1,134 @@
+"""Cold-start measurement for the backend.
+
+Starts the API in fresh ``uvicorn`` processes and records, per run, the wall
+time until ``/health`` answers (live), until ``/ready`` returns 200 (ready)
+and the latency of the first interview question. It also records the
+in-process phase timings from ``/ready``. OpenAI is the local stand-in and
+storage a temporary SQLite file, so no network access is needed:
+
+    python -m benchmarks.cold_start --runs 5 -o cold_start.json
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import httpx
+
+from benchmarks.load_test import JD, RESUME, start_fake_openai
+
+POLL_INTERVAL = 0.01
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(client: httpx.Client, url: str, started: float, timeout: float) -> float:
+    """Seconds since started until url returns 200"""
+    while time.perf_counter() - started < timeout:
+        try:
+            if client.get(url).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(POLL_INTERVAL)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def measure_run(env: dict, timeout: float) -> dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        with httpx.Client(timeout=30) as client:
+            live = wait_for(client, f"{base}/health", started, timeout)
+            ready = wait_for(client, f"{base}/ready", started, timeout)
+            status = client.get(f"{base}/ready").json()
+
+            request_started = time.perf_counter()
+            client.post(f"{base}/api/v1/interview/start", json={
+                "candidate_name": "Cold Start",
+                "job_title": "Backend Engineer",
+                "interview_type": "technical",
+                "resume_text": RESUME,
+                "jd_text": JD,
+            }).raise_for_status()
+            first_request = time.perf_counter() - request_started
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    return {
+        "live_s": round(live, 4),
+        "ready_s": round(ready, 4),
+        "first_question_s": round(first_request, 4),
+        "phases": status["phases"],
+        "components": {name: c.get("seconds") for name, c in status["components"].items()},
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Measure backend cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--chat-latency-ms", type=float, default=0.0)
+    parser.add_argument("--no-warmup", action="store_true", help="Start with WARMUP_ENABLED=false")
+    parser.add_argument("-o", "--output", help="Write the JSON report here as well as stdout")
+    args = parser.parse_args(argv)
+
+    fake = SimpleNamespace(
+        chat_latency_ms=args.chat_latency_ms,
+        speech_latency_ms=0.0,
+        transcription_latency_ms=0.0,
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        seed=0,
+    )
+    fake_server, thread, base_url = start_fake_openai(fake)
+    workdir = tempfile.mkdtemp(prefix="cold-start-")
+    env = {
+        **os.environ,
+        "OPENAI_BASE_URL": base_url,
+        "DATABASE_BACKEND": "sqlite",
+        "SQLITE_PATH": os.path.join(workdir, "interviews.db"),
+        "TRACE_EXPORTER": "",
+        "WARMUP_ENABLED": "false" if args.no_warmup else "true",
+    }
+
+    try:
+        runs = [measure_run(env, args.timeout) for _ in range(args.runs)]
+    finally:
+        fake_server.should_exit = True
+        thread.join(timeout=5)
+
+    report = {
+        "config": {"runs": args.runs, "warmup": not args.no_warmup, "chat_latency_ms": args.chat_latency_ms},
+        "median": {
+            key: round(statistics.median(run[key] for run in runs), 4)
+            for key in ("live_s", "ready_s", "first_question_s")
+        },
+        "runs": runs,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Import-time and cold-start profile for both entry points.
+
+Each entry point is imported in a fresh interpreter under ``-X importtime``.
+The report gives total import time, the most expensive modules (self and
+cumulative) and the cost per top-level package. Two cold-start figures are
+measured in separate fresh processes:
+
+- backend ``first_request_s``: import ``backend.main`` and serve ``GET /health``.
+- Streamlit ``first_render_s``: import and run ``main.py`` once through
+  ``streamlit.testing.v1.AppTest``, as for a new browser session.
+
+    python -m benchmarks.import_profile --top 15 -o import_profile.json
+
+``--compare`` checks a fresh run against a stored profile (by default
+``benchmarks/baselines/import_profile.json``) and exits non-zero when a tracked
+figure is more than ``--max-regression`` percent slower. Regressions smaller
+than ``--min-delta-ms`` are treated as noise.
+
+    python -m benchmarks.import_profile --compare --max-regression 25
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = {"backend": "backend.main", "streamlit": "main"}
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "import_profile.json")
+
+# Figures compared against the baseline, as (entry point, section, key, unit scale to ms)
+TRACKED = [
+    ("backend", "imports", "total_ms", 1),
+    ("backend", "startup", "first_request_s", 1000),
+    ("streamlit", "imports", "total_ms", 1),
+    ("streamlit", "startup", "first_render_s", 1000),
+]
+
+BACKEND_FIRST_REQUEST = """
+import json, time
+started = time.perf_counter()
+from backend.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(app)
+requested = time.perf_counter()
+client.get("/health").raise_for_status()
+done = time.perf_counter()
+print(json.dumps({"import_s": imported - started, "first_request_s": (imported - started) + (done - requested)}))
+"""
+
+STREAMLIT_FIRST_RENDER = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+started = time.perf_counter()
+app.run()
+rendered = time.perf_counter()
+app.run()
+rerun = time.perf_counter()
+if app.exception:
+    raise SystemExit(app.exception[0].message)
+print(json.dumps({"first_render_s": rendered - started, "rerun_s": rerun - rendered}))
+"""
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` lines: 'import time: self | cumulative | name'"""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        records.append(ImportRecord(name.strip(), int(fields[0]), int(fields[1]), depth))
+    return records
+
+
+def summarize_imports(records: List[ImportRecord], top: int) -> dict:
+    packages: Dict[str, int] = defaultdict(int)
+    for record in records:
+        packages[record.module.split(".")[0]] += record.self_us
+    roots = [record for record in records if record.depth == 0]
+    ms = lambda us: round(us / 1000, 2)
+    return {
+        "total_ms": ms(sum(record.cumulative_us for record in roots)),
+        "modules": len(records),
+        "packages_ms": {
+            name: ms(us) for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        },
+        "top_cumulative_ms": {
+            record.module: ms(record.cumulative_us)
+            for record in sorted(records, key=lambda r: -r.cumulative_us)[:top]
+        },
+        "top_self_ms": {
+            record.module: ms(record.self_us)
+            for record in sorted(records, key=lambda r: -r.self_us)[:top]
+        },
+    }
+
+
+def profile_imports(module: str, top: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1]}
+    return summarize_imports(parse_importtime(result.stderr), top)
+
+
+def run_snippet(code: str, *args: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", code, *args], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1]}
+    return {key: round(value, 4) for key, value in json.loads(result.stdout.strip().splitlines()[-1]).items()}
+
+
+def compare(report: dict, baseline: dict, max_regression: float, min_delta_ms: float) -> List[dict]:
+    """Tracked figures with their change against the baseline; "regressed" marks failures"""
+    rows = []
+    for entry, section, key, scale in TRACKED:
+        current = report.get(entry, {}).get(section, {}).get(key)
+        previous = baseline.get(entry, {}).get(section, {}).get(key)
+        if current is None or previous is None:
+            continue
+        current_ms, previous_ms = current * scale, previous * scale
+        change = (current_ms - previous_ms) / previous_ms * 100 if previous_ms else 0.0
+        rows.append({
+            "figure": f"{entry}.{section}.{key}",
+            "baseline_ms": round(previous_ms, 2),
+            "current_ms": round(current_ms, 2),
+            "change_pct": round(change, 1),
+            "regressed": change > max_regression and current_ms - previous_ms > min_delta_ms,
+        })
+    return rows
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Import-time and cold-start profile")
+    parser.add_argument("--top", type=int, default=15, help="Modules and packages listed per table")
+    parser.add_argument("--skip-timings", action="store_true", help="Only profile imports")
+    parser.add_argument("-o", "--output", help="Write the JSON report here as well as stdout")
+    parser.add_argument(
+        "--compare", nargs="?", const=BASELINE, metavar="BASELINE",
+        help="Compare against a stored profile and fail on regressions (default: the checked-in baseline)",
+    )
+    parser.add_argument("--max-regression", type=float, default=25.0, help="Allowed slowdown in percent")
+    parser.add_argument("--min-delta-ms", type=float, default=50.0, help="Slowdowns below this are ignored")
+    args = parser.parse_args(argv)
+
+    report = {name: {"imports": profile_imports(module, args.top)} for name, module in ENTRY_POINTS.items()}
+    if not args.skip_timings:
+        report["backend"]["startup"] = run_snippet(BACKEND_FIRST_REQUEST)
+        report["streamlit"]["startup"] = run_snippet(STREAMLIT_FIRST_RENDER, os.path.join(ROOT, "main.py"))
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(report, json.load(f), args.max_regression, args.min_delta_ms)
+        print(json.dumps({"comparison": rows}, indent=2))
+        if any(row["regressed"] for row in rows):
+            sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
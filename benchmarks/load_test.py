@@ -0,0 +1,320 @@
+"""End-to-end interview load test.
+
+Simulates concurrent candidates running the full flow against the backend
+in-process (ASGI transport), with OpenAI replaced by backend.fake_openai on a
+local port and storage by a temporary SQLite file:
+
+    upload resume + JD -> start -> 10 x (tts, stt, answer, next question) -> results -> save
+
+The app's lifespan runs first and measurement starts after warm-up, so SDK
+imports and client creation are not billed to the first requests. Reports
+requests/s, p50/p95/p99 latency and errors per endpoint, session manager
+memory and event-loop lag as JSON:
+
+    python -m benchmarks.load_test --candidates 20 --think-time 0.5 -o load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+from backend.audio_processing import encode_wav
+from benchmarks.bench_stt_preprocessing import SAMPLE_RATE, synthetic_answer
+
+RESUME = "Senior backend engineer. Python, FastAPI, PostgreSQL, Kubernetes. " * 20
+JD = "We are hiring a backend engineer to build scalable interview tooling. " * 20
+ANSWER = (
+    "I would start by measuring where the time goes, then add caching in front of "
+    "the slowest reads and move the heavy work onto a queue."
+)
+LAG_INTERVAL = 0.01
+
+
+def start_fake_openai(args) -> tuple:
+    """Run the OpenAI stand-in on a free local port in a background thread"""
+    import uvicorn
+    from backend.fake_openai import FakeOpenAIConfig, create_app
+
+    config = FakeOpenAIConfig(
+        chat_latency_ms=args.chat_latency_ms,
+        speech_latency_ms=args.speech_latency_ms,
+        transcription_latency_ms=args.transcription_latency_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host="127.0.0.1", port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, thread, f"http://127.0.0.1:{port}/v1"
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """Approximate retained size of a container graph in bytes"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def session_memory(manager) -> dict:
+    return {
+        "sessions": len(manager.sessions),
+        "bytes": deep_sizeof([manager.sessions, manager.conversation_history, manager.qa_pairs]),
+    }
+
+
+def summarize(latencies: List[float]) -> dict:
+    values = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) if values.size else (0, 0, 0)
+    return {
+        "count": int(values.size),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(values.max()), 2) if values.size else 0.0,
+    }
+
+
+class LoadRecorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.shed: Dict[str, int] = defaultdict(int)
+        self.peak_sessions = 0
+
+    async def call(self, client, name: str, method: str, url: str, ok=None, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception:
+            self.errors[name] += 1
+            return None
+        if response.status_code in (429, 503) and "Retry-After" in response.headers:
+            # Refused by admission control: fast by design, so kept out of the latencies
+            self.shed[name] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.status_code >= 400 or (ok is not None and not ok(response)):
+            self.errors[name] += 1
+            return None
+        return response
+
+
+async def measure_loop_lag(samples: List[float], stop: asyncio.Event):
+    """Record how late the event loop wakes a LAG_INTERVAL sleeper"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(loop.time() - started - LAG_INTERVAL, 0.0))
+
+
+async def run_candidate(client, recorder: LoadRecorder, manager, number: int, args, audio: bytes, rng):
+    prefix = "/api/v1"
+
+    async def think():
+        if args.think_time:
+            await asyncio.sleep(rng.expovariate(1 / args.think_time))
+
+    succeeded = lambda r: r.json().get("success", True)
+    for document in (RESUME, JD):
+        await recorder.call(
+            client, "POST /upload/txt", "POST", f"{prefix}/upload/txt", ok=succeeded,
+            files={"file": ("document.txt", document.encode(), "text/plain")},
+        )
+
+    response = await recorder.call(client, "POST /interview/start", "POST", f"{prefix}/interview/start", json={
+        "candidate_name": f"Candidate {number}",
+        "job_title": "Backend Engineer",
+        "interview_type": "technical",
+        "resume_text": RESUME,
+        "jd_text": JD,
+    })
+    if response is None:
+        return
+    session_id = response.json()["session_id"]
+    question = response.json()["first_question"]
+    recorder.peak_sessions = max(recorder.peak_sessions, len(manager.sessions))
+
+    for question_number in range(1, args.questions + 1):
+        await recorder.call(client, "POST /audio/tts", "POST", f"{prefix}/audio/tts", json={"text": question})
+        await think()
+        await recorder.call(
+            client, "POST /audio/stt", "POST", f"{prefix}/audio/stt", ok=succeeded,
+            files={"audio": ("audio.wav", audio, "audio/wav")},
+        )
+        await recorder.call(client, "POST /interview/answer", "POST", f"{prefix}/interview/answer", json={
+            "session_id": session_id,
+            "question_number": question_number,
+            "question_text": question,
+            "answer_text": ANSWER,
+        })
+        if question_number < args.questions:
+            response = await recorder.call(
+                client, "POST /interview/question", "POST", f"{prefix}/interview/question",
+                json={"session_id": session_id, "question_number": question_number + 1},
+            )
+            if response is not None:
+                question = response.json()["question_text"]
+
+    await recorder.call(client, "GET /interview/results", "GET", f"{prefix}/interview/results/{session_id}")
+    recorder.peak_sessions = max(recorder.peak_sessions, len(manager.sessions))
+    await recorder.call(client, "POST /interview/save", "POST", f"{prefix}/interview/save/{session_id}")
+
+
+async def run_load(args, app, manager) -> dict:
+    async with app.router.lifespan_context(app):
+        # ASGITransport skips the lifespan; start measuring once warm-up is done, as a
+        # server taking traffic only after /ready would
+        from backend.startup import startup
+        await asyncio.to_thread(startup.wait, 120)
+        return await measure(args, app, manager, startup.status())
+
+
+async def measure(args, app, manager, warm_up: dict) -> dict:
+    import httpx
+
+    rng = random.Random(args.seed)
+    audio = encode_wav(synthetic_answer(args.answer_seconds, np.random.default_rng(args.seed)), SAMPLE_RATE)
+    recorder = LoadRecorder()
+    lag: List[float] = []
+    stop = asyncio.Event()
+
+    tracemalloc.start()
+    memory_before = session_memory(manager)
+    heap_before = tracemalloc.get_traced_memory()[0]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend", timeout=None) as client:
+        probe = asyncio.create_task(measure_loop_lag(lag, stop))
+        started = time.perf_counter()
+
+        async def staggered(number):
+            # Candidates arrive over the ramp-up window rather than all at once
+            await asyncio.sleep(args.ramp_up * number / max(args.candidates, 1))
+            await run_candidate(client, recorder, manager, number, args, audio, rng)
+
+        await asyncio.gather(*(staggered(n) for n in range(args.candidates)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+
+    memory_after = session_memory(manager)
+    heap_after, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(len(values) for values in recorder.latencies.values())
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    lag_ms = np.array(lag) * 1000 if lag else np.zeros(1)
+    return {
+        "config": {
+            "candidates": args.candidates,
+            "questions": args.questions,
+            "think_time_s": args.think_time,
+            "chat_latency_ms": args.chat_latency_ms,
+            "speech_latency_ms": args.speech_latency_ms,
+            "transcription_latency_ms": args.transcription_latency_ms,
+            "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate,
+        },
+        "warm_up": {
+            "ready": warm_up["ready"],
+            "components": {name: component["status"] for name, component in warm_up["components"].items()},
+        },
+        "duration_s": round(elapsed, 3),
+        "requests": total,
+        "requests_per_second": round(total / elapsed, 2) if elapsed else 0.0,
+        "errors": sum(recorder.errors.values()),
+        "shed": sum(recorder.shed.values()),
+        "overall": summarize(all_latencies),
+        "endpoints": {
+            name: {**summarize(recorder.latencies[name]), "errors": recorder.errors[name], "shed": recorder.shed[name]}
+            for name in sorted(set(recorder.latencies) | set(recorder.shed))
+        },
+        "session_manager": {
+            "peak_sessions": recorder.peak_sessions,
+            "sessions_before": memory_before["sessions"],
+            "sessions_after": memory_after["sessions"],
+            "bytes_before": memory_before["bytes"],
+            "bytes_after": memory_after["bytes"],
+            "bytes_growth": memory_after["bytes"] - memory_before["bytes"],
+        },
+        "python_heap": {
+            "growth_bytes": heap_after - heap_before,
+            "peak_bytes": heap_peak,
+        },
+        "event_loop_lag": {
+            "p50_ms": round(float(np.percentile(lag_ms, 50)), 2),
+            "p99_ms": round(float(np.percentile(lag_ms, 99)), 2),
+            "max_ms": round(float(lag_ms.max()), 2),
+        },
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="End-to-end interview load test")
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean seconds between question and answer")
+    parser.add_argument("--ramp-up", type=float, default=1.0, help="Seconds over which candidates arrive")
+    parser.add_argument("--answer-seconds", type=int, default=10, help="Length of each uploaded answer")
+    parser.add_argument("--chat-latency-ms", type=float, default=300.0)
+    parser.add_argument("--speech-latency-ms", type=float, default=150.0)
+    parser.add_argument("--transcription-latency-ms", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write the JSON report here as well as stdout")
+    args = parser.parse_args(argv)
+
+    server, thread, base_url = start_fake_openai(args)
+    workdir = tempfile.mkdtemp(prefix="load-test-")
+    os.environ.update({
+        "OPENAI_BASE_URL": base_url,
+        "DATABASE_BACKEND": "sqlite",
+        "SQLITE_PATH": os.path.join(workdir, "interviews.db"),
+        "TRACE_EXPORTER": "",
+    })
+
+    # Settings are read on import, so the backend is imported after configuring it
+    from backend.main import app
+    from backend.session_manager import session_manager
+
+    try:
+        report = asyncio.run(run_load(args, app, session_manager))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
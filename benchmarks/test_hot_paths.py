@@ -0,0 +1,177 @@
+"""Micro-benchmarks for CPU-bound backend paths (requires pytest-benchmark).
+
+Save a baseline, then compare later runs against it; a mean regression above
+25% fails the run:
+
+    pytest benchmarks --benchmark-only --benchmark-storage=file://benchmarks/baselines --benchmark-save=baseline
+    pytest benchmarks --benchmark-only --benchmark-storage=file://benchmarks/baselines \\
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+import random
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from backend.models import InterviewResults, QAPair
+from backend.openai_service import build_evaluation_prompt, build_question_prompt, extract_json
+from backend.session_manager import SessionManager
+from backend.utils import extract_text_from_pdf
+
+SESSIONS = 10_000
+SKILLS = ["Python", "FastAPI", "PostgreSQL", "Kubernetes", "React", "AWS", "Kafka", "Terraform"]
+
+
+def make_pdf(pages) -> bytes:
+    """Minimal multi-page PDF with one Helvetica text block per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        text = " T* ".join(f"({line})Tj" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 750 Td {text} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Contents {len(objects)} 0 R /Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+@pytest.fixture(scope="module")
+def resumes():
+    rng = random.Random(0)
+    corpus = []
+    for n in range(20):
+        pages = [
+            [
+                f"Candidate {n} - {rng.choice(SKILLS)} engineer, {rng.randint(2, 15)} years of experience with "
+                f"{', '.join(rng.sample(SKILLS, 3))}"
+                for _ in range(55)
+            ]
+            for _ in range(2)
+        ]
+        corpus.append(make_pdf(pages))
+    return corpus
+
+
+@pytest.fixture(scope="module")
+def history():
+    answer = "I profiled the service, found the N+1 query and replaced it with a batched join. " * 3
+    return [{"question": f"Question {i} about distributed systems?", "answer": answer} for i in range(9)]
+
+
+@pytest.fixture(scope="module")
+def results_payload():
+    return {
+        "session_id": "session",
+        "candidate_name": "Candidate",
+        "job_title": "Backend Engineer",
+        "interview_type": "technical",
+        "final_score": 7.4,
+        "percentage": 74.0,
+        "qa_pairs": [
+            {
+                "number": i,
+                "question": f"Question {i}?",
+                "answer": "A detailed answer about scaling the write path. " * 10,
+                "score": 7.0,
+                "feedback": "Good structure; quantify the impact next time.",
+            }
+            for i in range(1, 11)
+        ],
+        "start_time": datetime(2024, 1, 1, 10, 0).isoformat(),
+        "completed_at": datetime(2024, 1, 1, 10, 45).isoformat(),
+    }
+
+
+@pytest.fixture(scope="module")
+def populated_manager():
+    manager = SessionManager()
+    ids = [
+        manager.create_session(f"Candidate {i}", "Backend Engineer", "technical", "resume " * 50, "jd " * 50)
+        for i in range(SESSIONS)
+    ]
+    return manager, ids
+
+
+def test_build_question_prompt(benchmark, history):
+    resume, jd = "Senior engineer. " * 200, "Backend role. " * 200
+    prompt = benchmark(build_question_prompt, resume, jd, "technical", 10, history)
+    assert "Q9:" in prompt
+
+
+def test_build_evaluation_prompt(benchmark):
+    prompt = benchmark(build_evaluation_prompt, "Question?", "Answer. " * 100, "Backend role. " * 200, "technical")
+    assert "valid JSON" in prompt
+
+
+def test_extract_json_from_code_fence(benchmark):
+    reply = '```json\n{"score": 8, "feedback": "Clear and specific."}\n```'
+    assert benchmark(extract_json, reply)["score"] == 8
+
+
+def test_extract_text_from_pdf_corpus(benchmark, resumes):
+    texts = benchmark(lambda: [extract_text_from_pdf(pdf) for pdf in resumes])
+    assert all("Candidate" in text for text in texts)
+
+
+def test_interview_results_validate_and_serialize(benchmark, results_payload):
+    def roundtrip():
+        return InterviewResults.model_validate(results_payload).model_dump_json()
+
+    assert '"final_score":7.4' in benchmark(roundtrip)
+
+
+def test_qa_pair_validation(benchmark, results_payload):
+    pairs = results_payload["qa_pairs"]
+    assert len(benchmark(lambda: [QAPair(**pair) for pair in pairs])) == 10
+
+
+def test_session_lookup_at_10k_sessions(benchmark, populated_manager):
+    manager, ids = populated_manager
+    rng = random.Random(0)
+    sample = [rng.choice(ids) for _ in range(1000)]
+
+    def lookups():
+        for session_id in sample:
+            manager.get_session(session_id)
+            manager.get_conversation_history(session_id)
+
+    benchmark(lookups)
+
+
+def test_session_answer_bookkeeping_at_10k_sessions(benchmark, populated_manager):
+    manager, ids = populated_manager
+    qa_pair = QAPair(number=1, question="Q?", answer="A", score=7.0, feedback="F")
+
+    def answer():
+        session_id = ids[len(manager.qa_pairs[ids[0]]) % len(ids)]
+        manager.add_qa_pair(session_id, qa_pair)
+        manager.add_conversation(session_id, "Q?", "A")
+        manager.update_session(session_id, current_question_num=2)
+
+    benchmark(answer)
+
+
+def test_session_create_and_delete_at_10k_sessions(benchmark, populated_manager):
+    manager, _ = populated_manager
+
+    def churn():
+        session_id = manager.create_session("Candidate", "Backend Engineer", "technical", "resume", "jd")
+        manager.delete_session(session_id)
+
+    benchmark(churn)
+    assert len(manager.sessions) == SESSIONS